@@ -1,12 +1,29 @@
 # app.py
 # ARAM PS Dashboard - 최종 완성본 (모든 문제 해결)
-import os, ast, requests, re, unicodedata
-from typing import Dict, List, Optional
-from difflib import get_close_matches
+# 데이터 로드 / 통계 엔진은 aram_stats.py (Streamlit 없이도 사용 가능)
+import os, html, base64
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.express as px
+import ddragon
+from icons import IconResolver, missing_tiles, sprite_sheet
+from builds import BuildIndex
+from registry import (
+    REGISTRY_BUDGET_MB, REGISTRY_DIR, REGISTRY_DISK_BUDGET_MB, DatasetRegistry, content_hash, dataset_key,
+)
+from aram_stats import (
+    AGGREGATE_STORE_DIR, CHUNK_ROWS, DATASET_DIR, DETAIL_PAGE_SIZES, EXPORT_FORMATS,
+    EXTENDED_ITEM_MAPPING, EXTENDED_SPELL_MAPPING, HISTOGRAM_EDGES, aggregate_csv,
+    aggregate_item_stats, aggregate_spell_stats, aggregate_summary, analyze_champion_data,
+    append_delta, build_champion_summary, build_index_from_frame, build_manifest,
+    champion_histograms, compute_item_stats, compute_spell_stats, csv_bytes, dataset_aggregates,
+    dd_maps_for_version, default_version, detail_page, discover_csv, empty_aggregates,
+    export_all_champions, get_item_columns, load_frame, manifest_date_range, manifest_patches,
+    matchup_matrices, matchup_stats, matchup_table, partition_aggregates, prune_partitions,
+    rank_stats, read_aggregate_store, read_manifest, resolver_for_version, store_stamp,
+)
 
 st.set_page_config(
     page_title="ARAM Analytics", 
@@ -16,427 +33,284 @@ st.set_page_config(
 )
 
 # ------------------------------------------------------------------
-# 확장된 아이템 & 스펠 매핑 (하드코딩)
+# Data Dragon 시스템 (백그라운드 로드)
 # ------------------------------------------------------------------
-EXTENDED_ITEM_MAPPING = {
-    # 신발류
-    "Boots of Speed": "1001",
-    "Berserker's Greaves": "3006", 
-    "Sorcerer's Shoes": "3020",
-    "Plated Steelcaps": "3047",
-    "Mercury's Treads": "3111",
-    "Ionian Boots of Lucidity": "3158",
-    "Boots of Swiftness": "3009",
-    "Mobility Boots": "3117",
-    
-    # AD 아이템
-    "Infinity Edge": "3031",
-    "Bloodthirster": "3072",
-    "The Collector": "6676",
-    "Lord Dominik's Regards": "3036",
-    "Mortal Reminder": "3033",
-    "Kraken Slayer": "6672",
-    "Galeforce": "6671",
-    "Immortal Shieldbow": "6673",
-    "Eclipse": "6692",
-    "Prowler's Claw": "6693",
-    "Essence Reaver": "3508",
-    "Navori Quickblades": "6675",
-    "Phantom Dancer": "3046",
-    "Rapid Firecannon": "3094",
-    "Runaan's Hurricane": "3085",
-    "Statikk Shiv": "3087",
-    "Stormrazor": "3095",
-    
-    # AP 아이템  
-    "Rabadon's Deathcap": "3089",
-    "Void Staff": "3135",
-    "Zhonya's Hourglass": "3157",
-    "Banshee's Veil": "3102",
-    "Luden's Tempest": "6655",
-    "Everfrost": "6656",
-    "Riftmaker": "4633",
-    "Crown of the Shattered Queen": "4636",
-    "Hextech Rocketbelt": "3152",
-    "Night Harvester": "4636",
-    "Nashor's Tooth": "3115",
-    "Lich Bane": "3100",
-    "Cosmic Drive": "4629",
-    "Demonic Embrace": "4628",
-    "Shadowflame": "4645",
-    "Horizon Focus": "4628",
-    
-    # 탱크 아이템
-    "Sunfire Aegis": "6664",
-    "Frostfire Gauntlet": "6662",
-    "Turbo Chemtank": "6667",
-    "Dead Man's Plate": "3742",
-    "Randuin's Omen": "3143",
-    "Thornmail": "3075",
-    "Spirit Visage": "3065",
-    "Force of Nature": "4401",
-    "Abyssal Mask": "3001",
-    "Frozen Heart": "3110",
-    "Righteous Glory": "3800",
-    "Warmog's Armor": "3083",
-    
-    # 서포터 아이템
-    "Locket of the Iron Solari": "3190",
-    "Shurelya's Battlesong": "2065",
-    "Imperial Mandate": "4005",
-    "Moonstone Renewer": "6617",
-    "Staff of Flowing Water": "6616",
-    "Chemtech Putrifier": "6609",
-    "Ardent Censer": "3504",
-    "Redemption": "3107",
-    "Mikael's Blessing": "3222",
-    
-    # 정글 아이템
-    "Goredrinker": "6630",
-    "Stridebreaker": "6631",
-    "Divine Sunderer": "6632",
-    "Trinity Force": "3078",
-    "Black Cleaver": "3071",
-    "Sterak's Gage": "3053",
-    "Death's Dance": "6333",
-    "Maw of Malmortius": "3156",
-    
-    # 기타 인기 아이템
-    "Guardian Angel": "3026",
-    "Youmuu's Ghostblade": "3142",
-    "Edge of Night": "3814",
-    "Serpent's Fang": "6695",
-    "Chempunk Chainsword": "6609",
-    "Silvermere Dawn": "6035",
-    "Mercurial Scimitar": "3139",
-    "Wit's End": "3091",
-    "Blade of the Ruined King": "3153",
-    "Guinsoo's Rageblade": "3124",
-    
-    # 소모품/기타
-    "Health Potion": "2003",
-    "Control Ward": "2055",
-    "Doran's Blade": "1055",
-    "Doran's Ring": "1056",
-    "Doran's Shield": "1054",
-    "Long Sword": "1036",
-    "Amplifying Tome": "1052",
-    "Ruby Crystal": "1028",
-    "Cloth Armor": "1029",
-    "Null-Magic Mantle": "1033"
-}
-
-EXTENDED_SPELL_MAPPING = {
-    "Flash": "SummonerFlash",
-    "Ignite": "SummonerDot", 
-    "Heal": "SummonerHeal",
-    "Barrier": "SummonerBarrier",
-    "Exhaust": "SummonerExhaust",
-    "Teleport": "SummonerTeleport",
-    "Ghost": "SummonerHaste",
-    "Cleanse": "SummonerBoost",
-    "Smite": "SummonerSmite",
-    "Mark": "SummonerSnowball",
-    "Snowball": "SummonerSnowball", 
-    "Clarity": "SummonerMana",
-    "Poro-Toss": "SummonerSnowball",
-    
-    # 영어 소문자 매핑
-    "flash": "SummonerFlash",
-    "ignite": "SummonerDot",
-    "heal": "SummonerHeal",
-    "barrier": "SummonerBarrier",
-    "exhaust": "SummonerExhaust",
-    "teleport": "SummonerTeleport",
-    "ghost": "SummonerHaste",
-    "cleanse": "SummonerBoost",
-    "smite": "SummonerSmite",
-    "mark": "SummonerSnowball",
-    "snowball": "SummonerSnowball",
-    "clarity": "SummonerMana"
-}
+# 아이콘이 준비되기 전에는 회색 자리표시 아이콘을 쓴다
+PLACEHOLDER_ICON = ("data:image/svg+xml;utf8,<svg xmlns='http://www.w3.org/2000/svg' width='64' height='64'>"
+                    "<rect width='64' height='64' rx='8' fill='%23444'/></svg>")
 
-# ------------------------------------------------------------------
-# Data Dragon 시스템
-# ------------------------------------------------------------------
-@st.cache_data(show_spinner=False, ttl=86400)
-def ddragon_version() -> str:
-    """최신 Data Dragon 버전 자동 감지"""
-    try:
-        response = requests.get("https://ddragon.leagueoflegends.com/api/versions.json", timeout=10)
-        return response.json()[0]
-    except Exception as e:
-        st.warning(f"버전 감지 실패 (기본값 사용): {e}")
-        return "15.1.1"
+@st.cache_resource(show_spinner=False, ttl=86400)
+def dd_loader() -> Dict[str, Future]:
+    """Data Dragon 버전 감지 → 매핑 로드 → 해석기 생성을 백그라운드 스레드에서 한 번 시작"""
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ddragon-load")
+    version = pool.submit(default_version)
+    resolver = pool.submit(lambda: resolver_for_version(version.result()))
+    pool.shutdown(wait=False)
+    return {"version": version, "resolver": resolver}
 
-@st.cache_data(show_spinner=False, ttl=86400)
-def load_dd_maps(ver: str) -> Dict:
-    """Data Dragon 완전 매핑 시스템"""
-    try:
-        # Champion 데이터
-        champs_url = f"https://ddragon.leagueoflegends.com/cdn/{ver}/data/en_US/champion.json"
-        champs_response = requests.get(champs_url, timeout=15)
-        champs = champs_response.json()["data"]
-        
-        # Item 데이터
-        items_url = f"https://ddragon.leagueoflegends.com/cdn/{ver}/data/en_US/item.json"
-        items_response = requests.get(items_url, timeout=15)
-        items = items_response.json()["data"]
-        
-        # Spell 데이터
-        spells_url = f"https://ddragon.leagueoflegends.com/cdn/{ver}/data/en_US/summoner.json"
-        spells_response = requests.get(spells_url, timeout=15)
-        spells = spells_response.json()["data"]
-        
-        def normalize_text(text: str) -> str:
-            if not isinstance(text, str):
-                text = str(text)
-            text = unicodedata.normalize('NFKD', text)
-            text = re.sub(r"[^\w\s]", "", text).replace(" ", "").lower()
-            return text
-        
-        # 챔피언 매핑
-        champ_exact = {}
-        champ_normalized = {}
-        
-        for champ_key, champ_data in champs.items():
-            name = champ_data["name"]
-            filename = f"{champ_data['id']}.png"
-            
-            champ_exact[name] = filename
-            champ_normalized[normalize_text(name)] = filename
-            champ_normalized[champ_key.lower()] = filename
-        
-        # 아이템 매핑
-        item_exact = {}
-        item_normalized = {}
-        
-        for item_id, item_data in items.items():
-            if "name" in item_data:
-                name = item_data["name"]
-                item_exact[name] = item_id
-                item_normalized[normalize_text(name)] = item_id
-        
-        # 스펠 매핑  
-        spell_exact = {}
-        spell_normalized = {}
-        
-        for spell_data in spells.values():
-            name = spell_data["name"]
-            spell_id = spell_data["id"]
-            
-            spell_exact[name] = spell_id
-            spell_normalized[normalize_text(name)] = spell_id
-        
-        return {
-            "version": ver,
-            "champ_exact": champ_exact,
-            "champ_normalized": champ_normalized,
-            "item_exact": item_exact,
-            "item_normalized": item_normalized,
-            "spell_exact": spell_exact,
-            "spell_normalized": spell_normalized,
-            "items_count": len(items),
-            "spells_count": len(spells),
-            "champs_count": len(champs)
-        }
-        
-    except Exception as e:
-        st.error(f"Data Dragon 로드 실패: {e}")
-        return {
-            "version": ver,
-            "champ_exact": {}, "champ_normalized": {},
-            "item_exact": {}, "item_normalized": {},
-            "spell_exact": {}, "spell_normalized": {},
-            "items_count": 0, "spells_count": 0, "champs_count": 0
-        }
-
-# 전역 변수 초기화
-DDRAGON_VERSION = ddragon_version()
-DD_MAPS = load_dd_maps(DDRAGON_VERSION)
+def dd_version() -> str:
+    """Data Dragon 버전 (로컬 스냅샷이 있으면 즉시)"""
+    return dd_loader()["version"].result()
+
+def icon_resolver(wait: bool = True) -> Optional[IconResolver]:
+    """Data Dragon 아이콘 해석기 (wait=False 이면 로드 중일 때 None)"""
+    future = dd_loader()["resolver"]
+    if not wait and not future.done():
+        return None
+    return future.result()
 
 # ------------------------------------------------------------------
 # 향상된 아이콘 URL 생성 함수들
 # ------------------------------------------------------------------
 def champion_icon_url(name: str) -> str:
-    """챔피언 아이콘 URL 생성"""
-    if not name or pd.isna(name):
-        return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/champion/Aatrox.png"
-    
-    name_str = str(name).strip()
-    
-    # 정확한 매칭
-    if name_str in DD_MAPS["champ_exact"]:
-        filename = DD_MAPS["champ_exact"][name_str]
-        return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/champion/{filename}"
-    
-    # 정규화된 매칭
-    normalized = re.sub(r"[^\w\s]", "", name_str).replace(" ", "").lower()
-    if normalized in DD_MAPS["champ_normalized"]:
-        filename = DD_MAPS["champ_normalized"][normalized]
-        return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/champion/{filename}"
-    
-    # Fallback
-    fallback_name = re.sub(r"[^\w]", "", name_str)
-    if fallback_name:
-        fallback_name = fallback_name[0].upper() + fallback_name[1:]
-    else:
-        fallback_name = "Aatrox"
-    
-    return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/champion/{fallback_name}.png"
+    """챔피언 아이콘 URL 생성 (로컬 아이콘 저장소에 있으면 파일 경로)"""
+    resolver = icon_resolver(wait=False)
+    if resolver is None:
+        return PLACEHOLDER_ICON
+    tile = resolver.champion_tile(name)
+    local = ddragon.icon_path(resolver.version, *tile)
+    return local if os.path.exists(local) else resolver.tile_url(tile)
 
-def get_item_icon_url(item: str) -> str:
-    """통합된 아이템 아이콘 URL 생성 (모든 방법 사용)"""
-    if not item or pd.isna(item) or str(item).strip() in ["", "0", "nan", "None"]:
-        return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/item/1001.png"
-    
-    item_str = str(item).strip()
-    
-    # 1. 확장된 하드코딩 매핑 우선
-    if item_str in EXTENDED_ITEM_MAPPING:
-        item_id = EXTENDED_ITEM_MAPPING[item_str]
-        return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/item/{item_id}.png"
-    
-    # 2. Data Dragon 정확한 매핑
-    if item_str in DD_MAPS.get("item_exact", {}):
-        item_id = DD_MAPS["item_exact"][item_str]
-        return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/item/{item_id}.png"
-    
-    # 3. 정규화된 Data Dragon 매핑
-    normalized = re.sub(r"[^\w\s]", "", item_str).replace(" ", "").lower()
-    if normalized in DD_MAPS.get("item_normalized", {}):
-        item_id = DD_MAPS["item_normalized"][normalized]
-        return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/item/{item_id}.png"
-    
-    # 4. Fuzzy matching 시도
-    try:
-        close_matches = get_close_matches(item_str, EXTENDED_ITEM_MAPPING.keys(), n=1, cutoff=0.7)
-        if close_matches:
-            matched_item = close_matches[0]
-            item_id = EXTENDED_ITEM_MAPPING[matched_item]
-            return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/item/{item_id}.png"
-    except:
-        pass
-    
-    # 5. 기본값
-    return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/item/1001.png"
-
-def get_spell_icon_url(spell: str) -> str:
-    """통합된 스펠 아이콘 URL 생성"""
-    if not spell or pd.isna(spell):
-        return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/spell/SummonerFlash.png"
-    
-    spell_str = str(spell).strip()
-    
-    # 1. 확장된 하드코딩 매핑 우선
-    if spell_str in EXTENDED_SPELL_MAPPING:
-        spell_id = EXTENDED_SPELL_MAPPING[spell_str]
-        return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/spell/{spell_id}.png"
-    
-    # 2. Data Dragon 정확한 매핑
-    if spell_str in DD_MAPS.get("spell_exact", {}):
-        spell_id = DD_MAPS["spell_exact"][spell_str]
-        return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/spell/{spell_id}.png"
-    
-    # 3. 정규화된 매핑
-    normalized = spell_str.lower()
-    if normalized in DD_MAPS.get("spell_normalized", {}):
-        spell_id = DD_MAPS["spell_normalized"][normalized]
-        return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/spell/{spell_id}.png"
-    
-    # 4. Fuzzy matching
-    try:
-        close_matches = get_close_matches(spell_str, EXTENDED_SPELL_MAPPING.keys(), n=1, cutoff=0.7)
-        if close_matches:
-            matched_spell = close_matches[0]
-            spell_id = EXTENDED_SPELL_MAPPING[matched_spell]
-            return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/spell/{spell_id}.png"
-    except:
-        pass
-    
-    return f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/spell/SummonerFlash.png"
+# ------------------------------------------------------------------
+# 아이콘 스프라이트 (목록 하나당 이미지 한 장)
+# ------------------------------------------------------------------
+ICON_SPRITE_CSS = ".aram-icon{display:inline-block;background-repeat:no-repeat;vertical-align:middle;border-radius:4px}"
+
+@st.cache_resource(show_spinner=False)
+def icon_fetcher() -> Dict:
+    """아이콘 다운로드 풀과 (버전, 종류, 파일명) → Future - 실패한 아이콘을 매 실행마다 다시 요청하지 않음"""
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="icon-fetch")
+    return {"pool": pool, "jobs": {}}
+
+def fetch_icons_in_background(version: str, tiles: List[Tuple[str, str]]) -> bool:
+    """저장소에 없는 타일을 백그라운드에서 받기 시작하고, 아직 받는 중인 타일이 있는지 반환"""
+    if not tiles or not ddragon.network_allowed():
+        return False
+    fetcher = icon_fetcher()
+    jobs = fetcher["jobs"]
+    new = [tile for tile in tiles if (version, *tile) not in jobs]
+    for icon_kind in ddragon.ICON_KINDS:
+        filenames = [f for k, f in new if k == icon_kind]
+        if filenames:
+            future = fetcher["pool"].submit(ddragon.fetch_icons, version, icon_kind, filenames)
+            jobs.update({(version, icon_kind, f): future for f in filenames})
+    return any(not jobs[(version, *tile)].done() for tile in tiles)
+
+def icon_cells(name: str, kind: str, keys: List, size: int) -> Tuple[str, List[str]]:
+    """키(아이템/스펠/챔피언 이름 또는 ID)별 아이콘 HTML 과 함께 보낼 <style>
+    
+    로컬 아이콘 스프라이트 한 장을 <style> 에 data URI 로 실어 보내므로 행마다 이미지 요청이 생기지 않는다.
+    저장소에 없는 아이콘은 (네트워크 허용 시) 백그라운드에서 받고, 받는 동안은 CDN URL <img> 로 바로 그린다.
+    스프라이트는 다운로드가 끝난 뒤의 실행에서 만들며, 끝내 없는 아이콘은 회색 칸.
+    해석기가 로드 중이면 자리표시 아이콘, Pillow 가 없으면 CDN URL <img> 를 쓴다.
+    """
+    resolver = icon_resolver(wait=False)
+    if resolver is None or not keys:
+        return "", [f'<img src="{html.escape(PLACEHOLDER_ICON)}" width="{size}">'] * len(keys)
+    tiles = [getattr(resolver, f"{kind}_tile")(key) for key in keys]
+    
+    pending = fetch_icons_in_background(resolver.version, missing_tiles(resolver.version, tiles))
+    sheet = None if pending else sprite_sheet(resolver.version, tiles, size)
+    if sheet is None:
+        return "", [f'<img src="{html.escape(resolver.tile_url(tile))}" width="{size}">' for tile in tiles]
+    
+    data = base64.b64encode(sheet).decode("ascii")
+    style = (f"<style>{ICON_SPRITE_CSS}.aram-{name}{{width:{size}px;height:{size}px;"
+             f"background-image:url(data:image/png;base64,{data})}}</style>")
+    return style, [f'<span class="aram-icon aram-{name}" style="background-position:-{i * size}px 0"></span>'
+                   for i in range(len(tiles))]
+
+# ------------------------------------------------------------------
+# Top-N 통계 표 (목록 하나를 HTML 요소 한 개로)
+# ------------------------------------------------------------------
+TOP_N_OPTIONS = [10, 15, 25, 50, 100]
+RANK_LABELS = {"게임 수": "games", "보정 승률": "shrunk_rate", "95% 하한": "ci_low"}
+STATS_TABLE_CSS = (".aram-table{width:100%;border-collapse:collapse}"
+                   ".aram-table td{padding:4px 6px;border-bottom:1px solid rgba(128,128,128,.25);vertical-align:middle}"
+                   ".aram-table td.num{text-align:right;white-space:nowrap}"
+                   ".aram-table code{font-size:.7em;word-break:break-all}")
+
+def confidence_labels(stats: pd.DataFrame) -> List[str]:
+    """행별 "보정 52.1% · 95% 47.3–58.0" (신뢰도 컬럼이 없으면 빈 문자열)"""
+    if "shrunk_rate" not in stats:
+        return [""] * len(stats)
+    return [f"보정 {shrunk:.1f}% · 95% {low:.1f}–{high:.1f}"
+            for shrunk, low, high in zip(stats["shrunk_rate"], stats["ci_low"], stats["ci_high"])]
+
+def stats_table_html(icons: List[str], labels, games, win_rates, notes: Optional[List[str]] = None,
+                     details: Optional[List[str]] = None) -> str:
+    """아이콘 / 이름 / 게임 수 / 색 표시 승률 HTML 표 (행 수와 관계없이 Streamlit 요소 1개)
+    
+    details 는 승률 아래 작은 글씨 (신뢰구간 등), notes 는 이름 아래 디버그 정보.
+    """
+    rates = np.asarray(win_rates, dtype=float)
+    marks = np.select([rates >= 55, rates >= 45], ["🟢", "🟡"], "🔴")
+    notes = notes or [None] * len(icons)
+    details = details or [None] * len(icons)
+    rows = [
+        f"<tr><td>{icon}</td><td><b>{html.escape(str(label))}</b>"
+        + (f"<br><code>{html.escape(note)}</code>" if note else "")
+        + f"</td><td class='num'>{int(game)}게임</td><td class='num'>{mark} {rate}%"
+        + (f"<br><small>{html.escape(detail)}</small>" if detail else "")
+        + "</td></tr>"
+        for icon, label, game, mark, rate, note, detail in zip(icons, labels, games, marks, list(win_rates),
+                                                               notes, details)
+    ]
+    return f"<style>{STATS_TABLE_CSS}</style><table class='aram-table'>{''.join(rows)}</table>"
+
+def spell_pair_keys(spell_stats: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """스펠 조합 행별 (스펠1, 스펠2) 키 - ID 컬럼이 있으면 ID, 없으면 "A + B" 이름"""
+    parts = spell_stats.index.to_series().astype(str).str.split(" + ", n=1, regex=False)
+    keys = []
+    for pos, id_col in enumerate(["spell1_id", "spell2_id"]):
+        names = parts.str[pos].fillna("").str.strip()
+        if id_col in spell_stats:
+            ids = spell_stats[id_col].astype(object)
+            names = ids.where(ids.notna() & (ids != ""), names)
+        keys.append(names)
+    return keys[0], keys[1]
 
 # ------------------------------------------------------------------
 # 개선된 CSV 로더 
 # ------------------------------------------------------------------
-CSV_CANDIDATES = [
-    "aram_participants_with_full_runes_merged_plus.csv",
-    "aram_participants_with_full_runes_merged.csv", 
-    "aram_participants_with_full_runes.csv",
-    "aram_participants_clean_preprocessed.csv",
-    "aram_participants_clean_no_dupe_items.csv",
-    "aram_participants_with_items.csv",
-]
-
-def discover_csv():
-    for filename in CSV_CANDIDATES:
-        if os.path.exists(filename):
-            return filename
-    return None
-
-def safe_convert(x):
-    return 1 if str(x).strip().lower() in ("1", "true", "t", "yes") else 0
-
-def parse_list_column(s):
-    if isinstance(s, list):
-        return s
-    if not isinstance(s, str) or not s.strip():
-        return []
-    try:
-        v = ast.literal_eval(s)
-        if isinstance(v, list):
-            return v
-    except:
-        pass
+@st.cache_resource(show_spinner=False)
+def dataset_registry() -> DatasetRegistry:
+    """프로세스 공용 데이터셋 레지스트리 (파일 내용 해시당 전처리본 한 벌)"""
+    return DatasetRegistry(REGISTRY_DIR, REGISTRY_BUDGET_MB * 1e6, REGISTRY_DISK_BUDGET_MB * 1e6)
+
+def dataset_id(file_input, **options) -> str:
+    """파일 내용 해시 + 옵션 + Data Dragon 버전 키
     
-    delimiter = "|" if "|" in s else "," if "," in s else None
-    return [t.strip() for t in s.split(delimiter)] if delimiter else [s]
+    파생 캐시(요약/색인/상성/히스토그램/집계)는 원본 대신 이 문자열로 조회한다.
+    Streamlit 이 업로드 전체를 매 실행마다 해시하지 않고, 로컬 CSV 가 바뀌면 키도 바뀐다.
+    """
+    return dataset_key(content_hash(file_input), ddragon=dd_version(), **options)
 
-@st.cache_data(show_spinner=False)
-def load_dataframe(file_input) -> pd.DataFrame:
-    """데이터프레임 로드 및 전처리"""
+def load_dataframe(file_input, compact: bool = True) -> pd.DataFrame:
+    """데이터프레임 로드 및 전처리 (로컬 CSV는 컬럼형 캐시 사용)
+    
+    compact=True 이면 챔피언/아이템/스펠 컬럼을 Categorical 로 인코딩한다.
+    아이템/스펠은 Data Dragon ID 컬럼(*_id)도 함께 만든다.
+    같은 내용의 파일은 세션과 관계없이 레지스트리의 공유본을 (복사 없이) 받는다.
+    """
     try:
-        df = pd.read_csv(file_input)
-        
-        # 기본 컬럼 처리
-        df["win_clean"] = df.get("win", 0).apply(safe_convert)
+        key = dataset_id(file_input, compact=compact)
         
-        # 스펠 컬럼 처리
-        s1_col = "spell1_name" if "spell1_name" in df.columns else "spell1"
-        s2_col = "spell2_name" if "spell2_name" in df.columns else "spell2"
-        
-        df["spell_combo"] = (
-            df[s1_col].astype(str).fillna("") + " + " + 
-            df[s2_col].astype(str).fillna("")
-        ).str.strip()
-        
-        # 아이템 컬럼 정리
-        item_cols = [col for col in df.columns if col.startswith("item")]
-        for col in item_cols:
-            df[col] = df[col].fillna("").astype(str).str.strip()
-        
-        # 리스트 형태 컬럼 처리
-        for col in ["team_champs", "enemy_champs"]:
-            if col in df.columns:
-                df[col] = df[col].apply(parse_list_column)
-        
-        # 게임 시간 및 DPM 계산
-        df["duration_min"] = pd.to_numeric(df.get("game_end_min"), errors="coerce").fillna(18).clip(6, 40)
-        df["dpm"] = df.get("damage_total", np.nan) / df["duration_min"].replace(0, np.nan)
-        
-        # KDA 계산
-        for stat in ["kills", "deaths", "assists"]:
-            df[stat] = pd.to_numeric(df.get(stat, 0), errors="coerce").fillna(0)
-        
-        df["kda"] = (df["kills"] + df["assists"]) / df["deaths"].replace(0, np.nan)
-        df["kda"] = df["kda"].fillna(df["kills"] + df["assists"])
-        
-        return df
+        def load():
+            if hasattr(file_input, "seek"):
+                file_input.seek(0)
+            return load_frame(file_input, compact, icon_resolver, dd_version())
         
+        # 로컬 CSV 는 원본 옆 컬럼형 캐시가 디스크 사본 역할을 함
+        return dataset_registry().get(key, load, persist=not isinstance(file_input, str))
     except Exception as e:
         st.error(f"데이터 로드 실패: {e}")
         return pd.DataFrame()
 
+# ------------------------------------------------------------------
+# 챔피언 요약 테이블 (로드 시 1회 계산)
+# ------------------------------------------------------------------
+@st.cache_data(show_spinner=False)
+def load_champion_summary(data_id: str, _source, compact: bool = True) -> pd.DataFrame:
+    """dataset_id 로 캐시되는 챔피언 요약 테이블 (_source 는 캐시 키에서 제외)"""
+    return build_champion_summary(load_dataframe(_source, compact))
+
+def summary_value(stats: pd.Series, key: str, digits: int = 2):
+    """요약 행에서 값 조회 (없으면 NaN)"""
+    return round(float(stats.get(key, np.nan)), digits)
+
+# ------------------------------------------------------------------
+# 빌드 통계 (아이템 집합 색인)
+# ------------------------------------------------------------------
+@st.cache_resource(show_spinner=False)
+def load_build_index(data_id: str, _source, compact: bool = True) -> Optional[BuildIndex]:
+    """데이터셋(dataset_id)마다 한 번 만드는 빌드 색인"""
+    return build_index_from_frame(load_dataframe(_source, compact))
+
+def item_set_label(items, names: Dict[str, str]) -> str:
+    return " + ".join(names.get(item_id, item_id) for item_id in items)
+
+# ------------------------------------------------------------------
+# 챔피언 시너지 / 상성 행렬
+# ------------------------------------------------------------------
+def matchup_display(stats: pd.DataFrame) -> pd.DataFrame:
+    """표시용: 챔피언 / 게임 / 승률 / 95% 신뢰구간"""
+    return pd.DataFrame({
+        "챔피언": stats.index,
+        "게임": stats["games"].to_numpy(),
+        "승률(%)": stats["win_rate"].to_numpy(),
+        "95% 신뢰구간": [f"{lo:.1f} – {hi:.1f}" for lo, hi in zip(stats["ci_low"], stats["ci_high"])],
+    })
+
+@st.cache_data(show_spinner=False)
+def load_matchup_table(data_id: str, _source, compact: bool = True) -> pd.DataFrame:
+    """dataset_id 로 캐시되는 시너지/상성 테이블"""
+    return matchup_table(matchup_matrices(load_dataframe(_source, compact)))
+
+# ------------------------------------------------------------------
+# 분포 히스토그램 (고정 구간 개수만 차트로 전송)
+# ------------------------------------------------------------------
+@st.cache_data(show_spinner=False)
+def load_histograms(data_id: str, _source, compact: bool = True) -> Dict[str, pd.DataFrame]:
+    """dataset_id 로 캐시되는 {컬럼: 챔피언 × 구간 개수} (데이터셋마다 1회)"""
+    df = load_dataframe(_source, compact)
+    return {column: champion_histograms(df, column) for column in HISTOGRAM_EDGES if column in df.columns}
+
+def histogram_figure(counts: pd.Series, column: str, title: str, x_label: str):
+    """구간 개수로 그린 막대 히스토그램 (원본 값은 보내지 않음)"""
+    import plotly.express as px
+    
+    edges = HISTOGRAM_EDGES[column]
+    fig = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts.to_numpy(), title=title,
+                 labels={"x": x_label, "y": "게임 수"})
+    fig.update_traces(width=np.diff(edges))
+    fig.update_layout(
+        bargap=0,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font_color="#ffffff"
+    )
+    return fig
+
+# ------------------------------------------------------------------
+# 스트리밍 집계 (메모리보다 큰 CSV)
+# ------------------------------------------------------------------
+@st.cache_data(show_spinner=False)
+def load_aggregates(data_id: str, _source, chunk_rows: int = CHUNK_ROWS) -> Dict:
+    """dataset_id 로 캐시되는 스트리밍 집계 결과 (원본 행은 메모리에 남기지 않음)"""
+    try:
+        if hasattr(_source, "seek"):
+            _source.seek(0)
+        return aggregate_csv(_source, chunk_rows, resolver=icon_resolver())
+    except Exception as e:
+        st.error(f"데이터 집계 실패: {e}")
+        return empty_aggregates()
+
+# ------------------------------------------------------------------
+# 증분 집계 저장소 (델타 파일 추가)
+# ------------------------------------------------------------------
+@st.cache_data(show_spinner=False)
+def load_aggregate_store(store_dir: str, stamp: int) -> Optional[Dict]:
+    """stamp(meta.json mtime)가 바뀔 때만 다시 읽는 저장소 집계"""
+    return read_aggregate_store(store_dir)
+
+# ------------------------------------------------------------------
+# 파티션 데이터셋 (패치/날짜별 파일 + 매니페스트)
+# ------------------------------------------------------------------
+@st.cache_data(show_spinner=False)
+def load_partition_aggregates(path: str, rel_path: str, mtime_ns: int,
+                              patches=None, date_range=None) -> Dict:
+    """파티션 한 개의 (필터된) 집계 - 파일 mtime 과 필터 조건별로 캐시"""
+    return partition_aggregates(path, rel_path, patches, date_range, icon_resolver())
+
+def load_dataset_aggregates(dataset_dir: str, manifest: Dict, patches=None, date_range=None) -> Dict:
+    """매니페스트로 가지치기한 파티션만 읽어 합친 집계"""
+    return dataset_aggregates(
+        dataset_dir, manifest, patches, date_range, icon_resolver(),
+        partition_loader=lambda path, rel_path, entry: load_partition_aggregates(
+            path, rel_path, entry["mtime_ns"], patches, date_range),
+    )
+
 # ------------------------------------------------------------------
 # 데이터 분석 함수들
 # ------------------------------------------------------------------
@@ -445,7 +319,7 @@ def analyze_actual_data(df: pd.DataFrame):
     st.subheader("🔍 실제 데이터 분석")
     
     # 아이템 분석
-    item_cols = [col for col in df.columns if col.startswith("item")]
+    item_cols = get_item_columns(df)
     all_items = set()
     
     for col in item_cols:
@@ -483,59 +357,6 @@ def analyze_actual_data(df: pd.DataFrame):
     
     return sorted(all_items), sorted(all_spells)
 
-def analyze_champion_data(df: pd.DataFrame, champion: str):
-    """챔피언별 데이터 분석 및 CSV 저장"""
-    champion_df = df[df["champion"] == champion].copy()
-    
-    # 아이템 데이터 추출
-    item_cols = [col for col in champion_df.columns if col.startswith("item")]
-    items_data = []
-    
-    for idx, row in champion_df.iterrows():
-        for col in item_cols:
-            item_value = row[col]
-            if pd.notna(item_value) and str(item_value).strip() not in ["", "0", "nan", "None"]:
-                items_data.append({
-                    "matchId": row.get("matchId", idx),
-                    "win_clean": row.get("win_clean", 0),
-                    "item": str(item_value).strip(),
-                    "champion": champion
-                })
-    
-    # 스펠 데이터 추출
-    s1_col = "spell1_name" if "spell1_name" in champion_df.columns else "spell1"
-    s2_col = "spell2_name" if "spell2_name" in champion_df.columns else "spell2"
-    
-    spells_data = []
-    for idx, row in champion_df.iterrows():
-        spell1 = str(row.get(s1_col, "")).strip()
-        spell2 = str(row.get(s2_col, "")).strip()
-        
-        if spell1 and spell1 not in ["", "nan", "None"]:
-            spells_data.append({
-                "matchId": row.get("matchId", idx),
-                "win_clean": row.get("win_clean", 0),
-                "spell": spell1,
-                "spell_combo": f"{spell1} + {spell2}",
-                "champion": champion
-            })
-    
-    # CSV 저장
-    results = {}
-    if items_data:
-        items_df = pd.DataFrame(items_data)
-        items_filename = f"{champion}_items_analysis.csv"
-        items_df.to_csv(items_filename, index=False, encoding='utf-8')
-        results["items"] = items_filename
-    
-    if spells_data:
-        spells_df = pd.DataFrame(spells_data)
-        spells_filename = f"{champion}_spells_analysis.csv"
-        spells_df.to_csv(spells_filename, index=False, encoding='utf-8')
-        results["spells"] = spells_filename
-    
-    return results
-
 # ------------------------------------------------------------------
 # 메인 애플리케이션
 # ------------------------------------------------------------------
@@ -545,16 +366,36 @@ def main():
     
     # 디버그 모드
     debug_mode = st.sidebar.checkbox("🐛 디버그 모드", value=False)
+    compact_mode = st.sidebar.checkbox("🗜️ 메모리 절약 모드", value=True,
+                                       help="챔피언/아이템/스펠 컬럼을 Categorical 로 저장")
+    streaming_mode = st.sidebar.checkbox("🌊 집계 전용 모드", value=False,
+                                         help="CSV 를 청크 단위로 읽어 집계만 유지 (메모리보다 큰 파일용)")
     
     # Data Dragon 정보
     if debug_mode:
         st.sidebar.subheader("🔍 시스템 정보")
-        st.sidebar.write(f"**DD 버전**: {DDRAGON_VERSION}")
-        st.sidebar.write(f"**챔피언**: {DD_MAPS.get('champs_count', 0)}개")
-        st.sidebar.write(f"**아이템**: {DD_MAPS.get('items_count', 0)}개")
-        st.sidebar.write(f"**스펠**: {DD_MAPS.get('spells_count', 0)}개")
+        resolver = icon_resolver(wait=False)
+        if resolver is None:
+            st.sidebar.write("**DD 버전**: 로드 중…")
+        else:
+            dd_maps = dd_maps_for_version(resolver.version)
+            st.sidebar.write(f"**DD 버전**: {resolver.version}")
+            st.sidebar.write(f"**챔피언**: {dd_maps.get('champs_count', 0)}개")
+            st.sidebar.write(f"**아이템**: {dd_maps.get('items_count', 0)}개")
+            st.sidebar.write(f"**스펠**: {dd_maps.get('spells_count', 0)}개")
+            if not dd_maps.get("champs_count"):
+                st.sidebar.warning("Data Dragon 로드 실패 (하드코딩 매핑만 사용)")
+        registry = dataset_registry().info()
+        st.sidebar.write(f"**데이터셋 레지스트리**: {registry['entries']}개 · "
+                         f"{registry['memory_mb']:,} / {registry['budget_mb']:,} MB · "
+                         f"디스크 {registry['disk_mb']:,} / {registry['disk_budget_mb']:,} MB")
+        st.sidebar.caption(f"적중 {registry['hits']} · 디스크 {registry['disk_hits']} · "
+                           f"로드 {registry['misses']} · 축출 {registry['evictions']} · "
+                           f"디스크 정리 {registry['disk_evictions']}")
         st.sidebar.write(f"**하드코딩 아이템**: {len(EXTENDED_ITEM_MAPPING)}개")
         st.sidebar.write(f"**하드코딩 스펠**: {len(EXTENDED_SPELL_MAPPING)}개")
+        for entry in ddragon.last_fetch_report:
+            st.sidebar.caption(f"{entry['file']}: {entry['status']} · {entry['latency_ms']}ms")
     
     # 파일 로드
     auto_csv = discover_csv()
@@ -562,35 +403,112 @@ def main():
     
     uploaded_file = st.sidebar.file_uploader("📁 CSV 파일 업로드", type="csv")
     
+    # 집계 저장소 (델타 CSV 증분 추가)
+    with st.sidebar.expander("🗄️ 집계 저장소"):
+        store_mode = st.checkbox("저장소 집계로 표시", value=False)
+        delta_file = st.file_uploader("➕ 새 매치 CSV", type="csv", key="delta_csv")
+        if delta_file is not None and st.button("저장소에 추가"):
+            try:
+                with st.spinner("증분 집계 중..."):
+                    report = append_delta(delta_file, resolver=icon_resolver())
+                st.success(f"✅ {report['added']:,}행 추가 (중복 {report['duplicates']:,}행 제외)")
+            except Exception as e:
+                st.error(f"증분 추가 실패: {e}")
+    
+    # 파티션 데이터셋 (패치/기간 필터에 맞는 파티션만 읽음)
+    dataset_mode = False
+    if os.path.isdir(DATASET_DIR):
+        with st.sidebar.expander("📂 파티션 데이터셋"):
+            dataset_mode = st.checkbox("데이터셋 모드", value=False)
+            if dataset_mode:
+                manifest = read_manifest(DATASET_DIR)
+                if manifest is None or st.button("🔄 매니페스트 갱신"):
+                    with st.spinner("파티션 스캔 중..."):
+                        manifest = build_manifest(DATASET_DIR)
+                
+                all_patches = manifest_patches(manifest)
+                selected_patches = st.multiselect("패치", all_patches, default=all_patches[-2:])
+                patch_filter = tuple(selected_patches) if set(selected_patches) != set(all_patches) else None
+                # 패치 정보가 있는데 하나도 고르지 않았으면 전체가 아니라 "선택 없음"
+                no_patch_selected = bool(all_patches) and not selected_patches
+                
+                date_filter = None
+                date_min, date_max = manifest_date_range(manifest)
+                if date_min:
+                    picked = st.date_input("기간", value=(pd.Timestamp(date_min).date(), pd.Timestamp(date_max).date()))
+                    if len(picked) == 2 and (picked[0].isoformat(), picked[1].isoformat()) != (date_min, date_max):
+                        date_filter = (picked[0].isoformat(), picked[1].isoformat())
+                
+                selected_parts = [] if no_patch_selected else prune_partitions(manifest, patch_filter, date_filter)
+                st.caption(f"{len(selected_parts)} / {len(manifest['partitions'])} 파티션 사용")
+    
     # 데이터 로드
-    if uploaded_file:
-        df = load_dataframe(uploaded_file)
-    elif auto_csv:
-        df = load_dataframe(auto_csv)
-    else:
+    data_source = uploaded_file if uploaded_file else auto_csv
+    if not data_source and not (store_mode or dataset_mode):
         st.error("❌ CSV 파일을 업로드하거나 프로젝트 폴더에 넣어주세요.")
         st.stop()
     
-    if df.empty:
+    if dataset_mode:
+        if no_patch_selected:
+            st.info("선택한 패치가 없습니다. 사이드바에서 패치를 하나 이상 선택해주세요.")
+            st.stop()
+        aggregates = load_dataset_aggregates(DATASET_DIR, manifest, patch_filter, date_filter)
+        df = None
+        champion_summary = aggregate_summary(aggregates)
+        unresolved = aggregates["unresolved"]
+    elif store_mode:
+        # meta.json 이 바뀔 때만 다시 읽음
+        aggregates = load_aggregate_store(AGGREGATE_STORE_DIR, store_stamp())
+        if aggregates is None:
+            st.error("❌ 집계 저장소가 비어 있습니다. 새 매치 CSV를 추가해주세요.")
+            st.stop()
+        df = None
+        champion_summary = aggregate_summary(aggregates)
+        unresolved = aggregates["unresolved"]
+    elif streaming_mode:
+        # 원본 행 없이 집계만으로 동작 (상세 데이터/타임라인/CSV 저장 비활성)
+        aggregates = load_aggregates(dataset_id(data_source, streaming=True), data_source)
+        df = None
+        champion_summary = aggregate_summary(aggregates)
+        unresolved = aggregates["unresolved"]
+    else:
+        # 내용 해시는 한 번만 계산하고 파생 캐시는 모두 이 키로 조회
+        data_id = dataset_id(data_source, compact=compact_mode)
+        df = load_dataframe(data_source, compact_mode)
+        champion_summary = load_champion_summary(data_id, data_source, compact_mode)
+        unresolved = df.attrs.get("unresolved", {})
+    
+    if champion_summary.empty:
         st.error("❌ 데이터를 로드할 수 없습니다.")
         st.stop()
     
+    if debug_mode:
+        if df is not None:
+            st.sidebar.write(f"**메모리**: {df.memory_usage(deep=True).sum() / 1e6:,.1f} MB")
+        else:
+            st.sidebar.write(f"**집계 행 수**: {aggregates['rows']:,}")
+        if unresolved.get("items") or unresolved.get("spells"):
+            with st.sidebar.expander("❓ 해석되지 않은 이름"):
+                st.write(unresolved)
+    
     # 챔피언 선택
-    champions = sorted(df["champion"].dropna().unique())
+    champions = list(champion_summary.index)
     selected_champion = st.sidebar.selectbox("🎯 챔피언 선택", champions)
     
-    # 데이터 분석 섹션
+    # 데이터 분석 섹션 (원본 행이 필요)
     st.sidebar.subheader("📊 데이터 분석")
+    if df is None:
+        st.sidebar.caption("집계 전용 모드에서는 사용할 수 없습니다.")
     
     # 실제 데이터 분석 버튼
-    if st.sidebar.button("🔍 실제 데이터 분석"):
+    elif st.sidebar.button("🔍 실제 데이터 분석"):
         with st.sidebar:
             with st.spinner("데이터 분석 중..."):
                 items, spells = analyze_actual_data(df)
                 st.success(f"✅ 분석 완료!\n아이템: {len(items)}개\n스펠: {len(spells)}개")
     
     # CSV 저장 버튼
-    if st.sidebar.button("💾 CSV로 분석 데이터 저장"):
+    if df is not None and st.sidebar.button("💾 CSV로 분석 데이터 저장"):
         with st.sidebar:
             with st.spinner("데이터 저장 중..."):
                 results = analyze_champion_data(df, selected_champion)
@@ -599,17 +517,41 @@ def main():
                     for data_type, filename in results.items():
                         st.write(f"- {data_type}: `{filename}`")
     
-    # 메인 대시보드
-    champion_df = df[df["champion"] == selected_champion]
-    total_games = df["matchId"].nunique() if "matchId" in df else len(df)
-    champion_games = len(champion_df)
-    win_rate = round(champion_df["win_clean"].mean() * 100, 2) if champion_games else 0
-    pick_rate = round(champion_games / total_games * 100, 2) if total_games else 0
-    
-    avg_kills = round(champion_df["kills"].mean(), 2)
-    avg_deaths = round(champion_df["deaths"].mean(), 2)
-    avg_assists = round(champion_df["assists"].mean(), 2)
-    avg_dpm = round(champion_df["dpm"].mean(), 1)
+    # 전체 챔피언 일괄 내보내기
+    if df is not None:
+        export_format = st.sidebar.selectbox("📦 내보내기 형식", EXPORT_FORMATS)
+        if st.sidebar.button("📦 전체 챔피언 내보내기"):
+            with st.sidebar:
+                progress_bar = st.progress(0.0, text="내보내는 중...")
+                report = export_all_champions(
+                    df, "exports", export_format,
+                    progress=lambda done, total, path: progress_bar.progress(done / total, text=f"{done}/{total}"),
+                )
+                st.success(f"✅ {report['champions']}개 챔피언 · {len(report['files'])}개 파일 "
+                           f"({report['total_sec']}초) → `exports/`")
+    
+    # 메인 대시보드 (요약 테이블에서 O(1) 조회)
+    if df is None:
+        champion_df = None
+        item_stats = aggregate_item_stats(aggregates, selected_champion)
+        spell_stats = aggregate_spell_stats(aggregates, selected_champion)
+        matchups = aggregates["matchups"]
+    else:
+        champion_df = df[df["champion"] == selected_champion]
+        item_stats = compute_item_stats(champion_df)
+        spell_stats = compute_spell_stats(champion_df)
+        matchups = load_matchup_table(data_id, data_source, compact_mode)
+    
+    champion_stats = champion_summary.loc[selected_champion]
+    total_games = champion_summary.attrs["total_games"]
+    champion_games = int(champion_stats["games"])
+    win_rate = summary_value(champion_stats, "win_rate")
+    pick_rate = summary_value(champion_stats, "pick_rate")
+    
+    avg_kills = summary_value(champion_stats, "kills_mean")
+    avg_deaths = summary_value(champion_stats, "deaths_mean")
+    avg_assists = summary_value(champion_stats, "assists_mean")
+    avg_dpm = summary_value(champion_stats, "dpm_mean", 1)
     
     # 헤더
     st.title("🏆 ARAM Analytics Dashboard")
@@ -635,193 +577,230 @@ def main():
         st.metric("💥 평균 DPM", f"{avg_dpm:,}")
     
     # 탭 구성
-    tab1, tab2, tab3, tab4 = st.tabs(["📈 게임 통계", "⚔️ 아이템 & 스펠", "⏱️ 타임라인", "📋 상세 데이터"])
+    # on_change="rerun" 으로 선택된 탭을 추적해 타임라인 차트는 탭을 열 때만 그림
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 게임 통계", "⚔️ 아이템 & 스펠", "⏱️ 타임라인", "📋 상세 데이터",
+                                             "🤝 시너지 & 상성"], key="main_tabs", on_change="rerun")
     
     with tab1:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            if "first_blood_min" in champion_df and champion_df["first_blood_min"].notna().any():
-                avg_fb = round(champion_df["first_blood_min"].mean(), 2)
+            avg_fb = summary_value(champion_stats, "first_blood_min_mean")
+            if pd.notna(avg_fb):
                 st.metric("🩸 평균 퍼스트 블러드", f"{avg_fb}분")
         
         with col2:
-            if "game_end_min" in champion_df:
-                avg_duration = round(champion_df["game_end_min"].mean(), 2)
+            if "game_end_min_mean" in champion_stats:
+                avg_duration = summary_value(champion_stats, "game_end_min_mean")
                 st.metric("⏰ 평균 게임 시간", f"{avg_duration}분")
         
         with col3:
-            avg_kda_val = round(champion_df["kda"].mean(), 2)
+            avg_kda_val = summary_value(champion_stats, "kda_mean")
             st.metric("🎯 평균 KDA", f"{avg_kda_val}")
     
     with tab2:
+        # 표본이 적은 항목은 챔피언 승률 쪽으로 축소한 승률 / Wilson 하한으로 순위를 매길 수 있음
+        rank_col, min_col = st.columns(2)
+        rank_label = rank_col.radio("정렬 기준", list(RANK_LABELS), horizontal=True, key="stats_rank_by")
+        min_sample = min_col.slider("최소 게임 수", min_value=1, max_value=100, value=1, key="stats_min_games")
+        ranked_items = rank_stats(item_stats, min_sample, RANK_LABELS[rank_label])
+        ranked_spells = rank_stats(spell_stats, min_sample, RANK_LABELS[rank_label])
+        
         left_col, right_col = st.columns(2)
         
-        # 아이템 분석 (완전히 재구성됨)
+        # 아이템 분석 (표 하나로 렌더링)
         with left_col:
-            st.subheader("🛡️ 인기 아이템 Top 15")
+            top_n_items = st.selectbox("아이템 표시 개수", TOP_N_OPTIONS, index=1, key="top_items_n")
+            st.subheader(f"🛡️ 인기 아이템 Top {top_n_items}")
             
-            item_cols = [col for col in champion_df.columns if col.startswith("item")]
-            if item_cols:
-                # 아이템 데이터 완전히 재구성
-                all_items = []
-                for _, row in champion_df.iterrows():
-                    match_id = row.get("matchId", row.name)
-                    win = row.get("win_clean", 0)
-                    
-                    for col in item_cols:
-                        item_name = row[col]
-                        if pd.notna(item_name) and str(item_name).strip() not in ["", "0", "nan", "None"]:
-                            all_items.append({
-                                "matchId": match_id,
-                                "win_clean": win,
-                                "item": str(item_name).strip()
-                            })
-                
-                if all_items:
-                    items_df = pd.DataFrame(all_items)
-                    item_stats = (items_df.groupby("item")
-                                 .agg(games=("matchId", "count"), wins=("win_clean", "sum"))
-                                 .assign(win_rate=lambda x: (x.wins / x.games * 100).round(2))
-                                 .sort_values(["games", "win_rate"], ascending=[False, False])
-                                 .head(15))
-                    
-                    for idx, (item_name, stats) in enumerate(item_stats.iterrows()):
-                        item_container = st.container()
-                        icon_col, name_col, games_col, wr_col = item_container.columns([1, 4, 2, 2])
-                        
-                        with icon_col:
-                            st.image(get_item_icon_url(item_name), width=36)
-                        with name_col:
-                            st.write(f"**{item_name}**")
-                        with games_col:
-                            st.write(f"{int(stats.games)}게임")
-                        with wr_col:
-                            color = "🟢" if stats.win_rate >= 55 else "🟡" if stats.win_rate >= 45 else "🔴"
-                            st.write(f"{color} {stats.win_rate}%")
-                        
-                        if debug_mode:
-                            st.caption(f"URL: {get_item_icon_url(item_name)}")
-                        
-                        st.divider()
-                else:
-                    st.info("아이템 데이터가 없습니다.")
+            top_items = ranked_items.head(top_n_items)
+            if not top_items.empty:
+                icon_keys = top_items.index.to_series()
+                if "item_id" in top_items.columns:
+                    icon_keys = top_items["item_id"].fillna(icon_keys)
+                style, icons = icon_cells("items", "item", icon_keys.tolist(), 36)
+                resolver = icon_resolver(wait=False)
+                notes = resolver.item_urls(icon_keys).tolist() if debug_mode and resolver else None
+                st.markdown(style + stats_table_html(icons, top_items.index, top_items["games"],
+                                                     top_items["win_rate"], notes, confidence_labels(top_items)),
+                            unsafe_allow_html=True)
             else:
-                st.info("아이템 컬럼을 찾을 수 없습니다.")
+                st.info("아이템 데이터가 없습니다.")
         
-        # 스펠 분석 (완전히 재구성됨)
+        # 스펠 분석 (표 하나로 렌더링)
         with right_col:
-            st.subheader("✨ 스펠 조합 Top 10")
+            top_n_spells = st.selectbox("스펠 조합 표시 개수", TOP_N_OPTIONS, index=0, key="top_spells_n")
+            st.subheader(f"✨ 스펠 조합 Top {top_n_spells}")
             
-            spell_stats = (champion_df.groupby("spell_combo")
-                          .agg(games=("matchId", "count"), wins=("win_clean", "sum"))
-                          .assign(win_rate=lambda x: (x.wins / x.games * 100).round(2))
-                          .sort_values(["games", "win_rate"], ascending=[False, False])
-                          .head(10))
+            top_spells = ranked_spells.head(top_n_spells)
+            if not top_spells.empty:
+                s1, s2 = spell_pair_keys(top_spells)
+                pair_keys = [key for pair in zip(s1, s2) for key in pair]
+                style, icons = icon_cells("spells", "spell", pair_keys, 32)
+                pair_icons = [" ".join(icons[i:i + 2]) for i in range(0, len(icons), 2)]
+                resolver = icon_resolver(wait=False)
+                notes = ([f"S1: {resolver.spell_url(a)} · S2: {resolver.spell_url(b)}" for a, b in zip(s1, s2)]
+                         if debug_mode and resolver else None)
+                st.markdown(style + stats_table_html(pair_icons, top_spells.index, top_spells["games"],
+                                                     top_spells["win_rate"], notes, confidence_labels(top_spells)),
+                            unsafe_allow_html=True)
+            else:
+                st.info("스펠 데이터가 없습니다.")
+        
+        # 빌드 통계 (행 단위 아이템 집합이 필요)
+        st.subheader("🧩 빌드 통계")
+        build_index = load_build_index(data_id, data_source, compact_mode) if df is not None else None
+        if build_index is None:
+            st.info("빌드 통계는 원본 데이터(ID 컬럼)가 있을 때만 사용할 수 있습니다.")
+        else:
+            item_names = df.attrs.get("item_names", {})
+            build_col, third_col = st.columns(2)
             
-            for idx, (combo, stats) in enumerate(spell_stats.iterrows()):
-                spell_container = st.container()
-                spell_parts = str(combo).split(" + ")
-                s1 = spell_parts[0].strip() if len(spell_parts) > 0 else ""
-                s2 = spell_parts[1].strip() if len(spell_parts) > 1 else ""
-                
-                icon_col, name_col, stats_col = spell_container.columns([2, 3, 2])
-                
-                with icon_col:
-                    spell_icons = st.columns(2)
-                    if s1:
-                        with spell_icons[0]:
-                            st.image(get_spell_icon_url(s1), width=32)
-                    if s2:
-                        with spell_icons[1]:
-                            st.image(get_spell_icon_url(s2), width=32)
-                
-                with name_col:
-                    st.write(f"**{combo}**")
-                
-                with stats_col:
-                    color = "🟢" if stats.win_rate >= 55 else "🟡" if stats.win_rate >= 45 else "🔴"
-                    st.write(f"{color} {stats.win_rate}%")
-                    st.caption(f"{int(stats.games)}게임")
-                
-                if debug_mode:
-                    st.caption(f"S1: {get_spell_icon_url(s1)}")
-                    st.caption(f"S2: {get_spell_icon_url(s2)}")
-                
-                st.divider()
+            with build_col:
+                build_kind = st.radio("빌드 종류", ["3코어", "완성 빌드"], horizontal=True, key="build_kind")
+                if build_kind == "3코어":
+                    builds = build_index.top_cores(selected_champion, 10)
+                else:
+                    builds = build_index.top_builds(selected_champion, 10)
+                st.dataframe(pd.DataFrame({
+                    "빌드": [item_set_label(items, item_names) for items in builds["items"]],
+                    "게임": builds["games"],
+                    "승률(%)": builds["win_rate"],
+                }), use_container_width=True, hide_index=True)
+            
+            with third_col:
+                st.write("**두 아이템 → 세 번째 아이템**")
+                item_options = list(item_stats["item_id"].dropna()) if "item_id" in item_stats else []
+                if len(item_options) >= 2:
+                    first = st.selectbox("첫 번째", item_options, index=0, key="build_first",
+                                         format_func=lambda i: item_names.get(i, i))
+                    second = st.selectbox("두 번째", item_options, index=1, key="build_second",
+                                          format_func=lambda i: item_names.get(i, i))
+                    third = build_index.best_third_items(selected_champion, first, second, 10)
+                    st.dataframe(pd.DataFrame({
+                        "세 번째 아이템": [item_names.get(i, i) for i in third["item"]],
+                        "게임": third["games"],
+                        "승률(%)": third["win_rate"],
+                    }), use_container_width=True, hide_index=True)
+                else:
+                    st.info("아이템 데이터가 부족합니다.")
     
     with tab3:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if "first_core_item_min" in champion_df and champion_df["first_core_item_min"].notna().any():
-                avg_first_core = round(champion_df["first_core_item_min"].mean(), 2)
-                st.metric("⚡ 평균 1코어 완성", f"{avg_first_core}분")
+        if champion_df is None:
+            st.info("집계 전용 모드에서는 타임라인을 사용할 수 없습니다.")
+        elif tab3.open:
+            histograms = load_histograms(data_id, data_source, compact_mode)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                first_core = histograms.get("first_core_item_min")
+                if (first_core is not None and selected_champion in first_core.index
+                        and champion_df["first_core_item_min"].notna().any()):
+                    avg_first_core = round(champion_df["first_core_item_min"].mean(), 2)
+                    st.metric("⚡ 평균 1코어 완성", f"{avg_first_core}분")
                 
-                # 1코어 타이밍 히스토그램
-                fig = px.histogram(
-                    champion_df.dropna(subset=["first_core_item_min"]),
-                    x="first_core_item_min",
-                    nbins=20,
-                    title=f"{selected_champion} - 1코어 완성 타이밍 분포",
-                    labels={"first_core_item_min": "분", "count": "게임 수"}
-                )
-                fig.update_layout(
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    font_color="#ffffff"
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("1코어 타이밍 데이터가 없습니다.")
-        
-        with col2:
-            if "dpm" in champion_df:
-                # DPM 분포 히스토그램
-                fig_dpm = px.histogram(
-                    champion_df.dropna(subset=["dpm"]),
-                    x="dpm",
-                    nbins=20,
-                    title=f"{selected_champion} - DPM 분포",
-                    labels={"dpm": "DPM", "count": "게임 수"}
-                )
-                fig_dpm.update_layout(
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    font_color="#ffffff"
-                )
-                st.plotly_chart(fig_dpm, use_container_width=True)
+                    # 1코어 타이밍 히스토그램 (1분 구간, 30분 이상은 마지막 구간)
+                    fig = histogram_figure(histograms["first_core_item_min"].loc[selected_champion],
+                                           "first_core_item_min",
+                                           f"{selected_champion} - 1코어 완성 타이밍 분포", "분")
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
+                    st.info("1코어 타이밍 데이터가 없습니다.")
+            
+            with col2:
+                if "dpm" in histograms and selected_champion in histograms["dpm"].index:
+                    # DPM 분포 히스토그램 (250 구간, 6000 이상은 마지막 구간)
+                    fig_dpm = histogram_figure(histograms["dpm"].loc[selected_champion], "dpm",
+                                               f"{selected_champion} - DPM 분포", "DPM")
+                    st.plotly_chart(fig_dpm, use_container_width=True)
     
     with tab4:
-        st.subheader("📊 전체 데이터")
-        
-        # 컬럼 선택
-        all_cols = list(champion_df.columns)
-        default_cols = [col for col in ["champion", "win_clean", "kills", "deaths", "assists", "dpm"] if col in all_cols]
-        
-        display_cols = st.multiselect(
-            "표시할 컬럼 선택:",
-            options=all_cols,
-            default=default_cols
-        )
-        
-        if display_cols:
-            st.dataframe(
-                champion_df[display_cols],
-                use_container_width=True,
-                height=400
-            )
+        if champion_df is None:
+            st.info("집계 전용 모드에서는 상세 데이터를 사용할 수 없습니다.")
         else:
-            st.dataframe(champion_df, use_container_width=True, height=400)
-        
-        # 데이터 다운로드
-        csv = champion_df.to_csv(index=False)
-        st.download_button(
-            label="📥 현재 챔피언 데이터 다운로드",
-            data=csv,
-            file_name=f"{selected_champion}_data.csv",
-            mime="text/csv"
-        )
+            st.subheader("📊 전체 데이터")
+            
+            # 컬럼 선택
+            all_cols = list(champion_df.columns)
+            default_cols = [col for col in ["champion", "win_clean", "kills", "deaths", "assists", "dpm"] if col in all_cols]
+            
+            display_cols = st.multiselect(
+                "표시할 컬럼 선택:",
+                options=all_cols,
+                default=default_cols
+            )
+            
+            # 필터 / 정렬 / 페이지는 서버에서 처리하고 현재 페이지 행만 전송
+            filter_col, sort_col, order_col, size_col = st.columns([2, 2, 1, 1])
+            with filter_col:
+                filter_by = st.selectbox("필터 컬럼", ["(없음)"] + all_cols, key="detail_filter_col")
+            filters = {}
+            if filter_by != "(없음)":
+                if pd.api.types.is_numeric_dtype(champion_df[filter_by]):
+                    low_col, high_col = st.columns(2)
+                    low = low_col.number_input("최소", value=None, key="detail_filter_low")
+                    high = high_col.number_input("최대", value=None, key="detail_filter_high")
+                    filters[filter_by] = (low, high)
+                else:
+                    filters[filter_by] = st.text_input("포함 문자열", key="detail_filter_text")
+            with sort_col:
+                sort_by = st.selectbox("정렬 컬럼", ["(원본 순서)"] + all_cols, key="detail_sort_col")
+            with order_col:
+                ascending = st.radio("순서", ["오름차순", "내림차순"], key="detail_sort_order") == "오름차순"
+            with size_col:
+                page_size = st.selectbox("페이지 크기", DETAIL_PAGE_SIZES, index=1, key="detail_page_size")
+            
+            page_no = st.session_state.get("detail_page", 1)
+            result = detail_page(
+                champion_df, display_cols or all_cols,
+                sort_by=None if sort_by == "(원본 순서)" else sort_by, ascending=ascending,
+                page=page_no, page_size=page_size, filters=filters,
+            )
+            st.dataframe(result["rows"], use_container_width=True, height=400)
+            
+            page_col, info_col = st.columns([1, 3])
+            with page_col:
+                # 필터로 페이지 수가 줄면 현재 페이지를 범위 안으로 맞춤 (위젯 생성 전에만 가능)
+                if st.session_state.get("detail_page", 1) != result["page"]:
+                    st.session_state["detail_page"] = result["page"]
+                st.number_input("페이지", min_value=1, max_value=result["pages"], key="detail_page")
+            with info_col:
+                first_row = min((result["page"] - 1) * page_size + 1, result["total"])
+                last_row = min(result["page"] * page_size, result["total"])
+                st.caption(f"{result['total']:,}행 중 {first_row:,}–{last_row:,} · 총 {result['pages']:,}페이지")
+            
+            # 데이터 다운로드 (버튼을 누를 때만 CSV 생성)
+            st.download_button(
+                label="📥 현재 챔피언 데이터 다운로드",
+                data=lambda: csv_bytes(champion_df),
+                file_name=f"{selected_champion}_data.csv",
+                mime="text/csv",
+                on_click="ignore",
+            )
+    
+    with tab5:
+        min_games = st.slider("최소 게임 수", min_value=1, max_value=100, value=10, key="matchup_min_games")
+        st.caption("최고는 95% 신뢰구간 하한, 최저는 상한 기준으로 정렬")
+        ally_col, enemy_col = st.columns(2)
+        
+        for column, side, title, good, bad in [
+            (ally_col, "ally", "🤝 아군 시너지", "좋은 조합", "나쁜 조합"),
+            (enemy_col, "enemy", "⚔️ 상대 상성", "유리한 상대", "불리한 상대"),
+        ]:
+            with column:
+                st.subheader(title)
+                side_stats = matchup_stats(matchups, selected_champion, side, min_games)
+                if side_stats.empty:
+                    st.info("조건에 맞는 데이터가 없습니다.")
+                    continue
+                
+                st.write(f"**{good}**")
+                st.dataframe(matchup_display(side_stats.sort_values("ci_low", ascending=False).head(10)),
+                             use_container_width=True, hide_index=True)
+                st.write(f"**{bad}**")
+                st.dataframe(matchup_display(side_stats.sort_values("ci_high").head(10)),
+                             use_container_width=True, hide_index=True)
     
     # 푸터
     st.markdown("---")
@@ -831,7 +810,7 @@ def main():
     with col2:
         st.caption(f"📊 **{total_games:,}** 총 게임")
     with col3:
-        st.caption(f"🔄 Data Dragon **v{DDRAGON_VERSION}**")
+        st.caption(f"🔄 Data Dragon **v{dd_version()}**")
     with col4:
         st.caption(f"🛡️ **{len(EXTENDED_ITEM_MAPPING)}** 매핑 아이템")
 
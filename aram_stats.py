@@ -0,0 +1,1778 @@
+# aram_stats.py
+# ARAM 통계 엔진 - Streamlit 없이 쓰는 데이터 로드 / Data Dragon / 통계 라이브러리
+#
+# import 시에는 네트워크나 Data Dragon 로드를 하지 않는다.
+# 아이콘 해석기는 처음 필요할 때 default_resolver() 로 만든다.
+#
+# 사용법:
+#   python aram_stats.py build [CSV] [--summary out.csv]     # 로드 + 컬럼형 캐시 + 챔피언 요약
+#   python aram_stats.py build DELTA.csv --append-to STORE   # 증분 집계 저장소에 추가
+#   python aram_stats.py build [CSV] --rank-by shrunk_rate --min-games 50   # 표본 보정 순위
+#   python aram_stats.py export [CSV] --out DIR --format parquet
+#   python aram_stats.py bench [CSV] [--json] [--memory]     # 단계별 소요 시간 / 최대 메모리
+#   python aram_stats.py --offline ...                       # Data Dragon 네트워크 사용 안 함
+import os, io, re, ast, sys, json, time, argparse, hashlib, tracemalloc
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import ddragon
+from icons import IconResolver
+from builds import BuildIndex
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+try:
+    import resource  # 최대 RSS (Windows 에는 없음)
+except ImportError:
+    resource = None
+
+# ------------------------------------------------------------------
+# 확장된 아이템 & 스펠 매핑 (하드코딩)
+# ------------------------------------------------------------------
+EXTENDED_ITEM_MAPPING = {
+    # 신발류
+    "Boots of Speed": "1001",
+    "Berserker's Greaves": "3006", 
+    "Sorcerer's Shoes": "3020",
+    "Plated Steelcaps": "3047",
+    "Mercury's Treads": "3111",
+    "Ionian Boots of Lucidity": "3158",
+    "Boots of Swiftness": "3009",
+    "Mobility Boots": "3117",
+    
+    # AD 아이템
+    "Infinity Edge": "3031",
+    "Bloodthirster": "3072",
+    "The Collector": "6676",
+    "Lord Dominik's Regards": "3036",
+    "Mortal Reminder": "3033",
+    "Kraken Slayer": "6672",
+    "Galeforce": "6671",
+    "Immortal Shieldbow": "6673",
+    "Eclipse": "6692",
+    "Prowler's Claw": "6693",
+    "Essence Reaver": "3508",
+    "Navori Quickblades": "6675",
+    "Phantom Dancer": "3046",
+    "Rapid Firecannon": "3094",
+    "Runaan's Hurricane": "3085",
+    "Statikk Shiv": "3087",
+    "Stormrazor": "3095",
+    
+    # AP 아이템  
+    "Rabadon's Deathcap": "3089",
+    "Void Staff": "3135",
+    "Zhonya's Hourglass": "3157",
+    "Banshee's Veil": "3102",
+    "Luden's Tempest": "6655",
+    "Everfrost": "6656",
+    "Riftmaker": "4633",
+    "Crown of the Shattered Queen": "4644",
+    "Hextech Rocketbelt": "3152",
+    "Night Harvester": "4636",
+    "Nashor's Tooth": "3115",
+    "Lich Bane": "3100",
+    "Cosmic Drive": "4629",
+    "Demonic Embrace": "4637",
+    "Shadowflame": "4645",
+    "Horizon Focus": "4628",
+    
+    # 탱크 아이템
+    "Sunfire Aegis": "6664",
+    "Frostfire Gauntlet": "6662",
+    "Turbo Chemtank": "6667",
+    "Dead Man's Plate": "3742",
+    "Randuin's Omen": "3143",
+    "Thornmail": "3075",
+    "Spirit Visage": "3065",
+    "Force of Nature": "4401",
+    "Abyssal Mask": "3001",
+    "Frozen Heart": "3110",
+    "Righteous Glory": "3800",
+    "Warmog's Armor": "3083",
+    
+    # 서포터 아이템
+    "Locket of the Iron Solari": "3190",
+    "Shurelya's Battlesong": "2065",
+    "Imperial Mandate": "4005",
+    "Moonstone Renewer": "6617",
+    "Staff of Flowing Water": "6616",
+    "Chemtech Putrifier": "3011",
+    "Ardent Censer": "3504",
+    "Redemption": "3107",
+    "Mikael's Blessing": "3222",
+    
+    # 정글 아이템
+    "Goredrinker": "6630",
+    "Stridebreaker": "6631",
+    "Divine Sunderer": "6632",
+    "Trinity Force": "3078",
+    "Black Cleaver": "3071",
+    "Sterak's Gage": "3053",
+    "Death's Dance": "6333",
+    "Maw of Malmortius": "3156",
+    
+    # 기타 인기 아이템
+    "Guardian Angel": "3026",
+    "Youmuu's Ghostblade": "3142",
+    "Edge of Night": "3814",
+    "Serpent's Fang": "6695",
+    "Chempunk Chainsword": "6609",
+    "Silvermere Dawn": "6035",
+    "Mercurial Scimitar": "3139",
+    "Wit's End": "3091",
+    "Blade of the Ruined King": "3153",
+    "Guinsoo's Rageblade": "3124",
+    
+    # 소모품/기타
+    "Health Potion": "2003",
+    "Control Ward": "2055",
+    "Doran's Blade": "1055",
+    "Doran's Ring": "1056",
+    "Doran's Shield": "1054",
+    "Long Sword": "1036",
+    "Amplifying Tome": "1052",
+    "Ruby Crystal": "1028",
+    "Cloth Armor": "1029",
+    "Null-Magic Mantle": "1033"
+}
+
+EXTENDED_SPELL_MAPPING = {
+    "Flash": "SummonerFlash",
+    "Ignite": "SummonerDot", 
+    "Heal": "SummonerHeal",
+    "Barrier": "SummonerBarrier",
+    "Exhaust": "SummonerExhaust",
+    "Teleport": "SummonerTeleport",
+    "Ghost": "SummonerHaste",
+    "Cleanse": "SummonerBoost",
+    "Smite": "SummonerSmite",
+    "Mark": "SummonerSnowball",
+    "Snowball": "SummonerSnowball", 
+    "Clarity": "SummonerMana",
+    "Poro-Toss": "SummonerSnowball",
+    
+    # 영어 소문자 매핑
+    "flash": "SummonerFlash",
+    "ignite": "SummonerDot",
+    "heal": "SummonerHeal",
+    "barrier": "SummonerBarrier",
+    "exhaust": "SummonerExhaust",
+    "teleport": "SummonerTeleport",
+    "ghost": "SummonerHaste",
+    "cleanse": "SummonerBoost",
+    "smite": "SummonerSmite",
+    "mark": "SummonerSnowball",
+    "snowball": "SummonerSnowball",
+    "clarity": "SummonerMana"
+}
+
+# ------------------------------------------------------------------
+# Data Dragon (처음 필요할 때 한 번만 로드)
+# ------------------------------------------------------------------
+def default_version() -> str:
+    """로컬 스냅샷 → 네트워크(허용 시) 순으로 최신 버전, 실패하면 기본 버전"""
+    try:
+        return ddragon.resolve_version()
+    except Exception:
+        return ddragon.DEFAULT_VERSION
+
+@lru_cache(maxsize=None)
+def dd_maps_for_version(ver: str) -> Dict:
+    """버전별 Data Dragon 매핑 (로드 실패 시 빈 매핑)"""
+    try:
+        return ddragon.build_dd_maps(ver, ddragon.load_raw(ver))
+    except Exception:
+        return ddragon.empty_dd_maps(ver)
+
+@lru_cache(maxsize=None)
+def resolver_for_version(ver: str) -> IconResolver:
+    return IconResolver(dd_maps_for_version(ver), EXTENDED_ITEM_MAPPING, EXTENDED_SPELL_MAPPING)
+
+@lru_cache(maxsize=1)
+def default_resolver() -> IconResolver:
+    """resolver 인자를 생략했을 때 쓰는 프로세스 공용 해석기"""
+    return resolver_for_version(default_version())
+
+# ------------------------------------------------------------------
+# 개선된 CSV 로더 
+# ------------------------------------------------------------------
+CSV_CANDIDATES = [
+    "aram_participants_with_full_runes_merged_plus.csv",
+    "aram_participants_with_full_runes_merged.csv", 
+    "aram_participants_with_full_runes.csv",
+    "aram_participants_clean_preprocessed.csv",
+    "aram_participants_clean_no_dupe_items.csv",
+    "aram_participants_with_items.csv",
+]
+
+def discover_csv():
+    for filename in CSV_CANDIDATES:
+        if os.path.exists(filename):
+            return filename
+    return None
+
+def safe_convert(x):
+    return 1 if str(x).strip().lower() in ("1", "true", "t", "yes") else 0
+
+def parse_list_column(s):
+    if isinstance(s, list):
+        return s
+    if not isinstance(s, str) or not s.strip():
+        return []
+    try:
+        v = ast.literal_eval(s)
+        if isinstance(v, list):
+            return v
+    except:
+        pass
+    
+    delimiter = "|" if "|" in s else "," if "," in s else None
+    return [t.strip() for t in s.split(delimiter)] if delimiter else [s]
+
+def detect_list_format(text: pd.Series, sample_size: int = 1000) -> str:
+    """비어있지 않은 셀 샘플의 다수 표기로 리스트 형식 판별 (literal / pipe / comma)"""
+    sample = text[text != ""].head(sample_size)
+    if sample.empty:
+        return "comma"
+    counts = {
+        "literal": int(sample.str.startswith("[").sum()),
+        "pipe": int((~sample.str.startswith("[") & sample.str.contains("|", regex=False)).sum()),
+    }
+    counts["comma"] = len(sample) - counts["literal"] - counts["pipe"]
+    return max(counts, key=counts.get)
+
+def parse_list_column_bulk(series: pd.Series) -> pd.DataFrame:
+    """리스트 컬럼 전체를 문자열 연산으로 한 번에 파싱 (행 × 슬롯 프레임)
+    
+    형식과 맞지 않는 셀만 parse_list_column 으로 개별 처리한다.
+    """
+    text = series.where(series.notna(), "").astype(str).str.strip()
+    fmt = detect_list_format(text)
+    
+    is_bracketed = text.str.startswith("[")
+    if fmt == "literal":
+        ok = (text == "") | (is_bracketed & text.str.endswith("]") & ~text.str.contains("\\", regex=False))
+        body, delimiter = text.str[1:-1], ","
+    elif fmt == "pipe":
+        ok = ~is_bracketed & (text.str.contains("|", regex=False) | ~text.str.contains(",", regex=False))
+        body, delimiter = text, "|"
+    else:
+        ok = ~is_bracketed & ~text.str.contains("|", regex=False)
+        body, delimiter = text, ","
+    
+    parts = body[ok].str.split(delimiter, expand=True)
+    for col in parts.columns:
+        parts[col] = parts[col].str.strip()
+        if fmt == "literal":
+            parts[col] = parts[col].str.strip("'\"")
+    
+    fallback_index = text.index[~ok]
+    if len(fallback_index):
+        fallback = pd.DataFrame(
+            [[str(v).strip() for v in parse_list_column(series[i])] for i in fallback_index],
+            index=fallback_index,
+        )
+        parts = pd.concat([parts, fallback])
+    
+    return parts.reindex(text.index).replace("", np.nan)
+
+LIST_COLUMNS = ["team_champs", "enemy_champs"]
+
+def list_slot_columns(df: pd.DataFrame, col: str) -> List[str]:
+    """team_champs_0, team_champs_1, ... 슬롯 컬럼 목록"""
+    prefix = f"{col}_"
+    return [c for c in df.columns if c.startswith(prefix) and c[len(prefix):].isdigit()]
+
+def encode_list_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """리스트 컬럼을 챔피언 공통 카테고리를 공유하는 고정 폭 슬롯 컬럼으로 변환"""
+    parsed = {col: parse_list_column_bulk(df[col]) for col in LIST_COLUMNS if col in df.columns}
+    if not parsed:
+        return df
+    
+    vocab = set(df["champion"].dropna().astype(str)) if "champion" in df.columns else set()
+    for parts in parsed.values():
+        vocab.update(pd.unique(parts.to_numpy().ravel()))
+    categories = sorted(v for v in vocab if isinstance(v, str))
+    
+    slots = {}
+    for col, parts in parsed.items():
+        for i in parts.columns:
+            slots[f"{col}_{i}"] = pd.Categorical(parts[i], categories=categories)
+    
+    return pd.concat([df.drop(columns=list(parsed)), pd.DataFrame(slots, index=df.index)], axis=1)
+
+def champion_slot_codes(df: pd.DataFrame, col: str) -> np.ndarray:
+    """(행 × 슬롯) int16 챔피언 코드 배열, 빈 슬롯은 -1"""
+    slot_cols = list_slot_columns(df, col)
+    if not slot_cols:
+        return np.empty((len(df), 0), dtype=np.int16)
+    return np.column_stack([df[c].cat.codes.to_numpy() for c in slot_cols]).astype(np.int16)
+
+def champion_lists(df: pd.DataFrame, col: str) -> pd.Series:
+    """슬롯 컬럼을 다시 챔피언 이름 리스트로 변환 (표시용)"""
+    slot_cols = list_slot_columns(df, col)
+    values = df[slot_cols].astype(object).to_numpy()
+    return pd.Series([[v for v in row if isinstance(v, str)] for row in values], index=df.index)
+
+def clean_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """원본 참가자 컬럼 정리 (승리, 스펠 조합, 아이템, DPM, KDA - 리스트 컬럼 제외)"""
+    # 기본 컬럼 처리
+    df["win_clean"] = df.get("win", 0).apply(safe_convert)
+    
+    # 스펠 컬럼 처리
+    s1_col, s2_col = spell_columns(df)
+    
+    df["spell_combo"] = (
+        df[s1_col].astype(str).fillna("") + " + " + 
+        df[s2_col].astype(str).fillna("")
+    ).str.strip()
+    
+    # 아이템 컬럼 정리
+    item_cols = get_item_columns(df)
+    for col in item_cols:
+        df[col] = df[col].fillna("").astype(str).str.strip()
+    
+    # 게임 시간 및 DPM 계산
+    df["duration_min"] = pd.to_numeric(df.get("game_end_min"), errors="coerce").fillna(18).clip(6, 40)
+    df["dpm"] = df.get("damage_total", np.nan) / df["duration_min"].replace(0, np.nan)
+    
+    # KDA 계산
+    for stat in ["kills", "deaths", "assists"]:
+        df[stat] = pd.to_numeric(df.get(stat, 0), errors="coerce").fillna(0)
+    
+    df["kda"] = (df["kills"] + df["assists"]) / df["deaths"].replace(0, np.nan)
+    df["kda"] = df["kda"].fillna(df["kills"] + df["assists"])
+    
+    return df
+
+def preprocess_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """원본 참가자 데이터 전처리 (컬럼 정리 + 리스트 컬럼 슬롯 인코딩)"""
+    return encode_list_columns(clean_columns(df))
+
+def spell_columns(df: pd.DataFrame) -> List[str]:
+    s1_col = "spell1_name" if "spell1_name" in df.columns else "spell1"
+    s2_col = "spell2_name" if "spell2_name" in df.columns else "spell2"
+    return [col for col in (s1_col, s2_col) if col in df.columns]
+
+def _categorical(values: pd.Series, known=()) -> pd.Categorical:
+    return pd.Categorical(values, categories=sorted(set(known) | set(values.dropna().unique())))
+
+def encode_categorical_columns(df: pd.DataFrame, resolver: Optional[IconResolver] = None) -> pd.DataFrame:
+    """챔피언/아이템/스펠 문자열 컬럼을 Data Dragon 이름 기준 Categorical 로 변환
+    
+    아이템 컬럼끼리, 챔피언과 team/enemy 슬롯끼리는 같은 카테고리를 공유해
+    코드(int8/int16)만으로 비교·집계할 수 있다.
+    """
+    resolver = resolver or default_resolver()
+    
+    # 아이템: 빈 값은 NaN(코드 -1)으로
+    item_cols = get_item_columns(df)
+    if item_cols:
+        items = df[item_cols].where(~df[item_cols].isin(EMPTY_SENTINELS))
+        known_items = set(resolver.item_exact)
+        known_items.update(pd.unique(items.to_numpy().ravel()))
+        item_vocab = sorted(v for v in known_items if isinstance(v, str))
+        for col in item_cols:
+            df[col] = pd.Categorical(items[col], categories=item_vocab)
+    
+    # 스펠
+    known_spells = set(resolver.spell_exact)
+    for col in spell_columns(df):
+        df[col] = _categorical(df[col].astype(str), known_spells)
+    if "spell_combo" in df.columns:
+        df["spell_combo"] = _categorical(df["spell_combo"])
+    
+    # 챔피언 (team/enemy 슬롯과 카테고리 공유)
+    if "champion" in df.columns:
+        slot_cols = [c for col in LIST_COLUMNS for c in list_slot_columns(df, col)]
+        known_champs = set(resolver.champ_exact)
+        for col in slot_cols:
+            known_champs.update(df[col].cat.categories)
+        df["champion"] = _categorical(df["champion"], known_champs)
+        for col in slot_cols:
+            df[col] = df[col].cat.set_categories(df["champion"].cat.categories)
+    
+    return df
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """컬럼별 메모리 사용량 비교 (MB)"""
+    report = pd.DataFrame({
+        "before_mb": before.memory_usage(deep=True, index=False) / 1e6,
+        "after_mb": after.memory_usage(deep=True, index=False) / 1e6,
+    }).round(3)
+    report.loc["TOTAL"] = report.sum()
+    report["ratio"] = (report["before_mb"] / report["after_mb"]).round(1)
+    return report
+
+def _map_values(series: pd.Series, mapping: Dict) -> np.ndarray:
+    """고유값(카테고리) 단위 매핑을 전체 행에 적용 (object 배열, 매핑 없음은 None)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        lookup = np.array([mapping.get(c) for c in series.cat.categories] + [None], dtype=object)
+        return lookup[series.cat.codes.to_numpy()]
+    return series.map(mapping).astype(object).where(series.notna(), None).to_numpy()
+
+def _distinct_values(df: pd.DataFrame, cols: List[str]) -> List[str]:
+    values = set()
+    for col in cols:
+        values.update(df[col].dropna().unique())
+    return [v for v in values if isinstance(v, str) and v.strip() not in EMPTY_SENTINELS]
+
+def _count_unresolved(series: pd.Series, names: List[str], counts: Dict[str, int]):
+    if not names:
+        return
+    for name, count in series[series.isin(names)].value_counts().items():
+        if count:
+            counts[name] = counts.get(name, 0) + int(count)
+
+def add_canonical_ids(df: pd.DataFrame, resolver: IconResolver) -> pd.DataFrame:
+    """아이템/스펠 이름을 고유값 단위로 Data Dragon ID 로 해석해 *_id 컬럼 추가
+    
+    df.attrs 에 ID → 대표 이름과 해석하지 못한 이름(등장 횟수)을 기록한다.
+    """
+    unresolved = {"items": {}, "spells": {}}
+    
+    # 아이템: item0 → item0_id
+    item_cols = get_item_columns(df)
+    item_ids = {v: resolver.canonical_item_id(v.strip()) for v in _distinct_values(df, item_cols)}
+    item_categories = sorted({v for v in item_ids.values() if v})
+    unresolved_items = [name for name, item_id in item_ids.items() if not item_id]
+    for col in item_cols:
+        df[f"{col}_id"] = pd.Categorical(_map_values(df[col], item_ids), categories=item_categories)
+        _count_unresolved(df[col], unresolved_items, unresolved["items"])
+    
+    # 스펠: spell1/spell2 → spell1_id/spell2_id, 조합 → spell_combo_id
+    s_cols = spell_columns(df)
+    spell_ids = {v: resolver.canonical_spell_id(v.strip()) for v in _distinct_values(df, s_cols)}
+    spell_categories = sorted({v for v in spell_ids.values() if v})
+    unresolved_spells = [name for name, spell_id in spell_ids.items() if not spell_id]
+    id_arrays = []
+    for i, col in enumerate(s_cols, start=1):
+        ids = _map_values(df[col], spell_ids)
+        id_arrays.append(ids)
+        df[f"spell{i}_id"] = pd.Categorical(ids, categories=spell_categories)
+        _count_unresolved(df[col], unresolved_spells, unresolved["spells"])
+    
+    if len(id_arrays) == 2:
+        both = ~pd.isna(id_arrays[0]) & ~pd.isna(id_arrays[1])
+        combo = np.full(len(df), None, dtype=object)
+        combo[both] = [f"{a} + {b}" for a, b in zip(id_arrays[0][both], id_arrays[1][both])]
+        df["spell_combo_id"] = pd.Categorical(combo)
+    
+    df.attrs["item_names"] = {item_id: resolver.item_names.get(item_id, item_id) for item_id in item_categories}
+    df.attrs["spell_names"] = {spell_id: resolver.spell_names.get(spell_id, spell_id) for spell_id in spell_categories}
+    df.attrs["unresolved"] = unresolved
+    return df
+
+def load_frame(file_input, compact: bool = True, resolver=None, ddragon_version: str = "") -> pd.DataFrame:
+    """CSV 로드 및 전처리 (로컬 CSV는 컬럼형 캐시 사용)
+    
+    compact=True 이면 챔피언/아이템/스펠 컬럼을 Categorical 로 인코딩한다.
+    아이템/스펠은 Data Dragon ID 컬럼(*_id)도 함께 만든다.
+    resolver 는 IconResolver 또는 그것을 돌려주는 함수이고, ddragon_version 을 함께 주면
+    캐시가 유효할 때는 해석기를 만들지 않는다 (Data Dragon 매핑 로드 생략).
+    """
+    if resolver is None:
+        ddragon_version = ddragon_version or default_version()
+        resolver = lambda: resolver_for_version(ddragon_version)
+    get_resolver = resolver if callable(resolver) else lambda: resolver
+    
+    is_local_csv = isinstance(file_input, str)
+    if is_local_csv:
+        ddragon_version = ddragon_version or get_resolver().version
+        cached = read_columnar_cache(file_input, compact, ddragon_version)
+        if cached is not None:
+            return cached
+    
+    resolver = get_resolver()
+    df = preprocess_dataframe(pd.read_csv(file_input))
+    if compact:
+        df = encode_categorical_columns(df, resolver)
+    df = add_canonical_ids(df, resolver)
+    
+    if is_local_csv:
+        write_columnar_cache(file_input, df, compact, resolver.version)
+    return df
+
+# ------------------------------------------------------------------
+# 컬럼형 디스크 캐시 (Feather)
+# ------------------------------------------------------------------
+CACHE_FORMAT_VERSION = 3
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def columnar_cache_paths(csv_path: str, compact: bool = True):
+    """CSV 옆에 저장되는 (데이터, 메타) 캐시 경로"""
+    base = os.path.splitext(csv_path)[0] + (".compact" if compact else "")
+    return f"{base}.cache.feather", f"{base}.cache.json"
+
+def read_columnar_cache(csv_path: str, compact: bool = True, ddragon_version: str = "") -> Optional[pd.DataFrame]:
+    """원본 CSV의 크기/mtime/해시가 일치하면 캐시를 메모리 맵으로 읽기"""
+    if feather is None:
+        return None
+    
+    data_path, meta_path = columnar_cache_paths(csv_path, compact)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None
+    
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        
+        if meta.get("format") != CACHE_FORMAT_VERSION or meta.get("ddragon") != ddragon_version:
+            return None
+        
+        stat = os.stat(csv_path)
+        if meta.get("size") != stat.st_size:
+            return None
+        
+        # mtime만 바뀐 경우 해시로 내용 동일 여부 확인
+        if meta.get("mtime_ns") != stat.st_mtime_ns:
+            if meta.get("sha256") != file_sha256(csv_path):
+                return None
+            meta["mtime_ns"] = stat.st_mtime_ns
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        
+        return feather.read_table(data_path, memory_map=True).to_pandas()
+    
+    except Exception:
+        return None
+
+def write_columnar_cache(csv_path: str, df: pd.DataFrame, compact: bool = True,
+                         ddragon_version: str = "") -> bool:
+    """전처리된 데이터프레임을 캐시로 저장 (실패해도 로드는 계속 진행)"""
+    if feather is None:
+        return False
+    
+    data_path, meta_path = columnar_cache_paths(csv_path, compact)
+    tmp_path = f"{data_path}.tmp"
+    
+    try:
+        stat = os.stat(csv_path)
+        meta = {
+            "format": CACHE_FORMAT_VERSION,
+            "ddragon": ddragon_version,
+            "source": os.path.basename(csv_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_sha256(csv_path),
+            "rows": len(df),
+        }
+        
+        # 메모리 맵 읽기를 위해 비압축 저장
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+        os.replace(tmp_path, data_path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return True
+    
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+# ------------------------------------------------------------------
+# 챔피언 요약 테이블 (로드 시 1회 계산)
+# ------------------------------------------------------------------
+SUMMARY_METRICS = ["win_clean", "kills", "deaths", "assists", "dpm", "kda",
+                   "first_blood_min", "game_end_min"]
+
+def champion_partials(df: pd.DataFrame) -> pd.DataFrame:
+    """챔피언별 games 와 지표별 count / sum (청크끼리 더할 수 있는 형태)"""
+    if df.empty or "champion" not in df.columns:
+        return pd.DataFrame()
+
+    metrics = [col for col in SUMMARY_METRICS if col in df.columns]
+    numeric = df[metrics].apply(pd.to_numeric, errors="coerce")
+    grouped = numeric.groupby(df["champion"].astype(object).rename("champion"))
+
+    partials = grouped.agg(["count", "sum"])
+    partials.columns = [f"{metric}_{agg}" for metric, agg in partials.columns]
+    partials.insert(0, "games", grouped.size())
+    return partials
+
+def finalize_champion_summary(partials: pd.DataFrame, total_games: int) -> pd.DataFrame:
+    """count / sum 으로 평균, 승률, 픽률을 계산한 요약 테이블"""
+    summary = partials.copy()
+    for col in [c for c in partials.columns if c.endswith("_sum")]:
+        metric = col[:-len("_sum")]
+        summary[f"{metric}_mean"] = summary[col] / summary[f"{metric}_count"].replace(0, np.nan)
+
+    summary["wins"] = summary.get("win_clean_sum", 0)
+    summary["win_rate"] = summary.get("win_clean_mean", 0) * 100
+    summary["pick_rate"] = summary["games"] / total_games * 100 if total_games else 0.0
+    summary = add_confidence(summary, pooled_win_rate(summary))
+    summary.attrs["total_games"] = total_games
+    return summary
+
+def count_total_games(df: pd.DataFrame) -> int:
+    return df["matchId"].nunique() if "matchId" in df else len(df)
+
+def build_champion_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """챔피언별 count / sum / mean 을 단일 groupby 로 계산"""
+    if df.empty or "champion" not in df.columns:
+        return pd.DataFrame()
+    return finalize_champion_summary(champion_partials(df), count_total_games(df))
+
+# ------------------------------------------------------------------
+# 통계적 신뢰도 (Wilson 구간 / 베이지안 축소 / 최소 표본)
+# ------------------------------------------------------------------
+PRIOR_GAMES = 20  # 축소 강도: 기준 승률을 이만큼의 가상 게임으로 섞음
+CONFIDENCE_COLUMNS = ["ci_low", "ci_high", "shrunk_rate"]
+RANK_KEYS = {"games": ["games", "win_rate"], "shrunk_rate": ["shrunk_rate", "games"], "ci_low": ["ci_low", "games"]}
+
+def wilson_interval(wins, games, z: float = 1.96):
+    """승률의 Wilson 신뢰구간 (%, 벡터 입력 가능)"""
+    wins = np.asarray(wins, dtype=float)
+    games = np.asarray(games, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = wins / games
+        denom = 1 + z ** 2 / games
+        center = (p + z ** 2 / (2 * games)) / denom
+        half = z * np.sqrt(p * (1 - p) / games + z ** 2 / (4 * games ** 2)) / denom
+    return (center - half) * 100, (center + half) * 100
+
+def pooled_win_rate(stats: pd.DataFrame) -> float:
+    """전체 승리 수 / 전체 게임 수 (0~1, 게임이 없으면 0.5)"""
+    games = stats["games"].sum() if "games" in stats else 0
+    return float(stats["wins"].sum() / games) if games else 0.5
+
+def add_confidence(stats: pd.DataFrame, baseline, prior_games: float = PRIOR_GAMES) -> pd.DataFrame:
+    """games / wins 테이블에 ci_low / ci_high (Wilson 95%, %) 와 shrunk_rate 컬럼 추가
+    
+    shrunk_rate 는 기준 승률(baseline, 0~1)을 prior_games 판의 가상 게임으로 섞은 베타 사후 평균(%)이다.
+    baseline 은 스칼라 또는 행별 배열(예: 행마다 그 챔피언의 승률)로, 모든 행을 한 번에 계산한다.
+    """
+    if stats.empty or "wins" not in stats:
+        return stats.assign(ci_low=pd.Series(dtype=float), ci_high=pd.Series(dtype=float),
+                            shrunk_rate=pd.Series(dtype=float))
+    wins = pd.to_numeric(stats["wins"], errors="coerce").fillna(0).to_numpy(dtype=float)
+    games = stats["games"].to_numpy(dtype=float)
+    baseline = np.broadcast_to(np.asarray(baseline, dtype=float), games.shape)
+    low, high = wilson_interval(wins, games)
+    shrunk = (wins + prior_games * baseline) / (games + prior_games) * 100
+    return stats.assign(ci_low=np.round(low, 2), ci_high=np.round(high, 2), shrunk_rate=np.round(shrunk, 2))
+
+def rank_stats(stats: pd.DataFrame, min_games: int = 1, rank_by: str = "games") -> pd.DataFrame:
+    """최소 게임 수 필터 후 정렬 (games: 게임 수·승률, shrunk_rate / ci_low: 보정 승률·게임 수)"""
+    if rank_by not in RANK_KEYS:
+        raise ValueError(f"지원하지 않는 정렬 기준: {rank_by}")
+    if stats.empty:
+        return stats
+    stats = stats[stats["games"] >= min_games]
+    return stats.sort_values(RANK_KEYS[rank_by], ascending=False, kind="stable")
+
+def champion_baselines(champions: pd.DataFrame) -> pd.Series:
+    """챔피언 부분 집계(champion_partials)에서 챔피언별 승률 (0~1)"""
+    if champions.empty or "win_clean_sum" not in champions:
+        return pd.Series(dtype=float)
+    return champions["win_clean_sum"] / champions["win_clean_count"].replace(0, np.nan)
+
+def confidence_by_champion(counts: pd.DataFrame, baselines: pd.Series,
+                           prior_games: float = PRIOR_GAMES) -> pd.DataFrame:
+    """(champion, 키) 카운트 전체에 신뢰도 컬럼을 한 번에 추가 (행마다 해당 챔피언 승률로 축소)"""
+    if counts.empty:
+        return add_confidence(counts, 0.5, prior_games)
+    champion_rates = baselines.reindex(counts.index.get_level_values("champion")).to_numpy(dtype=float)
+    fallback = pooled_win_rate(counts)
+    return add_confidence(counts, np.where(np.isnan(champion_rates), fallback, champion_rates), prior_games)
+
+# ------------------------------------------------------------------
+# 벡터화된 통계 엔진
+# ------------------------------------------------------------------
+EMPTY_SENTINELS = ["", "0", "nan", "None"]
+
+def get_item_columns(df: pd.DataFrame) -> List[str]:
+    """원본 아이템 컬럼 (item0 ~ item6, 파생 *_id 컬럼 제외)"""
+    return [col for col in df.columns if col.startswith("item") and not col.endswith("_id")]
+
+def shared_categories(df: pd.DataFrame, cols: List[str]) -> Optional[pd.Index]:
+    """모든 컬럼이 같은 카테고리의 Categorical 이면 그 카테고리 반환"""
+    dtypes = [df[col].dtype for col in cols]
+    if not cols or not all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+        return None
+    categories = dtypes[0].categories
+    return categories if all(dtype.categories.equals(categories) for dtype in dtypes) else None
+
+def melt_item_columns(df: pd.DataFrame, extra_cols: List[str] = ()) -> pd.DataFrame:
+    """item* 컬럼을 (matchId, win_clean, item[, item_id]) long 형태로 변환 (행 순서 유지)
+    
+    extra_cols 에 지정한 컬럼(예: champion)은 각 행 값을 그대로 붙인다.
+    """
+    item_cols = get_item_columns(df)
+    if df.empty or not item_cols:
+        return pd.DataFrame(columns=["matchId", "win_clean", "item", *extra_cols])
+
+    n_rows, n_cols = len(df), len(item_cols)
+
+    # 행 우선(row-major)으로 펼쳐서 iterrows 결과와 같은 순서 유지
+    categories = shared_categories(df, item_cols)
+    if categories is not None:
+        # Categorical 인코딩된 경우 정수 코드만으로 처리
+        codes = np.column_stack([df[col].cat.codes.to_numpy() for col in item_cols]).ravel()
+        mask = codes >= 0
+        item_values = pd.Categorical.from_codes(codes[mask], categories=categories)
+    else:
+        raw = pd.Series(df[item_cols].to_numpy(dtype=object).ravel())
+        items = raw.astype(str).str.strip()
+        mask = (raw.notna() & items.notna() & ~items.isin(EMPTY_SENTINELS)).to_numpy()
+        item_values = items.to_numpy()[mask]
+    row_pos = np.repeat(np.arange(n_rows), n_cols)[mask]
+
+    match_ids = df["matchId"].to_numpy() if "matchId" in df.columns else df.index.to_numpy()
+    wins = df["win_clean"].to_numpy() if "win_clean" in df.columns else np.zeros(n_rows, dtype=int)
+
+    items_long = pd.DataFrame({
+        "matchId": match_ids[row_pos],
+        "win_clean": wins[row_pos],
+        "item": item_values,
+    })
+    # 수집 시 해석된 아이템 ID
+    id_cols = [f"{col}_id" for col in item_cols]
+    id_categories = shared_categories(df, id_cols) if all(c in df.columns for c in id_cols) else None
+    if id_categories is not None:
+        id_codes = np.column_stack([df[col].cat.codes.to_numpy() for col in id_cols]).ravel()[mask]
+        items_long["item_id"] = pd.Categorical.from_codes(id_codes, categories=id_categories)
+
+    for col in extra_cols:
+        items_long[col] = df[col].array.take(row_pos)
+
+    return items_long
+
+def _str_values(series: pd.Series) -> pd.Series:
+    """str(x) 와 같은 문자열 변환 (결측은 "nan", Categorical 은 카테고리 단위로 변환)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        lookup = np.array([str(c) for c in series.cat.categories] + ["nan"], dtype=object)
+        return pd.Series(lookup[series.cat.codes.to_numpy()], index=series.index)
+    return series.astype(object).map(str)
+
+def melt_spell_columns(df: pd.DataFrame, extra_cols: List[str] = ()) -> pd.DataFrame:
+    """스펠1 이 있는 행을 (matchId, win_clean, spell, spell_combo) long 형태로 변환 (행 순서 유지)"""
+    s1_col = "spell1_name" if "spell1_name" in df.columns else "spell1"
+    s2_col = "spell2_name" if "spell2_name" in df.columns else "spell2"
+    blank = pd.Series("", index=df.index, dtype=object)
+    spell1 = _str_values(df[s1_col]).str.strip() if s1_col in df.columns else blank
+    spell2 = _str_values(df[s2_col]).str.strip() if s2_col in df.columns else blank
+    
+    keep = ~spell1.isin(["", "nan", "None"]).to_numpy()
+    match_ids = df["matchId"].to_numpy() if "matchId" in df.columns else df.index.to_numpy()
+    win = df["win_clean"].to_numpy() if "win_clean" in df.columns else np.zeros(len(df), dtype=int)
+    spells_long = pd.DataFrame({
+        "matchId": match_ids[keep],
+        "win_clean": win[keep],
+        "spell": spell1.to_numpy()[keep],
+        "spell_combo": (spell1 + " + " + spell2).to_numpy()[keep],
+    })
+    for col in extra_cols:
+        spells_long[col] = df[col].array[keep]
+    return spells_long
+
+def _canonical_key(ids: pd.Series, raw: pd.Series) -> pd.Series:
+    """해석된 ID 가 있으면 ID, 없으면 원본 이름을 그룹 키로 사용"""
+    return ids.astype(object).where(ids.notna(), raw.astype(object))
+
+def _finish_stats(stats: pd.DataFrame, baseline: Optional[float] = None) -> pd.DataFrame:
+    """win_rate 와 (없으면) 신뢰도 컬럼을 붙여 게임 수, 승률 내림차순 정렬
+    
+    baseline 이 없으면 테이블 전체의 승률을 기준으로 축소한다.
+    """
+    stats = stats.assign(win_rate=lambda x: (x.wins / x.games * 100).round(2))
+    if "shrunk_rate" not in stats:
+        stats = add_confidence(stats, pooled_win_rate(stats) if baseline is None else baseline)
+    columns = [col for col in stats.columns if col not in CONFIDENCE_COLUMNS] + CONFIDENCE_COLUMNS
+    return rank_stats(stats[columns])
+
+def champion_win_rate(df: pd.DataFrame) -> Optional[float]:
+    """프레임 전체 승률 (0~1, 챔피언 한 명의 행이면 그 챔피언의 기준 승률)"""
+    if df.empty or "win_clean" not in df:
+        return None
+    return float(pd.to_numeric(df["win_clean"], errors="coerce").mean())
+
+def item_counts(df: pd.DataFrame, by: List[str] = ()) -> pd.DataFrame:
+    """(by..., 아이템 키)별 games / wins
+    
+    아이템 키는 해석된 Data Dragon ID, 해석되지 않았으면 원본 이름이다.
+    """
+    items_long = melt_item_columns(df, extra_cols=list(by))
+    if items_long.empty:
+        return pd.DataFrame(columns=["games", "wins"])
+
+    if "item_id" in items_long.columns:
+        key = _canonical_key(items_long["item_id"], items_long["item"])
+    else:
+        key = items_long["item"].astype(object)
+    keys = [items_long[col].astype(object) for col in by] + [key.rename("item")]
+    return items_long.groupby(keys).agg(games=("matchId", "count"), wins=("win_clean", "sum"))
+
+def finalize_item_stats(counts: pd.DataFrame, names: Dict[str, str], baseline: Optional[float] = None) -> pd.DataFrame:
+    """아이템 키별 카운트 → 대표 이름 인덱스 + item_id + win_rate / 신뢰도 (게임 수, 승률 내림차순)"""
+    if counts.empty:
+        return pd.DataFrame(columns=["item_id", "games", "wins", "win_rate", *CONFIDENCE_COLUMNS])
+    stats = counts.copy()
+    stats.insert(0, "item_id", [k if k in names else None for k in stats.index])
+    stats.index = pd.Index([names.get(k, k) for k in stats.index], name="item")
+    return _finish_stats(stats, baseline)
+
+def compute_item_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """아이템별 games / wins / win_rate (게임 수, 승률 내림차순)
+    
+    *_id 컬럼이 있으면 Data Dragon ID 로 묶어 같은 아이템의 다른 표기를 합친다.
+    인덱스는 대표 아이템 이름이다.
+    """
+    return finalize_item_stats(item_counts(df), df.attrs.get("item_names", {}), champion_win_rate(df))
+
+def spell_counts(df: pd.DataFrame, by: List[str] = ()) -> pd.DataFrame:
+    """(by..., 스펠 조합 키)별 games / wins (키는 "ID1 + ID2", 미해석이면 원본 조합)"""
+    if df.empty or "spell_combo" not in df.columns:
+        return pd.DataFrame(columns=["games", "wins"])
+
+    if "spell_combo_id" in df.columns:
+        key = _canonical_key(df["spell_combo_id"], df["spell_combo"])
+    else:
+        key = df["spell_combo"].astype(object)
+    keys = [df[col].astype(object) for col in by] + [key.rename("spell_combo")]
+    return df.groupby(keys).agg(games=("matchId", "count"), wins=("win_clean", "sum"))
+
+def finalize_spell_stats(counts: pd.DataFrame, names: Dict[str, str], baseline: Optional[float] = None) -> pd.DataFrame:
+    """조합 키별 카운트 → "스펠1 + 스펠2" 대표 이름 인덱스 + spell1_id/spell2_id + win_rate / 신뢰도"""
+    if counts.empty:
+        return pd.DataFrame(columns=["spell1_id", "spell2_id", "games", "wins", "win_rate", *CONFIDENCE_COLUMNS])
+    stats = counts.copy()
+    parts = [str(k).split(" + ") for k in stats.index]
+    resolved = [len(p) == 2 and all(s in names for s in p) for p in parts]
+    stats.insert(0, "spell1_id", [p[0] if ok else None for p, ok in zip(parts, resolved)])
+    stats.insert(1, "spell2_id", [p[1] if ok else None for p, ok in zip(parts, resolved)])
+    stats.index = pd.Index([" + ".join(names.get(s, s) for s in p) for p in parts], name="spell_combo")
+    return _finish_stats(stats, baseline)
+
+def compute_spell_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """스펠 조합별 games / wins / win_rate (인덱스는 "스펠1 + 스펠2" 대표 이름)"""
+    return finalize_spell_stats(spell_counts(df), df.attrs.get("spell_names", {}), champion_win_rate(df))
+
+# ------------------------------------------------------------------
+# 빌드 통계 (아이템 집합 색인)
+# ------------------------------------------------------------------
+BUILD_EXCLUDED_SLOTS = ["item6"]  # 장신구 슬롯
+
+def build_id_columns(df: pd.DataFrame) -> List[str]:
+    return [f"{col}_id" for col in get_item_columns(df)
+            if col not in BUILD_EXCLUDED_SLOTS and f"{col}_id" in df.columns]
+
+def build_index_from_frame(df: pd.DataFrame) -> Optional[BuildIndex]:
+    """*_id 컬럼 코드로 빌드 색인 생성 (ID 컬럼이 없으면 None)"""
+    id_cols = build_id_columns(df)
+    categories = shared_categories(df, id_cols)
+    if categories is None or "champion" not in df.columns:
+        return None
+    
+    champions = df["champion"]
+    if not isinstance(champions.dtype, pd.CategoricalDtype):
+        champions = champions.astype("category")
+    item_codes = np.column_stack([df[col].cat.codes.to_numpy() for col in id_cols])
+    return BuildIndex(champions.cat.codes.to_numpy(), item_codes, df["win_clean"].to_numpy(),
+                      champions.cat.categories, categories)
+
+# ------------------------------------------------------------------
+# 분포 히스토그램 (고정 구간 사전 집계)
+# ------------------------------------------------------------------
+HISTOGRAM_EDGES = {
+    "first_core_item_min": np.arange(0, 31, 1.0),  # 분
+    "dpm": np.arange(0, 6001, 250.0),
+}
+
+def champion_histograms(df: pd.DataFrame, column: str, edges=None) -> pd.DataFrame:
+    """챔피언 × 고정 구간 개수 표 (열은 구간 왼쪽 경계)
+    
+    전체 프레임을 np.bincount 한 번으로 센다. NaN 은 빼고, 범위 밖 값은 양 끝 구간에 넣는다.
+    차트에는 행 하나(구간 수만큼의 개수)만 보내므로 챔피언 게임 수와 관계없이 크기가 같다.
+    """
+    edges = HISTOGRAM_EDGES[column] if edges is None else np.asarray(edges, dtype=float)
+    n_bins = len(edges) - 1
+    columns = pd.Index(edges[:-1], name=column)
+    if df.empty or column not in df.columns or "champion" not in df.columns:
+        return pd.DataFrame(columns=columns, dtype=np.int64)
+    
+    champions = df["champion"]
+    if not isinstance(champions.dtype, pd.CategoricalDtype):
+        champions = champions.astype("category")
+    codes = champions.cat.codes.to_numpy().astype(np.int64)
+    values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+    valid = ~np.isnan(values) & (codes >= 0)
+    bins = np.clip(np.searchsorted(edges, values[valid], side="right") - 1, 0, n_bins - 1)
+    n_champions = len(champions.cat.categories)
+    counts = np.bincount(codes[valid] * n_bins + bins, minlength=n_champions * n_bins).reshape(n_champions, n_bins)
+    return pd.DataFrame(counts, index=pd.Index(champions.cat.categories.astype(object), name="champion"),
+                        columns=columns)
+
+# ------------------------------------------------------------------
+# 챔피언 시너지 / 상성 행렬
+# ------------------------------------------------------------------
+MATCHUP_SIDES = {"ally": "team_champs", "enemy": "enemy_champs"}
+
+def matchup_matrices(df: pd.DataFrame) -> Dict:
+    """(챔피언 × 상대/아군 챔피언) 게임 수·승리 수 int32 행렬
+    
+    슬롯 코드 배열을 펼쳐 np.bincount 한 번으로 누적한다 (행 단위 루프 없음).
+    ally 는 같은 팀(자기 자신 제외), enemy 는 상대 팀 챔피언이다.
+    """
+    slot_cols = [c for col in MATCHUP_SIDES.values() for c in list_slot_columns(df, col)]
+    categories = shared_categories(df, slot_cols)
+    if categories is None or "champion" not in df.columns:
+        return {"champions": pd.Index([], name="champion")}
+    
+    k = len(categories)
+    champion = df["champion"]
+    if isinstance(champion.dtype, pd.CategoricalDtype) and champion.cat.categories.equals(categories):
+        own = champion.cat.codes.to_numpy().astype(np.int64)
+    else:
+        own = pd.Categorical(champion.astype(object), categories=categories).codes.astype(np.int64)
+    wins = pd.to_numeric(df["win_clean"], errors="coerce").fillna(0).to_numpy() > 0
+    
+    matrices = {"champions": pd.Index(categories, name="champion")}
+    for side, col in MATCHUP_SIDES.items():
+        others = champion_slot_codes(df, col).astype(np.int64)
+        rows = np.repeat(own, others.shape[1])
+        flat = others.ravel()
+        valid = (rows >= 0) & (flat >= 0)
+        if side == "ally":
+            valid &= rows != flat
+        keys = rows[valid] * k + flat[valid]
+        row_wins = np.repeat(wins, others.shape[1])[valid]
+        matrices[f"{side}_games"] = np.bincount(keys, minlength=k * k).reshape(k, k).astype(np.int32)
+        matrices[f"{side}_wins"] = np.bincount(keys[row_wins], minlength=k * k).reshape(k, k).astype(np.int32)
+    return matrices
+
+def matchup_table(matrices: Dict) -> pd.DataFrame:
+    """행렬의 0 이 아닌 칸만 (side, champion, other) → games / wins long 테이블로"""
+    frames = []
+    champions = matrices["champions"]
+    for side in MATCHUP_SIDES:
+        if f"{side}_games" not in matrices:
+            continue
+        rows, cols = np.nonzero(matrices[f"{side}_games"])
+        frames.append(pd.DataFrame({
+            "side": side,
+            "champion": champions[rows],
+            "other": champions[cols],
+            "games": matrices[f"{side}_games"][rows, cols],
+            "wins": matrices[f"{side}_wins"][rows, cols],
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["games", "wins"])
+    return pd.concat(frames, ignore_index=True).set_index(["side", "champion", "other"])
+
+def matchup_stats(table: pd.DataFrame, champion: str, side: str, min_games: int = 1) -> pd.DataFrame:
+    """선택 챔피언의 아군/상대별 games / wins / win_rate / 95% 신뢰구간"""
+    key = (side, champion)
+    if table.empty or key not in table.index.droplevel("other"):
+        return pd.DataFrame(columns=["games", "wins", "win_rate", "ci_low", "ci_high"])
+    stats = table.xs(key, level=["side", "champion"])
+    stats = stats[stats["games"] >= min_games].copy()
+    stats["win_rate"] = (stats["wins"] / stats["games"] * 100).round(2)
+    low, high = wilson_interval(stats["wins"], stats["games"])
+    stats["ci_low"] = np.round(low, 2)
+    stats["ci_high"] = np.round(high, 2)
+    return stats
+
+# ------------------------------------------------------------------
+# 스트리밍 집계 (메모리보다 큰 CSV)
+# ------------------------------------------------------------------
+CHUNK_ROWS = 200_000
+
+def match_hashes(values) -> np.ndarray:
+    """matchId 값의 정렬된 고유 64비트 해시 (Python 집합 대신 매치당 8바이트)"""
+    values = pd.Series(values).dropna().astype(str).to_numpy(dtype=object)
+    return np.unique(pd.util.hash_array(values))
+
+def empty_aggregates() -> Dict:
+    return {
+        "rows": 0,
+        "match_hashes": None,
+        "champions": pd.DataFrame(),
+        "items": pd.DataFrame(),
+        "spells": pd.DataFrame(),
+        "matchups": pd.DataFrame(),
+        "item_names": {},
+        "spell_names": {},
+        "unresolved": {"items": {}, "spells": {}},
+    }
+
+def _add_counts(total: pd.DataFrame, part: pd.DataFrame) -> pd.DataFrame:
+    """같은 키의 카운트 테이블을 인덱스 기준으로 합산"""
+    if total.empty:
+        return part
+    if part.empty:
+        return total
+    levels = list(range(total.index.nlevels))
+    return pd.concat([total, part]).groupby(level=levels).sum()
+
+def _add_name_counts(total: Dict[str, int], part: Dict[str, int]) -> Dict[str, int]:
+    merged = dict(total)
+    for name, count in part.items():
+        merged[name] = merged.get(name, 0) + count
+    return merged
+
+def chunk_aggregates(df: pd.DataFrame) -> Dict:
+    """전처리된 청크 하나의 부분 집계 (챔피언 / 챔피언×아이템 / 챔피언×스펠 카운트)"""
+    unresolved = df.attrs.get("unresolved", {})
+    return {
+        "rows": len(df),
+        "match_hashes": match_hashes(df["matchId"]) if "matchId" in df else None,
+        "champions": champion_partials(df),
+        "items": item_counts(df, by=["champion"]),
+        "spells": spell_counts(df, by=["champion"]),
+        "matchups": matchup_table(matchup_matrices(df)),
+        "item_names": df.attrs.get("item_names", {}),
+        "spell_names": df.attrs.get("spell_names", {}),
+        "unresolved": {"items": unresolved.get("items", {}), "spells": unresolved.get("spells", {})},
+    }
+
+def merge_aggregates(total: Dict, part: Dict) -> Dict:
+    """part 를 total 에 더한 집계 (매치 해시는 정렬된 배열끼리 합집합)"""
+    hashes = total["match_hashes"]
+    if part["match_hashes"] is not None:
+        hashes = part["match_hashes"] if hashes is None else np.union1d(hashes, part["match_hashes"])
+    return {
+        "rows": total["rows"] + part["rows"],
+        "match_hashes": hashes,
+        "champions": _add_counts(total["champions"], part["champions"]),
+        "items": _add_counts(total["items"], part["items"]),
+        "spells": _add_counts(total["spells"], part["spells"]),
+        "matchups": _add_counts(total["matchups"], part["matchups"]),
+        "item_names": {**total["item_names"], **part["item_names"]},
+        "spell_names": {**total["spell_names"], **part["spell_names"]},
+        "unresolved": {
+            key: _add_name_counts(total["unresolved"][key], part["unresolved"][key])
+            for key in ("items", "spells")
+        },
+        "appends": total.get("appends", []),
+    }
+
+def clean_chunk(chunk: pd.DataFrame, resolver: Optional[IconResolver] = None) -> pd.DataFrame:
+    """load_frame 과 같은 전처리 + ID 해석 (Categorical 인코딩 제외)"""
+    return add_canonical_ids(preprocess_dataframe(chunk), resolver or default_resolver())
+
+def iter_clean_chunks(file_input, chunk_rows: int = CHUNK_ROWS, row_filter=None,
+                      resolver: Optional[IconResolver] = None):
+    """CSV 를 chunk_rows 행씩 읽어 전처리된 청크를 내보냄
+    
+    row_filter 는 원본 청크 → bool 마스크 함수로, 전처리 전에 적용된다.
+    """
+    for chunk in pd.read_csv(file_input, chunksize=chunk_rows):
+        if row_filter is not None:
+            chunk = chunk[row_filter(chunk)].reset_index(drop=True)
+            if chunk.empty:
+                continue
+        yield clean_chunk(chunk, resolver)
+
+def aggregate_csv(file_input, chunk_rows: int = CHUNK_ROWS, progress=None, row_filter=None,
+                  resolver: Optional[IconResolver] = None) -> Dict:
+    """CSV 전체를 청크 단위로 집계 (메모리 사용량은 청크 크기 + 집계 크기)
+    
+    progress 가 주어지면 청크마다 지금까지 처리한 행 수로 호출한다.
+    """
+    aggregates = empty_aggregates()
+    for chunk in iter_clean_chunks(file_input, chunk_rows, row_filter, resolver):
+        aggregates = merge_aggregates(aggregates, chunk_aggregates(chunk))
+        if progress is not None:
+            progress(aggregates["rows"])
+    return with_confidence(aggregates)
+
+def aggregate_total_games(aggregates: Dict) -> int:
+    """고유 매치 수 (매치 해시 → 저장소의 매치 수 → 행 수 순으로 사용)"""
+    hashes = aggregates["match_hashes"]
+    if hashes is not None:
+        return len(hashes)
+    return aggregates.get("matches", aggregates["rows"])
+
+def aggregate_summary(aggregates: Dict) -> pd.DataFrame:
+    """집계에서 build_champion_summary 와 같은 형태의 요약 테이블"""
+    if aggregates["champions"].empty:
+        return pd.DataFrame()
+    return finalize_champion_summary(aggregates["champions"], aggregate_total_games(aggregates))
+
+def _champion_counts(counts: pd.DataFrame, champion: str) -> pd.DataFrame:
+    if counts.empty or champion not in counts.index.get_level_values("champion"):
+        return pd.DataFrame(columns=["games", "wins"])
+    return counts.xs(champion, level="champion")
+
+def with_confidence(aggregates: Dict, prior_games: float = PRIOR_GAMES) -> Dict:
+    """모든 챔피언의 아이템 / 스펠 카운트에 신뢰도 컬럼을 한 번에 붙여 집계에 "confidence" 로 저장
+    
+    행마다 해당 챔피언의 승률로 축소한다. 캐시되는 집계에 함께 담아 두면
+    챔피언을 바꿀 때는 xs 조회만 하면 된다 (merge_aggregates 결과에는 남지 않으므로 다시 계산).
+    """
+    baselines = champion_baselines(aggregates["champions"])
+    aggregates["confidence"] = {
+        kind: confidence_by_champion(aggregates[kind], baselines, prior_games) for kind in ("items", "spells")
+    }
+    return aggregates
+
+def _confidence_counts(aggregates: Dict, kind: str, champion: str) -> Tuple[pd.DataFrame, Optional[float]]:
+    """(챔피언 카운트, 기준 승률) - with_confidence 결과가 있으면 신뢰도 컬럼까지 포함"""
+    table = aggregates.get("confidence", {}).get(kind, aggregates[kind])
+    baseline = champion_baselines(aggregates["champions"]).get(champion)
+    return _champion_counts(table, champion), (None if pd.isna(baseline) else float(baseline))
+
+def aggregate_item_stats(aggregates: Dict, champion: str) -> pd.DataFrame:
+    """집계에서 compute_item_stats(champion_df) 와 같은 결과"""
+    counts, baseline = _confidence_counts(aggregates, "items", champion)
+    return finalize_item_stats(counts, aggregates["item_names"], baseline)
+
+def aggregate_spell_stats(aggregates: Dict, champion: str) -> pd.DataFrame:
+    """집계에서 compute_spell_stats(champion_df) 와 같은 결과"""
+    counts, baseline = _confidence_counts(aggregates, "spells", champion)
+    return finalize_spell_stats(counts, aggregates["spell_names"], baseline)
+
+# ------------------------------------------------------------------
+# 증분 집계 저장소 (델타 파일 추가)
+# ------------------------------------------------------------------
+AGGREGATE_STORE_DIR = os.environ.get("ARAM_AGGREGATE_STORE", "aram_aggregates")
+STORE_FORMAT_VERSION = 3
+STORE_TABLES = ["champions", "items", "spells", "matchups"]
+# 매치 안에서 참가자를 구분하는 컬럼 (앞쪽 우선, ARAM 은 챔피언 중복이 없음)
+PARTICIPANT_KEYS = ["participantId", "puuid", "summonerName", "riotIdGameName", "champion"]
+# 키 해시를 matchId 해시로 나눠 저장하는 버킷 수 (델타가 건드린 버킷만 읽고 다시 씀)
+KEY_BUCKETS = 64
+
+def participant_key_column(df: pd.DataFrame) -> str:
+    for col in PARTICIPANT_KEYS:
+        if col in df.columns:
+            return col
+    raise ValueError(f"참가자 구분 컬럼이 없습니다: {PARTICIPANT_KEYS}")
+
+def participant_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """(matchId, participant) 중복 제거 키 (문자열로 통일)"""
+    if "matchId" not in df.columns:
+        raise ValueError("증분 추가에는 matchId 컬럼이 필요합니다")
+    key_col = participant_key_column(df)
+    return pd.DataFrame({
+        "matchId": df["matchId"].astype(str).to_numpy(dtype=object),
+        "participant": df[key_col].astype(str).to_numpy(dtype=object),
+    })
+
+def key_hashes(keys: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """participant_keys 의 (키 해시, 매치 해시) - 매치 해시는 match_hashes 와 같은 값"""
+    match = pd.util.hash_array(keys["matchId"].to_numpy(dtype=object))
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy(), match
+
+def store_meta_path(store_dir: str = AGGREGATE_STORE_DIR) -> str:
+    return os.path.join(store_dir, "meta.json")
+
+def key_bucket_path(store_dir: str, bucket: int, kind: str) -> str:
+    return os.path.join(store_dir, "keys", f"{bucket:03d}.{kind}.npy")
+
+def read_key_bucket(store_dir: str, bucket: int) -> Tuple[np.ndarray, np.ndarray]:
+    """버킷의 정렬된 (키 해시, 매치 해시) - 메모리 매핑이라 searchsorted 가 닿는 부분만 읽음"""
+    arrays = []
+    for kind in ("keys", "matches"):
+        path = key_bucket_path(store_dir, bucket, kind)
+        arrays.append(np.load(path, mmap_mode="r") if os.path.exists(path) else np.empty(0, dtype=np.uint64))
+    return arrays[0], arrays[1]
+
+def sorted_contains(sorted_values: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """정렬된 배열에 values 각각이 있는지 (isin 과 같지만 sorted_values 를 훑지 않음)"""
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    pos = np.searchsorted(sorted_values, values)
+    return sorted_values[np.minimum(pos, len(sorted_values) - 1)] == values
+
+def read_aggregate_store(store_dir: str = AGGREGATE_STORE_DIR) -> Optional[Dict]:
+    """저장된 집계 (없거나 형식이 다르면 None) - 키 버킷은 읽지 않음"""
+    meta_path = store_meta_path(store_dir)
+    if feather is None or not os.path.exists(meta_path):
+        return None
+    
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format") != STORE_FORMAT_VERSION:
+        return None
+    
+    aggregates = empty_aggregates()
+    for name in STORE_TABLES:
+        table = feather.read_feather(os.path.join(store_dir, f"{name}.feather"))
+        index_cols = meta["index"][name]
+        aggregates[name] = table.set_index(index_cols) if not table.empty else pd.DataFrame()
+    aggregates["rows"] = meta["rows"]
+    aggregates["matches"] = meta["matches"]
+    for key in ("item_names", "spell_names", "unresolved"):
+        aggregates[key] = meta[key]
+    aggregates["appends"] = meta.get("appends", [])
+    return with_confidence(aggregates)
+
+def write_aggregate_store(aggregates: Dict, new_keys: Dict[int, Tuple[np.ndarray, np.ndarray]],
+                          store_dir: str = AGGREGATE_STORE_DIR, source: str = "", ddragon_version: str = ""):
+    """집계 테이블과 건드린 키 버킷을 저장 (meta.json 을 마지막에 교체)
+    
+    new_keys 는 버킷 번호 → 새 (키 해시, 매치 해시) 로, 해당 버킷만 기존 값과 합쳐 다시 쓴다.
+    """
+    if feather is None:
+        raise RuntimeError("집계 저장소에는 pyarrow 가 필요합니다")
+    os.makedirs(os.path.join(store_dir, "keys"), exist_ok=True)
+    
+    added = 0
+    for bucket, (keys, matches) in new_keys.items():
+        stored = read_key_bucket(store_dir, bucket)
+        for kind, old, new in zip(("keys", "matches"), stored, (keys, matches)):
+            merged = np.union1d(old, new)
+            path = key_bucket_path(store_dir, bucket, kind)
+            with open(f"{path}.tmp", "wb") as f:
+                np.save(f, merged)
+            os.replace(f"{path}.tmp", path)
+        added += len(keys)
+    appends = list(aggregates.get("appends", [])) + [{"source": source, "rows": added}]
+    
+    index = {}
+    for name in STORE_TABLES:
+        table = aggregates[name]
+        index[name] = [n for n in table.index.names if n is not None] if not table.empty else []
+        tmp_path = os.path.join(store_dir, f"{name}.feather.tmp")
+        feather.write_feather(table.reset_index() if index[name] else pd.DataFrame(), tmp_path)
+        os.replace(tmp_path, os.path.join(store_dir, f"{name}.feather"))
+    
+    meta = {
+        "format": STORE_FORMAT_VERSION,
+        "ddragon": ddragon_version,
+        "rows": aggregates["rows"],
+        "matches": aggregate_total_games(aggregates),
+        "index": index,
+        "item_names": aggregates["item_names"],
+        "spell_names": aggregates["spell_names"],
+        "unresolved": aggregates["unresolved"],
+        "appends": appends,
+    }
+    tmp_meta = f"{store_meta_path(store_dir)}.tmp"
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_meta, store_meta_path(store_dir))
+
+def append_delta(file_input, store_dir: str = AGGREGATE_STORE_DIR, chunk_rows: int = CHUNK_ROWS,
+                 resolver: Optional[IconResolver] = None) -> Dict:
+    """델타 CSV 를 (matchId, 참가자) 기준으로 중복 제거해 저장된 집계에 더함
+    
+    처리 비용은 델타 행 수, 집계 크기, 델타가 건드린 키 버킷 크기에 비례한다
+    (기존 원본은 다시 읽지 않고, 저장된 키는 건드린 버킷에서 이진 탐색만 함).
+    """
+    if feather is None:
+        raise RuntimeError("집계 저장소에는 pyarrow 가 필요합니다")
+    resolver = resolver or default_resolver()
+    aggregates = read_aggregate_store(store_dir)
+    if aggregates is None and os.path.exists(store_meta_path(store_dir)):
+        raise RuntimeError(f"{store_dir} 저장소 형식이 현재 버전과 다릅니다. 새 폴더에 다시 만들어주세요.")
+    aggregates = aggregates or empty_aggregates()
+    matches = aggregates.get("matches", 0)
+    
+    report = {"rows": 0, "added": 0, "duplicates": 0, "matches": 0}
+    stored, added = {}, {}  # 버킷 번호 → 저장된 / 이번 델타의 (키 해시, 매치 해시)
+    for chunk in pd.read_csv(file_input, chunksize=chunk_rows):
+        keys, match = key_hashes(participant_keys(chunk))
+        buckets = match % KEY_BUCKETS
+        # 같은 청크 안의 중복 → 버킷별로 저장소 / 이전 청크의 중복 (버킷 수만큼만 반복)
+        fresh = ~pd.Series(keys).duplicated().to_numpy()
+        new_match = np.zeros(len(keys), dtype=bool)
+        for bucket in np.unique(buckets[fresh]).tolist():
+            rows = np.flatnonzero(fresh & (buckets == bucket))
+            if bucket not in stored:
+                stored[bucket] = read_key_bucket(store_dir, bucket)
+            prev_keys, prev_matches = added.get(bucket, (np.empty(0, dtype=np.uint64),) * 2)
+            seen = sorted_contains(stored[bucket][0], keys[rows]) | sorted_contains(prev_keys, keys[rows])
+            fresh[rows[seen]] = False
+            rows = rows[~seen]
+            if not len(rows):
+                continue
+            known = sorted_contains(stored[bucket][1], match[rows]) | sorted_contains(prev_matches, match[rows])
+            new_match[rows[~known]] = True
+            added[bucket] = (np.union1d(prev_keys, keys[rows]), np.union1d(prev_matches, match[rows]))
+        report["rows"] += len(chunk)
+        report["duplicates"] += int((~fresh).sum())
+        if not fresh.any():
+            continue
+        
+        part = chunk_aggregates(clean_chunk(chunk[fresh].reset_index(drop=True), resolver))
+        part["match_hashes"] = None  # 매치 수는 버킷 기준으로 따로 셈
+        aggregates = merge_aggregates(aggregates, part)
+        report["added"] += int(fresh.sum())
+        report["matches"] += len(np.unique(match[new_match]))
+    
+    aggregates["matches"] = matches + report["matches"]
+    source = file_input if isinstance(file_input, str) else getattr(file_input, "name", "")
+    write_aggregate_store(aggregates, added, store_dir, os.path.basename(str(source)), resolver.version)
+    return report
+
+def store_stamp(store_dir: str = AGGREGATE_STORE_DIR) -> int:
+    """저장소 변경 감지용 meta.json mtime (없으면 0)"""
+    meta_path = store_meta_path(store_dir)
+    return os.stat(meta_path).st_mtime_ns if os.path.exists(meta_path) else 0
+
+# ------------------------------------------------------------------
+# 파티션 데이터셋 (패치/날짜별 파일 + 매니페스트)
+# ------------------------------------------------------------------
+DATASET_DIR = os.environ.get("ARAM_DATASET_DIR", "aram_dataset")
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT_VERSION = 1
+PATCH_COLUMNS = ["patch", "game_version", "gameVersion"]
+DATE_COLUMNS = ["game_date", "gameCreation", "gameStartTimestamp"]
+
+def normalize_patch(version) -> Optional[str]:
+    """"15.1.123.4567" → "15.1" (major.minor)"""
+    parts = re.findall(r"\d+", str(version))
+    return ".".join(parts[:2]) if len(parts) >= 2 else None
+
+def patch_sort_key(patch: str):
+    return tuple(int(p) for p in patch.split("."))
+
+def path_partition_values(rel_path: str) -> Dict[str, str]:
+    """hive 스타일 경로(patch=15.1/date=2025-01-02/...)에서 파티션 값 추출"""
+    values = {}
+    for segment in rel_path.replace("\\", "/").split("/"):
+        key, sep, value = segment.partition("=")
+        if sep and key in ("patch", "date"):
+            values[key] = normalize_patch(value) if key == "patch" else value
+    return values
+
+def row_patches(df: pd.DataFrame) -> Optional[pd.Series]:
+    col = next((c for c in PATCH_COLUMNS if c in df.columns), None)
+    if col is None:
+        return None
+    uniques = df[col].dropna().unique()
+    return df[col].map({v: normalize_patch(v) for v in uniques})
+
+def row_dates(df: pd.DataFrame) -> Optional[pd.Series]:
+    """게임 날짜 "YYYY-MM-DD" (숫자 컬럼은 epoch ms 로 해석)"""
+    col = next((c for c in DATE_COLUMNS if c in df.columns), None)
+    if col is None:
+        return None
+    values = df[col]
+    if pd.api.types.is_numeric_dtype(values):
+        dates = pd.to_datetime(values, unit="ms", errors="coerce")
+    else:
+        dates = pd.to_datetime(values, errors="coerce")
+    return dates.dt.strftime("%Y-%m-%d")
+
+def scan_partition(path: str, rel_path: str, chunk_rows: int = CHUNK_ROWS) -> Dict:
+    """파티션 파일 한 개의 행 수, 패치 목록, 날짜 min/max (파티션 컬럼만 읽음)"""
+    stat = os.stat(path)
+    from_path = path_partition_values(rel_path)
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [next((c for c in cols if c in header), None) for cols in (PATCH_COLUMNS, DATE_COLUMNS)]
+    usecols = [c for c in usecols if c] or [header[0]]
+    
+    rows, patches, dates = 0, set(), []
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_rows):
+        rows += len(chunk)
+        chunk_patches, chunk_dates = row_patches(chunk), row_dates(chunk)
+        if chunk_patches is not None:
+            patches.update(chunk_patches.dropna().unique())
+        if chunk_dates is not None and chunk_dates.notna().any():
+            dates += [chunk_dates.min(), chunk_dates.max()]
+    
+    if "patch" in from_path:
+        patches.add(from_path["patch"])
+    if "date" in from_path:
+        dates += [from_path["date"]]
+    patch_list = sorted(patches, key=patch_sort_key)
+    return {
+        "rows": rows,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "patches": patch_list,
+        "patch_min": patch_list[0] if patch_list else None,
+        "patch_max": patch_list[-1] if patch_list else None,
+        "date_min": min(dates) if dates else None,
+        "date_max": max(dates) if dates else None,
+    }
+
+def read_manifest(dataset_dir: str = DATASET_DIR) -> Optional[Dict]:
+    path = os.path.join(dataset_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    return manifest if manifest.get("format") == MANIFEST_FORMAT_VERSION else None
+
+def build_manifest(dataset_dir: str = DATASET_DIR, chunk_rows: int = CHUNK_ROWS) -> Dict:
+    """데이터셋 폴더의 CSV 파티션을 스캔해 manifest.json 갱신 (크기/mtime 이 같은 파일은 재사용)"""
+    previous = (read_manifest(dataset_dir) or {}).get("partitions", {})
+    partitions = {}
+    for root, _, files in os.walk(dataset_dir):
+        for name in sorted(files):
+            if not name.endswith(".csv") or name.endswith(".cache.csv"):
+                continue
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, dataset_dir).replace(os.sep, "/")
+            stat = os.stat(path)
+            entry = previous.get(rel_path)
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                partitions[rel_path] = entry
+            else:
+                partitions[rel_path] = scan_partition(path, rel_path, chunk_rows)
+    
+    manifest = {"format": MANIFEST_FORMAT_VERSION, "partitions": dict(sorted(partitions.items()))}
+    tmp_path = os.path.join(dataset_dir, f"{MANIFEST_NAME}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, os.path.join(dataset_dir, MANIFEST_NAME))
+    return manifest
+
+def manifest_patches(manifest: Dict) -> List[str]:
+    patches = {p for entry in manifest["partitions"].values() for p in entry["patches"]}
+    return sorted(patches, key=patch_sort_key)
+
+def manifest_date_range(manifest: Dict):
+    entries = manifest["partitions"].values()
+    mins = [e["date_min"] for e in entries if e["date_min"]]
+    maxs = [e["date_max"] for e in entries if e["date_max"]]
+    return (min(mins), max(maxs)) if mins else (None, None)
+
+def prune_partitions(manifest: Dict, patches=None, date_range=None) -> List[str]:
+    """패치 목록/날짜 범위와 겹칠 수 있는 파티션만 (정보가 없는 파티션은 거르지 않음)"""
+    selected = []
+    for rel_path, entry in manifest["partitions"].items():
+        if patches and entry["patches"] and not set(entry["patches"]) & set(patches):
+            continue
+        if date_range and entry["date_min"]:
+            start, end = date_range
+            if entry["date_max"] < start or entry["date_min"] > end:
+                continue
+        selected.append(rel_path)
+    return selected
+
+def partition_row_filter(rel_path: str, patches=None, date_range=None):
+    """파티션 안에서 필터 조건에 맞는 행 마스크 함수 (경계 파티션용)"""
+    from_path = path_partition_values(rel_path)
+    
+    def row_filter(chunk: pd.DataFrame) -> pd.Series:
+        mask = pd.Series(True, index=chunk.index)
+        if patches:
+            chunk_patches = row_patches(chunk)
+            if chunk_patches is not None:
+                mask &= chunk_patches.isin(patches)
+            elif "patch" in from_path:
+                mask &= from_path["patch"] in patches
+        if date_range:
+            chunk_dates = row_dates(chunk)
+            if chunk_dates is not None:
+                mask &= chunk_dates.between(*date_range)
+            elif "date" in from_path:
+                mask &= date_range[0] <= from_path["date"] <= date_range[1]
+        return mask
+    
+    return row_filter
+
+def partition_aggregates(path: str, rel_path: str, patches=None, date_range=None,
+                         resolver: Optional[IconResolver] = None) -> Dict:
+    """파티션 한 개의 (필터된) 집계"""
+    return aggregate_csv(path, row_filter=partition_row_filter(rel_path, patches, date_range), resolver=resolver)
+
+def dataset_aggregates(dataset_dir: str, manifest: Dict, patches=None, date_range=None,
+                       resolver: Optional[IconResolver] = None, partition_loader=None) -> Dict:
+    """매니페스트로 가지치기한 파티션만 읽어 합친 집계
+    
+    partition_loader(path, rel_path, entry) 로 파티션 집계 방식을 바꿀 수 있다 (예: 캐시).
+    """
+    if partition_loader is None:
+        partition_loader = lambda path, rel_path, entry: partition_aggregates(
+            path, rel_path, patches, date_range, resolver)
+    aggregates = empty_aggregates()
+    for rel_path in prune_partitions(manifest, patches, date_range):
+        path = os.path.join(dataset_dir, rel_path)
+        aggregates = merge_aggregates(aggregates, partition_loader(path, rel_path, manifest["partitions"][rel_path]))
+    return with_confidence(aggregates)
+
+# ------------------------------------------------------------------
+# 상세 테이블 (서버 측 필터 / 정렬 / 페이지)
+# ------------------------------------------------------------------
+DETAIL_PAGE_SIZES = [25, 50, 100, 200]
+
+def detail_mask(df: pd.DataFrame, filters: Optional[Dict] = None) -> np.ndarray:
+    """filters = {컬럼: 문자열(대소문자 무시 부분 일치) 또는 (최소, 최대)} 를 만족하는 행 마스크"""
+    mask = np.ones(len(df), dtype=bool)
+    for col, cond in (filters or {}).items():
+        if col not in df.columns or cond in (None, ""):
+            continue
+        values = df[col]
+        if isinstance(cond, tuple):
+            low, high = cond
+            numeric = pd.to_numeric(values, errors="coerce")
+            if low is not None:
+                mask &= (numeric >= low).to_numpy(dtype=bool, na_value=False)
+            if high is not None:
+                mask &= (numeric <= high).to_numpy(dtype=bool, na_value=False)
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            # 카테고리 단위로 한 번만 비교하고 코드로 펼침 (결측 코드 -1 은 끝에 붙인 False)
+            hits = values.cat.categories.astype(str).str.contains(str(cond), case=False, regex=False)
+            mask &= np.append(hits, False)[values.cat.codes.to_numpy()]
+        else:
+            mask &= values.astype(str).str.contains(str(cond), case=False, regex=False).to_numpy(
+                dtype=bool, na_value=False)
+    return mask
+
+def detail_page(df: pd.DataFrame, columns: Optional[List[str]] = None, sort_by: Optional[str] = None,
+                ascending: bool = True, page: int = 1, page_size: int = 50,
+                filters: Optional[Dict] = None) -> Dict:
+    """필터 → 정렬 → 슬라이스한 한 페이지 (선택한 컬럼의 해당 행만 복사)
+    
+    반환: {"rows": 페이지 DataFrame, "total": 필터 후 행 수, "pages": 페이지 수, "page": 실제 페이지}
+    """
+    columns = [c for c in (columns or list(df.columns)) if c in df.columns]
+    positions = np.flatnonzero(detail_mask(df, filters))
+    if sort_by in df.columns and len(positions):
+        keys = df[sort_by].iloc[positions].reset_index(drop=True)
+        order = keys.sort_values(ascending=ascending, na_position="last", kind="stable").index.to_numpy()
+        positions = positions[order]
+    
+    total = len(positions)
+    pages = max(1, -(-total // page_size))
+    page = min(max(1, int(page)), pages)
+    start = (page - 1) * page_size
+    rows = df.iloc[positions[start:start + page_size]][columns]
+    return {"rows": rows, "total": total, "pages": pages, "page": page}
+
+def csv_bytes(df: pd.DataFrame, chunk_rows: int = 50_000) -> bytes:
+    """CSV 바이트 (청크 단위로 써서 문자열 사본을 한 번에 크게 만들지 않음)"""
+    buffer = io.BytesIO()
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        buffer.write(chunk.to_csv(index=False, header=start == 0).encode("utf-8"))
+    return buffer.getvalue()
+
+# ------------------------------------------------------------------
+# 데이터 분석 함수들
+# ------------------------------------------------------------------
+def analyze_champion_data(df: pd.DataFrame, champion: str):
+    """챔피언별 데이터 분석 및 CSV 저장"""
+    champion_df = df[df["champion"] == champion].copy()
+    
+    # 아이템 / 스펠 데이터 추출
+    items_df = export_item_table(melt_item_columns(champion_df)).assign(champion=champion)
+    spells_df = melt_spell_columns(champion_df).assign(champion=champion)
+    
+    # CSV 저장
+    results = {}
+    if not items_df.empty:
+        items_filename = f"{champion}_items_analysis.csv"
+        items_df.to_csv(items_filename, index=False, encoding='utf-8')
+        results["items"] = items_filename
+    
+    if not spells_df.empty:
+        spells_filename = f"{champion}_spells_analysis.csv"
+        spells_df.to_csv(spells_filename, index=False, encoding='utf-8')
+        results["spells"] = spells_filename
+    
+    return results
+
+# ------------------------------------------------------------------
+# 전체 챔피언 일괄 내보내기
+# ------------------------------------------------------------------
+EXPORT_FORMATS = ["csv", "parquet"]
+
+def export_item_table(items_long: pd.DataFrame) -> pd.DataFrame:
+    """내보내기용 아이템 테이블 - 기존 파일 형식(matchId, win_clean, item, champion) 유지 (item_id 제외)"""
+    return items_long.drop(columns="item_id", errors="ignore")
+
+def champion_export_tables(df: pd.DataFrame) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """챔피언별 {"items", "spells"} long 테이블 (전체 프레임을 한 번만 펼친 뒤 챔피언으로 분할)"""
+    tables = {}
+    for kind, long_df in [("items", export_item_table(melt_item_columns(df, extra_cols=["champion"]))),
+                          ("spells", melt_spell_columns(df, extra_cols=["champion"]))]:
+        for champion, part in long_df.groupby("champion", sort=False, observed=True):
+            tables.setdefault(champion, {})[kind] = part.reset_index(drop=True)
+    return tables
+
+def write_table(table: pd.DataFrame, path: str, fmt: str = "csv") -> str:
+    if fmt == "parquet":
+        table.to_parquet(path, index=False)
+    else:
+        table.to_csv(path, index=False, encoding="utf-8")
+    return path
+
+def export_all_champions(df: pd.DataFrame, out_dir: str = ".", fmt: str = "csv", workers: Optional[int] = None,
+                         use_processes: bool = False, progress=None) -> Dict:
+    """모든 챔피언의 {champion}_items/spells_analysis 파일을 풀에서 동시에 저장
+    
+    파일 내용은 analyze_champion_data 와 같다. progress 는 (완료 수, 전체 수, 경로)로 호출된다.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    
+    tables = champion_export_tables(df)
+    jobs = [
+        (table, os.path.join(out_dir, f"{champion}_{kind}_analysis.{fmt}"), fmt)
+        for champion, kinds in tables.items() for kind, table in kinds.items() if not table.empty
+    ]
+    split_sec = time.perf_counter() - start
+    
+    files = []
+    pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        futures = [pool.submit(write_table, *job) for job in jobs]
+        for future in as_completed(futures):
+            files.append(future.result())
+            if progress is not None:
+                progress(len(files), len(jobs), files[-1])
+    
+    return {
+        "champions": len(tables),
+        "files": sorted(files),
+        "rows": sum(len(job[0]) for job in jobs),
+        "split_sec": round(split_sec, 3),
+        "total_sec": round(time.perf_counter() - start, 3),
+    }
+
+# ------------------------------------------------------------------
+# 단계별 측정
+# ------------------------------------------------------------------
+def _peak_rss_mb() -> Optional[float]:
+    """프로세스 최대 RSS (MB, resource 모듈이 없는 플랫폼은 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1e6 if sys.platform == "darwin" else 1e3), 1)
+
+def stage_profile(file_input, compact: bool = True, resolver: Optional[IconResolver] = None,
+                  export_dir: Optional[str] = None, track_memory: bool = False) -> Dict:
+    """로드부터 통계 / 내보내기까지 단계별 소요 시간과 최대 추가 메모리 (컬럼형 캐시 미사용)
+    
+    반환: {"rows", "stages": {단계: {"sec"[, "peak_mb"]}}, "peak_rss_mb"}
+    track_memory 이면 단계마다 tracemalloc 을 새로 켜 그 단계 동안의 최대 추가 할당(MB)을 잰다
+    (NumPy / pandas 버퍼 포함, 측정 자체로 조금 느려짐). export_dir 가 있으면 전체 챔피언 내보내기도 잰다.
+    """
+    resolver = resolver or default_resolver()
+    stages = {}
+    
+    def timed(stage, fn, *args):
+        if track_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = fn(*args)
+        stages[stage] = {"sec": round(time.perf_counter() - start, 4)}
+        if track_memory:
+            stages[stage]["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+            tracemalloc.stop()
+        return result
+    
+    df = timed("read_csv", pd.read_csv, file_input)
+    df = timed("clean", clean_columns, df)
+    df = timed("list_parse", encode_list_columns, df)
+    if compact:
+        df = timed("encode", encode_categorical_columns, df, resolver)
+    df = timed("canonical_ids", add_canonical_ids, df, resolver)
+    timed("champion_summary", build_champion_summary, df)
+    
+    champion_df = df[df["champion"] == df["champion"].value_counts().index[0]]
+    timed("item_stats", compute_item_stats, champion_df)
+    timed("spell_stats", compute_spell_stats, champion_df)
+    timed("matchups", lambda frame: matchup_table(matchup_matrices(frame)), df)
+    timed("build_index", build_index_from_frame, df)
+    timed("histograms", lambda frame: [champion_histograms(frame, col) for col in HISTOGRAM_EDGES], df)
+    if export_dir is not None:
+        timed("export", export_all_champions, df, export_dir)
+    return {"rows": len(df), "stages": stages, "peak_rss_mb": _peak_rss_mb()}
+
+# ------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------
+def _top_champions(summary: pd.DataFrame, top: int, min_games: int = 1, rank_by: str = "games") -> str:
+    columns = ["games", "win_rate", "pick_rate", *CONFIDENCE_COLUMNS]
+    return rank_stats(summary, min_games, rank_by)[columns].head(top).round(2).to_string()
+
+def run_build(args):
+    start = time.perf_counter()
+    resolver = default_resolver()
+    if args.append_to:
+        report = append_delta(args.csv, args.append_to, args.chunk_rows, resolver)
+        summary = aggregate_summary(read_aggregate_store(args.append_to))
+        print(f"appended {report['added']:,} rows / {report['matches']:,} new matches "
+              f"({report['duplicates']:,} duplicates) -> {args.append_to}")
+    elif args.streaming:
+        summary = aggregate_summary(aggregate_csv(args.csv, args.chunk_rows, resolver=resolver))
+    else:
+        df = load_frame(args.csv, not args.no_compact, resolver)
+        summary = build_champion_summary(df)
+        print(f"rows: {len(df):,} / memory: {df.memory_usage(deep=True).sum() / 1e6:,.1f} MB")
+    
+    if args.summary:
+        summary.to_csv(args.summary, encoding="utf-8")
+        print(f"summary -> {args.summary}")
+    if not summary.empty:
+        print(_top_champions(summary, args.top, args.min_games, args.rank_by))
+        print(f"champions: {len(summary)} / games: {summary.attrs['total_games']:,}")
+    print(f"done in {time.perf_counter() - start:.2f}s (Data Dragon v{resolver.version})")
+
+def run_export(args):
+    df = load_frame(args.csv, not args.no_compact)
+    report = export_all_champions(
+        df, args.out, args.format, args.workers, args.processes,
+        progress=lambda done, total, path: print(f"[{done}/{total}] {path}"),
+    )
+    print(f"{report['champions']} champions / {len(report['files'])} files / {report['rows']:,} rows "
+          f"in {report['total_sec']}s (split {report['split_sec']}s)")
+
+def run_bench(args):
+    profile = stage_profile(args.csv, not args.no_compact, export_dir=args.export_dir, track_memory=args.memory)
+    total = round(sum(entry["sec"] for entry in profile["stages"].values()), 4)
+    if args.json:
+        print(json.dumps({"source": args.csv, **profile, "total": total}))
+        return
+    for stage, entry in profile["stages"].items():
+        peak = f"  {entry['peak_mb']:9.1f} MB" if "peak_mb" in entry else ""
+        print(f"{stage:18s} {entry['sec']:8.3f}s{peak}")
+    print(f"{'total':18s} {total:8.3f}s  (rows {profile['rows']:,}, peak RSS {profile['peak_rss_mb']} MB)")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="aram-stats", description="ARAM 통계 엔진 (Streamlit 없이 실행)")
+    parser.add_argument("--offline", action="store_true", help="Data Dragon 네트워크 사용 안 함 (로컬 스냅샷만)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    def add_source(cmd):
+        cmd.add_argument("csv", nargs="?", help="입력 CSV (기본: 자동 검색)")
+        cmd.add_argument("--no-compact", action="store_true", help="Categorical 인코딩 없이 로드")
+    
+    build_cmd = sub.add_parser("build", help="로드 + 캐시 생성 + 챔피언 요약")
+    add_source(build_cmd)
+    build_cmd.add_argument("--summary", help="챔피언 요약 CSV 저장 경로")
+    build_cmd.add_argument("--streaming", action="store_true", help="청크 단위 집계만 수행")
+    build_cmd.add_argument("--append-to", help="CSV 를 델타로 보고 이 집계 저장소에 추가")
+    build_cmd.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    build_cmd.add_argument("--top", type=int, default=10, help="출력할 챔피언 수")
+    build_cmd.add_argument("--min-games", type=int, default=1, help="출력할 챔피언의 최소 게임 수")
+    build_cmd.add_argument("--rank-by", choices=list(RANK_KEYS), default="games",
+                           help="정렬 기준 (games / shrunk_rate: 챔피언 평균으로 축소한 승률 / ci_low: 95%% 하한)")
+    
+    export_cmd = sub.add_parser("export", help="전체 챔피언 아이템/스펠 파일 내보내기")
+    add_source(export_cmd)
+    export_cmd.add_argument("--out", default="exports", help="출력 디렉터리")
+    export_cmd.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    export_cmd.add_argument("--workers", type=int, default=None)
+    export_cmd.add_argument("--processes", action="store_true", help="스레드 대신 프로세스 풀 사용")
+    
+    bench_cmd = sub.add_parser("bench", help="단계별 소요 시간 측정")
+    add_source(bench_cmd)
+    bench_cmd.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    bench_cmd.add_argument("--memory", action="store_true", help="단계별 최대 추가 메모리도 측정 (tracemalloc)")
+    bench_cmd.add_argument("--export-dir", help="전체 챔피언 내보내기 단계도 측정 (이 폴더에 저장)")
+    
+    args = parser.parse_args(argv)
+    if args.offline:
+        os.environ["DDRAGON_OFFLINE"] = "1"
+    args.csv = args.csv or discover_csv()
+    if not args.csv:
+        parser.error("입력 CSV 를 지정하거나 프로젝트 폴더에 넣어주세요")
+    
+    {"build": run_build, "export": run_export, "bench": run_bench}[args.command](args)
+
+if __name__ == "__main__":
+    main()
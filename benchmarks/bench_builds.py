@@ -0,0 +1,42 @@
+# benchmarks/bench_builds.py
+# 빌드 색인 벤치마크 - 색인 생성 시간과 질의 지연 (top-N 빌드, 3코어, 세 번째 아이템)
+#
+# 사용법: python benchmarks/bench_builds.py [행 수]
+import os, sys, time, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from synthetic import CHAMP_POOL, make_synthetic_csv
+
+def timed_ms(fn, *args, repeat: int = 20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic_participants.csv")
+        make_synthetic_csv(csv_path, n_rows)
+        df = aram_stats.load_frame(csv_path)
+
+    start = time.perf_counter()
+    index = aram_stats.build_index_from_frame(df)
+    build_sec = time.perf_counter() - start
+
+    champion = CHAMP_POOL[0]
+    first, second = aram_stats.compute_item_stats(df[df["champion"] == champion])["item_id"].dropna()[:2]
+    _, builds_ms = timed_ms(index.top_builds, champion, 10)
+    _, cores_ms = timed_ms(index.top_cores, champion, 10)
+    third, third_ms = timed_ms(index.best_third_items, champion, first, second, 10)
+
+    print(f"rows: {len(df):,} / builds: {len(index.builds):,} / 3-item cores: {len(index.cores):,}")
+    print(f"index build       : {build_sec:8.3f}s")
+    print(f"top builds        : {builds_ms:8.2f}ms")
+    print(f"top 3-item cores  : {cores_ms:8.2f}ms")
+    print(f"best third item   : {third_ms:8.2f}ms ({len(third)} rows)")
+
+if __name__ == "__main__":
+    main()
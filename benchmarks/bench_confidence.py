@@ -0,0 +1,53 @@
+# benchmarks/bench_confidence.py
+# 신뢰도 컬럼 벤치마크 - 행마다 Python 으로 Wilson / 축소 승률 계산 vs 전체 챔피언 벡터 계산 1회
+#
+# 집계의 (챔피언 × 아이템) / (챔피언 × 스펠 조합) 모든 행에 ci_low / ci_high / shrunk_rate 를 붙이고,
+# 캐시된 표에서 모든 챔피언을 보정 승률로 순위 매기는 시간도 잰다.
+#
+# 사용법: python benchmarks/bench_confidence.py [행 수]
+import os, sys, math, time, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from synthetic import make_synthetic_csv
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def per_row(counts, baselines, z=1.96, prior=aram_stats.PRIOR_GAMES):
+    """기존 방식에 가까운 행 단위 계산 (비교용)"""
+    out = []
+    for (champion, _), row in counts.iterrows():
+        n, w = row["games"], row["wins"]
+        p = w / n
+        denom = 1 + z * z / n
+        center = (p + z * z / (2 * n)) / denom
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+        out.append((center - half, center + half, (w + prior * baselines[champion]) / (n + prior)))
+    return out
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic_participants.csv")
+        make_synthetic_csv(csv_path, n_rows)
+        aggregates = aram_stats.aggregate_csv(csv_path)
+
+    baselines = aram_stats.champion_baselines(aggregates["champions"])
+    counts = aggregates["items"]
+    _, loop_sec = timed(per_row, counts, baselines)
+    _, vec_sec = timed(aram_stats.with_confidence, aggregates)
+    champions = list(baselines.index)
+    _, rank_sec = timed(lambda: [aram_stats.rank_stats(aram_stats.aggregate_item_stats(aggregates, c), 30,
+                                                      "shrunk_rate") for c in champions])
+
+    print(f"rows: {n_rows:,} / champions: {len(champions)} / champion x item rows: {len(counts):,}")
+    print(f"per-row python (items only)  : {loop_sec * 1000:9.1f} ms")
+    print(f"vectorized items + spells    : {vec_sec * 1000:9.1f} ms")
+    print(f"rank every champion (cached) : {rank_sec * 1000:9.1f} ms ({rank_sec / len(champions) * 1000:.2f} ms each)")
+
+if __name__ == "__main__":
+    main()
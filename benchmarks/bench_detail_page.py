@@ -0,0 +1,40 @@
+# benchmarks/bench_detail_page.py
+# 상세 테이블 벤치마크 - 전체 프레임 + 매 실행 CSV 생성 vs 서버 측 페이지 (전송 바이트, 시간)
+#
+# 사용법: python benchmarks/bench_detail_page.py [행 수] [페이지 크기]
+import os, sys, time, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from synthetic import CHAMP_POOL, make_synthetic_csv
+
+COLUMNS = ["champion", "win_clean", "kills", "deaths", "assists", "dpm"]
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic_participants.csv")
+        make_synthetic_csv(csv_path, n_rows)
+        df = aram_stats.load_frame(csv_path)
+
+    champion_df = df[df["champion"] == CHAMP_POOL[0]]
+    # 기존: 선택 컬럼 전체를 표로 보내고, 다운로드용 CSV 를 매 실행마다 생성
+    full_mb = champion_df[COLUMNS].memory_usage(deep=True).sum() / 1e6
+    _, csv_sec = timed(champion_df.to_csv, index=False)
+    result, page_sec = timed(aram_stats.detail_page, champion_df, COLUMNS, sort_by="dpm", ascending=False,
+                             page=3, page_size=page_size, filters={"kills": (5, None)})
+    page_mb = result["rows"].memory_usage(deep=True).sum() / 1e6
+
+    print(f"rows: {len(df):,} / champion rows: {len(champion_df):,} / page: {page_size}")
+    print(f"full table + eager CSV : {csv_sec:8.3f}s  table {full_mb:9.2f} MB per rerun")
+    print(f"server-side page       : {page_sec:8.3f}s  table {page_mb:9.4f} MB per rerun")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/bench_export.py
+# 전체 챔피언 내보내기 벤치마크 - 챔피언별 iterrows 저장 vs 일괄 병렬 저장 (파일 내용 동일 확인)
+#
+# 사용법: python benchmarks/bench_export.py [행 수] [csv|parquet]
+import os, sys, time, filecmp, tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from synthetic import make_synthetic_csv
+
+def legacy_analyze_champion_data(df: pd.DataFrame, champion: str):
+    """챔피언별 데이터 분석 및 CSV 저장 (기존 app.py 의 analyze_champion_data 그대로, 비교용)"""
+    champion_df = df[df["champion"] == champion].copy()
+    
+    # 아이템 데이터 추출
+    item_cols = [col for col in champion_df.columns if col.startswith("item")]
+    items_data = []
+    
+    for idx, row in champion_df.iterrows():
+        for col in item_cols:
+            item_value = row[col]
+            if pd.notna(item_value) and str(item_value).strip() not in ["", "0", "nan", "None"]:
+                items_data.append({
+                    "matchId": row.get("matchId", idx),
+                    "win_clean": row.get("win_clean", 0),
+                    "item": str(item_value).strip(),
+                    "champion": champion
+                })
+    
+    # 스펠 데이터 추출
+    s1_col = "spell1_name" if "spell1_name" in champion_df.columns else "spell1"
+    s2_col = "spell2_name" if "spell2_name" in champion_df.columns else "spell2"
+    
+    spells_data = []
+    for idx, row in champion_df.iterrows():
+        spell1 = str(row.get(s1_col, "")).strip()
+        spell2 = str(row.get(s2_col, "")).strip()
+        
+        if spell1 and spell1 not in ["", "nan", "None"]:
+            spells_data.append({
+                "matchId": row.get("matchId", idx),
+                "win_clean": row.get("win_clean", 0),
+                "spell": spell1,
+                "spell_combo": f"{spell1} + {spell2}",
+                "champion": champion
+            })
+    
+    # CSV 저장
+    results = {}
+    if items_data:
+        items_df = pd.DataFrame(items_data)
+        items_filename = f"{champion}_items_analysis.csv"
+        items_df.to_csv(items_filename, index=False, encoding='utf-8')
+        results["items"] = items_filename
+    
+    if spells_data:
+        spells_df = pd.DataFrame(spells_data)
+        spells_filename = f"{champion}_spells_analysis.csv"
+        spells_df.to_csv(spells_filename, index=False, encoding='utf-8')
+        results["spells"] = spells_filename
+    
+    return results
+
+def legacy_export(df: pd.DataFrame, out_dir: str):
+    """기존 방식: 챔피언마다 legacy_analyze_champion_data 호출 (작업 폴더에 저장하므로 out_dir 로 이동)
+    
+    기존 로더에는 없던 파생 item*_id 컬럼은 빼고 넘긴다 (기존 코드는 item* 컬럼을 모두 아이템으로 봄).
+    """
+    legacy_df = df.drop(columns=[col for col in df.columns if col.startswith("item") and col.endswith("_id")])
+    cwd = os.getcwd()
+    os.chdir(out_dir)
+    try:
+        for champion in legacy_df["champion"].dropna().unique():
+            legacy_analyze_champion_data(legacy_df, champion)
+    finally:
+        os.chdir(cwd)
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    fmt = sys.argv[2] if len(sys.argv) > 2 else "csv"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic_participants.csv")
+        make_synthetic_csv(csv_path, n_rows)
+        df = aram_stats.load_frame(csv_path)
+
+        legacy_dir, batch_dir = os.path.join(tmp, "legacy"), os.path.join(tmp, "batch")
+        os.makedirs(legacy_dir)
+        start = time.perf_counter()
+        legacy_export(df, legacy_dir)
+        legacy_sec = time.perf_counter() - start
+
+        report = aram_stats.export_all_champions(
+            df, batch_dir, fmt,
+            progress=lambda done, total, path: print(f"\r  {done}/{total}", end="", flush=True),
+        )
+        print()
+
+        legacy_files = sorted(os.listdir(legacy_dir))
+        if fmt == "csv":
+            assert legacy_files == sorted(os.listdir(batch_dir))
+            _, mismatch, errors = filecmp.cmpfiles(legacy_dir, batch_dir, legacy_files, shallow=False)
+            assert not mismatch and not errors, mismatch + errors
+        else:
+            for name in legacy_files:
+                legacy = pd.read_csv(os.path.join(legacy_dir, name))
+                batch = pd.read_parquet(os.path.join(batch_dir, name.replace(".csv", ".parquet")))
+                pd.testing.assert_frame_equal(legacy, batch.astype(object).astype(legacy.dtypes.to_dict()),
+                                              check_dtype=False)
+
+    print(f"rows: {len(df):,} / champions: {report['champions']} / files: {len(report['files'])} ({fmt})")
+    print(f"per-champion iterrows : {legacy_sec:8.3f}s")
+    print(f"batch export          : {report['total_sec']:8.3f}s (split {report['split_sec']}s)")
+    print(f"speedup               : {legacy_sec / report['total_sec']:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# benchmarks/bench_histograms.py
+# 분포 차트 벤치마크 - 원본 값 px.histogram vs 고정 구간 개수 막대 (차트 JSON 크기, 시간)
+#
+# 챔피언 한 명의 게임 수를 늘려가며 차트 페이로드와 생성 시간을 비교한다.
+# 구간 개수 표는 전체 챔피언을 한 번에 세는 비용(데이터셋마다 1회)도 함께 잰다.
+#
+# 사용법: python benchmarks/bench_histograms.py [게임 수 ...]
+import os, sys, time
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def raw_chart(df):
+    return px.histogram(df.dropna(subset=["dpm"]), x="dpm", nbins=20).to_json()
+
+def binned_chart(counts):
+    edges = aram_stats.HISTOGRAM_EDGES["dpm"]
+    fig = px.bar(x=(edges[:-1] + edges[1:]) / 2, y=counts.to_numpy())
+    fig.update_traces(width=np.diff(edges))
+    return fig.to_json()
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 100_000, 1_000_000]
+    rng = np.random.default_rng(0)
+    for n_games in sizes:
+        df = pd.DataFrame({
+            "champion": pd.Categorical(rng.choice(["Ziggs", "Sona", "Lux", "Jinx"], n_games)),
+            "dpm": rng.gamma(4, 600, n_games),
+        })
+        champion_df = df[df["champion"] == "Ziggs"]
+        raw_json, raw_sec = timed(raw_chart, champion_df)
+        table, bin_sec = timed(aram_stats.champion_histograms, df, "dpm")
+        binned_json, chart_sec = timed(binned_chart, table.loc["Ziggs"])
+        print(f"{n_games:>9,} rows ({len(champion_df):>7,} champion) : raw {len(raw_json) / 1e3:9.1f} KB "
+              f"{raw_sec * 1000:8.1f} ms | bins {len(binned_json) / 1e3:6.1f} KB {chart_sec * 1000:6.1f} ms "
+              f"(+ all champions binned once {bin_sec * 1000:6.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_icon_resolve.py
+# 아이콘 URL 해석 벤치마크 - 호출마다 정규식/fuzzy vs IconResolver (10k 이름당 비용)
+#
+# 사용법: python benchmarks/bench_icon_resolve.py [이름 수]
+import os, re, sys, time
+from difflib import get_close_matches
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from icons import IconResolver
+
+DD_MAPS = aram_stats.dd_maps_for_version(aram_stats.default_version())
+
+def legacy_item_icon_url(item) -> str:
+    """기존 get_item_icon_url 구현 (비교용)"""
+    base = f"https://ddragon.leagueoflegends.com/cdn/{DD_MAPS['version']}/img/item"
+    if not item or pd.isna(item) or str(item).strip() in ["", "0", "nan", "None"]:
+        return f"{base}/1001.png"
+    item_str = str(item).strip()
+    if item_str in aram_stats.EXTENDED_ITEM_MAPPING:
+        return f"{base}/{aram_stats.EXTENDED_ITEM_MAPPING[item_str]}.png"
+    if item_str in DD_MAPS.get("item_exact", {}):
+        return f"{base}/{DD_MAPS['item_exact'][item_str]}.png"
+    normalized = re.sub(r"[^\w\s]", "", item_str).replace(" ", "").lower()
+    if normalized in DD_MAPS.get("item_normalized", {}):
+        return f"{base}/{DD_MAPS['item_normalized'][normalized]}.png"
+    close_matches = get_close_matches(item_str, aram_stats.EXTENDED_ITEM_MAPPING.keys(), n=1, cutoff=0.7)
+    if close_matches:
+        return f"{base}/{aram_stats.EXTENDED_ITEM_MAPPING[close_matches[0]]}.png"
+    return f"{base}/1001.png"
+
+def make_names(n: int, seed: int = 7) -> pd.Series:
+    """정확한 이름 / 오타 / 소문자 / 빈 값 / 미지의 이름이 섞인 아이템 이름"""
+    rng = np.random.default_rng(seed)
+    known = list(aram_stats.EXTENDED_ITEM_MAPPING)
+    variants = known + [k.lower() for k in known] + [k[:-1] for k in known] + ["", "0", "Unknown Relic"]
+    return pd.Series(rng.choice(variants, n), dtype=object)
+
+def per_10k(seconds: float, n: int) -> float:
+    return seconds / n * 10_000
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    names = make_names(n)
+
+    start = time.perf_counter()
+    legacy = [legacy_item_icon_url(v) for v in names]
+    legacy_sec = time.perf_counter() - start
+
+    resolver = IconResolver(DD_MAPS, aram_stats.EXTENDED_ITEM_MAPPING, aram_stats.EXTENDED_SPELL_MAPPING)
+    start = time.perf_counter()
+    per_call = [resolver.item_url(v) for v in names]
+    per_call_sec = time.perf_counter() - start
+
+    resolver = IconResolver(DD_MAPS, aram_stats.EXTENDED_ITEM_MAPPING, aram_stats.EXTENDED_SPELL_MAPPING)
+    start = time.perf_counter()
+    bulk = resolver.item_urls(names)
+    bulk_sec = time.perf_counter() - start
+
+    agree = np.mean([a == b for a, b in zip(legacy, bulk)]) * 100
+    print(f"names: {n:,} ({names.nunique()} distinct), agreement with legacy: {agree:.1f}%")
+    print(f"legacy per call   : {per_10k(legacy_sec, n) * 1000:9.1f} ms / 10k")
+    print(f"resolver per call : {per_10k(per_call_sec, n) * 1000:9.1f} ms / 10k")
+    print(f"resolver bulk     : {per_10k(bulk_sec, n) * 1000:9.1f} ms / 10k")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# benchmarks/bench_icon_sprites.py
+# 아이콘 스프라이트 벤치마크 - 행마다 CDN 이미지 요청 vs 목록당 스프라이트 한 장 (요청 수, 크기, 시간)
+#
+# 아이콘 저장소(ddragon_snapshot/<버전>/img)가 비어 있으면 회색 칸으로 만든다.
+# 먼저 python ddragon.py icons 로 채우면 실제 아이콘으로 측정된다.
+#
+# 사용법: python benchmarks/bench_icon_sprites.py [아이템 수] [스펠 조합 수]
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from icons import _sprite_png, missing_tiles, sprite_sheet
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    n_spells = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    resolver = aram_stats.default_resolver()
+    item_tiles = [resolver.item_tile(i) for i in sorted(set(aram_stats.EXTENDED_ITEM_MAPPING.values()))][:n_items]
+    spell_ids = sorted(set(aram_stats.EXTENDED_SPELL_MAPPING.values()))
+    spell_tiles = [resolver.spell_tile(spell_ids[(i + j) % len(spell_ids)]) for i in range(n_spells) for j in range(2)]
+    tiles = item_tiles + spell_tiles
+
+    _sprite_png.cache_clear()
+    (items_png, spells_png), cold_sec = timed(lambda: (sprite_sheet(resolver.version, item_tiles, 36),
+                                                       sprite_sheet(resolver.version, spell_tiles, 32)))
+    _, warm_sec = timed(lambda: (sprite_sheet(resolver.version, item_tiles, 36),
+                                 sprite_sheet(resolver.version, spell_tiles, 32)))
+    unique = list(dict.fromkeys(tiles))
+    stored = len(unique) - len(missing_tiles(resolver.version, unique))
+
+    print(f"Data Dragon v{resolver.version} / icons in local store: {stored}/{len(unique)}")
+    print(f"per-row st.image : {len(tiles):4d} CDN requests per rerun")
+    print(f"sprites          : {0:4d} CDN requests, {len(items_png) + len(spells_png):,} B inline")
+    print(f"sprite build     : {cold_sec * 1000:8.2f} ms cold / {warm_sec * 1000:6.3f} ms cached")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# benchmarks/bench_import.py
+# import 시간 벤치마크 - 새 프로세스에서 aram_stats / app 을 import 하는 데 걸리는 시간
+#
+# 사용법: python benchmarks/bench_import.py [반복 수]
+import os, sys, json, subprocess, statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in ("streamlit", "plotly", "requests") if m in sys.modules]
+print(json.dumps({{"sec": elapsed, "loaded": heavy}}))
+"""
+
+def import_once(module: str) -> dict:
+    env = dict(os.environ, DDRAGON_OFFLINE="1")
+    out = subprocess.run([sys.executable, "-c", PROBE.format(module=module)], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for module in ["aram_stats", "app"]:
+        runs = [import_once(module) for _ in range(repeats)]
+        median = statistics.median(r["sec"] for r in runs)
+        loaded = ", ".join(runs[-1]["loaded"]) or "-"
+        print(f"import {module:10s}: {median * 1000:8.1f} ms (median of {repeats}) / loaded: {loaded}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# benchmarks/bench_item_stats.py
+# 아이템 승률 엔진 벤치마크 - iterrows 루프 vs 벡터화 엔진
+#
+# 사용법: python benchmarks/bench_item_stats.py [행 수]
+import os, sys, time, tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from synthetic import CHAMP_POOL, make_synthetic_csv
+
+def legacy_item_stats(champion_df: pd.DataFrame) -> pd.DataFrame:
+    """기존 tab2 iterrows 구현 (비교용)"""
+    item_cols = aram_stats.get_item_columns(champion_df)
+    all_items = []
+    for _, row in champion_df.iterrows():
+        match_id = row.get("matchId", row.name)
+        win = row.get("win_clean", 0)
+        for col in item_cols:
+            item_name = row[col]
+            if pd.notna(item_name) and str(item_name).strip() not in ["", "0", "nan", "None"]:
+                all_items.append({"matchId": match_id, "win_clean": win, "item": str(item_name).strip()})
+    items_df = pd.DataFrame(all_items)
+    return (items_df.groupby("item")
+            .agg(games=("matchId", "count"), wins=("win_clean", "sum"))
+            .assign(win_rate=lambda x: (x.wins / x.games * 100).round(2))
+            .sort_values(["games", "win_rate"], ascending=[False, False]))
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic_participants.csv")
+        make_synthetic_csv(csv_path, n_rows)
+        df = aram_stats.load_frame(csv_path)
+
+    champion_df = df[df["champion"] == CHAMP_POOL[0]]
+    print(f"rows: {len(df):,} / champion rows: {len(champion_df):,}")
+
+    legacy, legacy_sec = timed(legacy_item_stats, champion_df)
+    vectorized, vec_sec = timed(aram_stats.compute_item_stats, champion_df)
+
+    pd.testing.assert_frame_equal(
+        legacy.sort_index(),
+        vectorized.drop(columns=["item_id", *aram_stats.CONFIDENCE_COLUMNS]).set_axis(vectorized.index.astype(str)).sort_index(),
+        check_dtype=False, check_index_type=False,
+    )
+
+    print(f"iterrows   : {legacy_sec:8.3f}s")
+    print(f"vectorized : {vec_sec:8.3f}s")
+    print(f"speedup    : {legacy_sec / vec_sec:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# benchmarks/bench_list_parse.py
+# 리스트 컬럼 파서 벤치마크 - 셀 단위 ast.literal_eval vs 일괄 문자열 파싱
+#
+# 사용법: python benchmarks/bench_list_parse.py [행 수]
+import os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from synthetic import make_synthetic_frame
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = make_synthetic_frame(n_rows)
+
+    # 일부 셀은 다른 표기로 섞어서 fallback 경로도 측정
+    df.loc[::50, "team_champs"] = "Lux|Ezreal|Sona"
+
+    per_cell, per_cell_sec = timed(lambda s: s.apply(aram_stats.parse_list_column), df["team_champs"])
+    bulk, bulk_sec = timed(aram_stats.parse_list_column_bulk, df["team_champs"])
+
+    expected = [[str(v) for v in cell] for cell in per_cell]
+    actual = [[v for v in row if isinstance(v, str)] for row in bulk.astype(object).to_numpy()]
+    assert expected == actual, "bulk parser output differs from parse_list_column"
+
+    list_bytes = per_cell.map(lambda cell: sys.getsizeof(cell) + sum(sys.getsizeof(v) for v in cell)).sum()
+    encoded = aram_stats.encode_list_columns(df[["champion", "team_champs"]].copy())
+    codes = aram_stats.champion_slot_codes(encoded, "team_champs")
+
+    print(f"rows: {n_rows:,}")
+    print(f"literal_eval per cell : {per_cell_sec:8.3f}s")
+    print(f"bulk string parse     : {bulk_sec:8.3f}s")
+    print(f"speedup               : {per_cell_sec / bulk_sec:8.1f}x")
+    print(f"python lists          : {list_bytes / 1e6:8.1f} MB")
+    print(f"int16 slot codes      : {codes.nbytes / 1e6:8.1f} MB ({codes.dtype}, shape {codes.shape})")
+
+if __name__ == "__main__":
+    main()
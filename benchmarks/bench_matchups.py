@@ -0,0 +1,51 @@
+# benchmarks/bench_matchups.py
+# 시너지/상성 행렬 벤치마크 - 행 단위 이중 루프 vs bincount 한 번
+#
+# 사용법: python benchmarks/bench_matchups.py [행 수]
+import os, sys, time, tempfile
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from synthetic import make_synthetic_csv
+
+def legacy_enemy_counts(df):
+    """리스트를 행마다 순회하는 방식 (비교용, 상대 팀만)"""
+    games, wins = Counter(), Counter()
+    enemies = aram_stats.champion_lists(df, "enemy_champs")
+    for champion, enemy_list, win in zip(df["champion"], enemies, df["win_clean"]):
+        for other in enemy_list:
+            games[champion, other] += 1
+            wins[champion, other] += win
+    return games, wins
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic_participants.csv")
+        make_synthetic_csv(csv_path, n_rows)
+        df = aram_stats.load_frame(csv_path)
+
+    (games, wins), legacy_sec = timed(legacy_enemy_counts, df)
+    matrices, vec_sec = timed(aram_stats.matchup_matrices, df)
+
+    champions = list(matrices["champions"])
+    for (champion, other), count in games.items():
+        i, j = champions.index(champion), champions.index(other)
+        assert matrices["enemy_games"][i, j] == count
+        assert matrices["enemy_wins"][i, j] == wins[champion, other]
+
+    size_kb = sum(m.nbytes for k, m in matrices.items() if k != "champions") / 1e3
+    print(f"rows: {len(df):,} / champions: {len(champions)} / matrices: {size_kb:,.1f} KB")
+    print(f"python loop (enemy only) : {legacy_sec:8.3f}s")
+    print(f"bincount (ally + enemy)  : {vec_sec:8.3f}s")
+    print(f"speedup                  : {legacy_sec / vec_sec:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# benchmarks/bench_memory.py
+# 메모리 사용량 비교 - object 문자열 컬럼 vs Categorical 인코딩
+#
+# 사용법: python benchmarks/bench_memory.py [행 수]
+import os, sys, time, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from synthetic import CHAMP_POOL, make_synthetic_csv
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic_participants.csv")
+        make_synthetic_csv(csv_path, n_rows)
+        plain = aram_stats.load_frame(csv_path, compact=False)
+        compact = aram_stats.load_frame(csv_path, compact=True)
+
+    report = aram_stats.memory_report(plain, compact)
+    changed = report[report["ratio"] != 1.0]
+    print(f"rows: {n_rows:,}")
+    print(changed.to_string())
+
+    for label, df in [("object", plain), ("categorical", compact)]:
+        champion_df = df[df["champion"] == CHAMP_POOL[0]]
+        start = time.perf_counter()
+        aram_stats.compute_item_stats(champion_df)
+        champion_df.groupby("spell_combo", observed=True)["win_clean"].agg(["count", "sum"])
+        print(f"item + spell stats ({label:11s}): {time.perf_counter() - start:.3f}s")
+
+if __name__ == "__main__":
+    main()
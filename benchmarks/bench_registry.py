@@ -0,0 +1,61 @@
+# benchmarks/bench_registry.py
+# 세션 공유 데이터셋 벤치마크 - 세션마다 pickle 사본(st.cache_data 방식) vs 레지스트리 공유 뷰
+#
+# 같은 파일을 연 세션 수만큼 프레임을 들고 있을 때의 추가 메모리와 조회 시간을 잰다.
+#
+# 사용법: python benchmarks/bench_registry.py [행 수] [세션 수]
+import os, sys, time, pickle, tempfile, tracemalloc
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from registry import DatasetRegistry, content_hash, dataset_key
+from synthetic import make_synthetic_csv
+
+def traced_sessions(open_session, n_sessions):
+    """세션 n 개가 프레임을 동시에 들고 있을 때의 (결과, 시간, 최대 추가 메모리 MB)
+
+    Arrow 메모리 풀 할당은 tracemalloc 에 잡히지 않으므로 풀 증가량을 더한다.
+    """
+    arrow_before = pa.total_allocated_bytes()
+    tracemalloc.start()
+    start = time.perf_counter()
+    frames = [open_session() for _ in range(n_sessions)]
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return frames, elapsed, (peak + pa.total_allocated_bytes() - arrow_before) / 1e6
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    n_sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic_participants.csv")
+        make_synthetic_csv(csv_path, n_rows)
+        df = aram_stats.load_frame(csv_path)
+        frame_mb = df.memory_usage(deep=True).sum() / 1e6
+
+        # st.cache_data: 적중할 때마다 pickle 을 풀어 세션별 사본을 만듦
+        payload = pickle.dumps(df)
+        copies, copy_sec, copy_mb = traced_sessions(lambda: pickle.loads(payload), n_sessions)
+        del copies
+
+        registry = DatasetRegistry(os.path.join(tmp, "registry"), budget_bytes=4e9)
+        key = dataset_key(content_hash(csv_path), compact=True)
+        registry.get(key, lambda: df)
+        views, view_sec, view_mb = traced_sessions(lambda: registry.get(key, lambda: df), n_sessions)
+        pd.testing.assert_frame_equal(views[0], df)
+
+        # 메모리에서 축출된 뒤 디스크(메모리 맵)에서 다시 올리는 비용
+        cold = DatasetRegistry(registry.root, budget_bytes=4e9)
+        _, disk_sec, disk_mb = traced_sessions(lambda: cold.get(key, lambda: df), 1)
+
+    print(f"rows: {n_rows:,} / sessions: {n_sessions} / frame: {frame_mb:,.1f} MB")
+    print(f"pickle copy per session : {copy_sec:8.3f}s  +{copy_mb:9.1f} MB")
+    print(f"shared registry view    : {view_sec:8.3f}s  +{view_mb:9.1f} MB")
+    print(f"reload from mmap arrow  : {disk_sec:8.3f}s  +{disk_mb:9.1f} MB")
+
+if __name__ == "__main__":
+    main()
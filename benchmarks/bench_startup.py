@@ -0,0 +1,40 @@
+# benchmarks/bench_startup.py
+# 대시보드 시작 시간 벤치마크 - app 모듈 실행(첫 화면 전까지) vs Data Dragon 준비 완료
+#
+# 새 프로세스에서 app 을 import 해 모듈 최상단 실행이 끝나는 시점과
+# 백그라운드 Data Dragon 해석기가 준비되는 시점을 따로 잰다.
+# (plotly 본체는 streamlit 이 import 하므로 plotly.express 로드 여부만 본다)
+# DDRAGON_BASE_URL / DDRAGON_SNAPSHOT_DIR / DDRAGON_OFFLINE 환경 변수는 그대로 전달된다.
+#
+# 사용법: python benchmarks/bench_startup.py [반복 수]
+import os, sys, json, subprocess, statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+boot = time.perf_counter() - start
+heavy = [m for m in ("plotly.express", "requests") if m in sys.modules]
+app.icon_resolver()
+ready = time.perf_counter() - start
+print(json.dumps({"boot": boot, "ready": ready, "loaded": heavy}))
+"""
+
+def run_once() -> dict:
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True,
+                         check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    runs = [run_once() for _ in range(repeats)]
+    boot = statistics.median(r["boot"] for r in runs)
+    ready = statistics.median(r["ready"] for r in runs)
+    print(f"module boot (first paint) : {boot * 1000:8.1f} ms (median of {repeats})")
+    print(f"Data Dragon ready         : {ready * 1000:8.1f} ms")
+    print(f"loaded at boot            : {', '.join(runs[-1]['loaded']) or '-'}")
+
+if __name__ == "__main__":
+    main()
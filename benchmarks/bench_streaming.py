@@ -0,0 +1,55 @@
+# benchmarks/bench_streaming.py
+# 스트리밍 집계 벤치마크 - 전체 로드 vs 청크 집계 (최대 메모리, 시간, 결과 일치)
+#
+# 사용법: python benchmarks/bench_streaming.py [행 수] [청크 행 수]
+import os, sys, time, pickle, tempfile, tracemalloc
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from synthetic import CHAMP_POOL, make_synthetic_csv
+
+def traced(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+def full_load(csv_path):
+    df = aram_stats.add_canonical_ids(aram_stats.preprocess_dataframe(pd.read_csv(csv_path)), aram_stats.default_resolver())
+    return df, aram_stats.build_champion_summary(df)
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    chunk_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic_participants.csv")
+        make_synthetic_csv(csv_path, n_rows)
+        (df, summary), full_sec, full_mb = traced(full_load, csv_path)
+        aggregates, stream_sec, stream_mb = traced(aram_stats.aggregate_csv, csv_path, chunk_rows)
+
+    streamed = aram_stats.aggregate_summary(aggregates)
+    pd.testing.assert_frame_equal(summary.sort_index(), streamed.sort_index()[summary.columns],
+                                  check_dtype=False)
+    champion_df = df[df["champion"] == CHAMP_POOL[0]]
+    pd.testing.assert_frame_equal(aram_stats.compute_item_stats(champion_df).sort_index(),
+                                  aram_stats.aggregate_item_stats(aggregates, CHAMP_POOL[0]).sort_index(),
+                                  check_dtype=False)
+
+    print(f"rows: {n_rows:,} / chunk: {chunk_rows:,}")
+    print(f"full load  : {full_sec:8.3f}s  peak {full_mb:9.1f} MB")
+    print(f"streaming  : {stream_sec:8.3f}s  peak {stream_mb:9.1f} MB")
+    print(f"peak ratio : {full_mb / stream_mb:8.1f}x")
+
+    # 고유 매치 추적: 매치 해시 배열 vs matchId Python 집합 (pickle 크기 = 캐시 적중마다 푸는 양)
+    match_set = set(df["matchId"].dropna().astype(str))
+    print(f"distinct matches : {aram_stats.aggregate_total_games(aggregates):,} "
+          f"(hash array {len(pickle.dumps(aggregates['match_hashes'])) / 1e6:6.2f} MB pickled, "
+          f"python set {len(pickle.dumps(match_set)) / 1e6:6.2f} MB)")
+
+if __name__ == "__main__":
+    main()
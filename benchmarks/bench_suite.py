@@ -0,0 +1,121 @@
+# benchmarks/bench_suite.py
+# 크기별 전체 파이프라인 벤치마크 - 가상 데이터셋 10k / 100k / 1M / 5M 행의 단계별 시간과 최대 메모리
+#
+# 크기마다 새 프로세스에서 aram_stats bench 를 두 번 실행한다.
+#   1) 시간 측정 (tracemalloc 없이) + 프로세스 최대 RSS
+#   2) --memory: 단계별 최대 추가 메모리 (tracemalloc 이 시간을 왜곡하므로 따로 실행)
+# 단계: read_csv, clean, list_parse, encode, canonical_ids, champion_summary, item_stats,
+#       spell_stats, matchups, build_index, histograms, export
+# 가상 CSV 는 --data-dir 에 한 번 만들어 두고 다시 쓴다 (생성 시간은 측정에서 제외).
+# 결과 JSON 에 버전 정보(git 커밋, pandas / numpy 버전)를 함께 남겨 --compare 로 이전 결과와 비교한다.
+#
+# 사용법: python benchmarks/bench_suite.py [크기 ...] [--json out.json] [--compare old.json]
+#                                          [--data-dir DIR] [--no-memory] [--no-export] [--offline]
+import os, sys, json, time, platform, argparse, subprocess, tempfile
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from synthetic import make_synthetic_csv, parse_size
+
+DEFAULT_SIZES = ["10k", "100k", "1m"]
+SLOWER_RATIO = 1.2  # 이전 결과보다 20% 이상 느리면 표시
+
+def dataset_path(data_dir: str, size: str, seed: int) -> str:
+    """크기 / 시드별 가상 CSV (없으면 생성)"""
+    path = os.path.join(data_dir, f"synthetic_{size.lower()}_s{seed}.csv")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        start = time.perf_counter()
+        make_synthetic_csv(f"{path}.tmp", parse_size(size), seed)
+        os.replace(f"{path}.tmp", path)
+        print(f"  generated {path} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return path
+
+def run_bench(csv_path: str, offline: bool, memory: bool, export: bool) -> dict:
+    """새 프로세스에서 aram_stats bench --json 실행 결과"""
+    with tempfile.TemporaryDirectory() as export_dir:
+        cmd = [sys.executable, os.path.join(ROOT, "aram_stats.py")] + (["--offline"] if offline else [])
+        cmd += ["bench", csv_path, "--json"] + (["--memory"] if memory else [])
+        cmd += ["--export-dir", export_dir] if export else []
+        out = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+def profile_size(size: str, args) -> dict:
+    csv_path = dataset_path(args.data_dir, size, args.seed)
+    timing = run_bench(csv_path, args.offline, memory=False, export=not args.no_export)
+    stages = {stage: dict(entry) for stage, entry in timing["stages"].items()}
+    if not args.no_memory:
+        memory = run_bench(csv_path, args.offline, memory=True, export=not args.no_export)
+        for stage, entry in memory["stages"].items():
+            stages.setdefault(stage, {})["peak_mb"] = entry["peak_mb"]
+    return {
+        "rows": timing["rows"],
+        "file_mb": round(os.path.getsize(csv_path) / 1e6, 1),
+        "total_sec": timing["total"],
+        "peak_rss_mb": timing["peak_rss_mb"],
+        "stages": stages,
+    }
+
+def print_report(results: dict, previous: dict = None):
+    previous = (previous or {}).get("sizes", {})
+    for size, result in results["sizes"].items():
+        print(f"\n== {size}: {result['rows']:,} rows / {result['file_mb']:,} MB CSV / "
+              f"total {result['total_sec']:.2f}s / peak RSS {result['peak_rss_mb']} MB")
+        old_stages = previous.get(size, {}).get("stages", {})
+        for stage, entry in result["stages"].items():
+            line = f"   {stage:18s} {entry['sec']:9.3f}s"
+            if "peak_mb" in entry:
+                line += f"  {entry['peak_mb']:9.1f} MB"
+            old = old_stages.get(stage)
+            if old and old["sec"] > 0:
+                ratio = entry["sec"] / old["sec"]
+                line += f"  x{ratio:5.2f} vs {old['sec']:.3f}s" + ("  << slower" if ratio >= SLOWER_RATIO else "")
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 데이터셋 크기별 단계 벤치마크")
+    parser.add_argument("sizes", nargs="*", default=DEFAULT_SIZES, help="10k / 100k / 1m / 5m 또는 행 수")
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--data-dir", default=os.environ.get("ARAM_BENCH_DATA", os.path.join(ROOT, "bench_data")))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="단계별 메모리 측정 생략")
+    parser.add_argument("--no-export", action="store_true", help="내보내기 단계 생략")
+    parser.add_argument("--offline", action="store_true", help="Data Dragon 네트워크 사용 안 함")
+    args = parser.parse_args()
+
+    results = {"environment": environment(), "seed": args.seed, "sizes": {}}
+    for size in args.sizes:
+        print(f"[{size}] profiling...", file=sys.stderr)
+        results["sizes"][size] = profile_size(size, args)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+    print_report(results, previous)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nresults -> {args.json}")
+
+if __name__ == "__main__":
+    main()
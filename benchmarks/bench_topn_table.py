@@ -0,0 +1,51 @@
+# benchmarks/bench_topn_table.py
+# Top-N 아이템 / 스펠 표 벤치마크 - 행마다 컨테이너 + 컬럼 vs 목록당 HTML 표 하나 (요소 수, 크기, 시간)
+#
+# 행 단위 레이아웃은 행마다 컨테이너, 컬럼 4개, 아이콘, 이름/게임 수/승률, 구분선
+# (아이템 기준 10개) 요소를 보냈다. 표 방식은 N 과 관계없이 목록당 markdown 요소 1개.
+#
+# 사용법: python benchmarks/bench_topn_table.py [행 수]
+import os, sys, time, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+from app import icon_cells, spell_pair_keys, stats_table_html
+from synthetic import CHAMP_POOL, make_synthetic_csv
+
+ROW_ELEMENTS = 10  # 대략: container + 컬럼 4 + 아이콘 + write 3 + divider
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def render(stats, kind: str, size: int) -> str:
+    if kind == "spell":
+        s1, s2 = spell_pair_keys(stats)
+        style, icons = icon_cells("spells", "spell", [k for pair in zip(s1, s2) for k in pair], size)
+        icons = [" ".join(icons[i:i + 2]) for i in range(0, len(icons), 2)]
+    else:
+        style, icons = icon_cells("items", "item", stats.index.tolist(), size)
+    return style + stats_table_html(icons, stats.index, stats["games"], stats["win_rate"])
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic_participants.csv")
+        make_synthetic_csv(csv_path, n_rows)
+        df = aram_stats.load_frame(csv_path)
+
+    champion_df = df[df["champion"] == CHAMP_POOL[0]]
+    lists = {"item": aram_stats.compute_item_stats(champion_df), "spell": aram_stats.compute_spell_stats(champion_df)}
+    print(f"rows: {len(df):,} / champion rows: {len(champion_df):,}")
+    for kind, stats in lists.items():
+        for top_n in (15, 100):
+            top = stats.head(top_n)
+            render(top, kind, 36)  # 스프라이트 캐시 워밍
+            html_str, sec = timed(render, top, kind, 36)
+            print(f"{kind:5s} top {top_n:3d} ({len(top):3d} rows) : per-row {len(top) * ROW_ELEMENTS:5d} elements"
+                  f" / table 1 element, {len(html_str):9,} B, {sec * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# benchmarks/synthetic.py
+# 벤치마크용 가상 ARAM participants CSV 생성기
+#
+# 10명 단위 매치(5 대 5, 매치 안에서 챔피언 중복 없음)로 만들며 load_dataframe 이 쓰는 컬럼을 모두 채운다:
+#   matchId, champion, win, spell1/2, item0-6, team_champs/enemy_champs (파이썬 리스트 표기),
+#   kills/deaths/assists, damage_total, game_end_min, first_core_item_min
+# 챔피언마다 픽 빈도 / 승률 / DPM / 선호 아이템이 달라 통계 결과가 실제 데이터처럼 퍼진다.
+# 큰 파일은 chunk_rows 행씩 만들어 이어 쓰므로 5M 행도 메모리에 한꺼번에 올리지 않는다.
+#
+# 사용법: python benchmarks/synthetic.py 크기 [출력.csv] [--seed N]
+#         크기: 10k / 100k / 1m / 5m 또는 행 수
+import os, sys, argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aram_stats
+
+ITEM_POOL = list(aram_stats.EXTENDED_ITEM_MAPPING.keys())
+SPELL_POOL = ["Flash", "Mark", "Ghost", "Heal", "Exhaust", "Ignite", "Cleanse", "Barrier", "Clarity"]
+SPELL_WEIGHTS = [0.30, 0.22, 0.10, 0.09, 0.08, 0.08, 0.05, 0.05, 0.03]
+CHAMP_POOL = ["Ezreal", "Lux", "Jinx", "Sona", "Garen", "Malphite", "Kai'Sa", "Veigar",
+              "Ahri", "Brand", "Darius", "Nami", "Seraphine", "Teemo", "Xerath", "Ziggs",
+              "Ashe", "Caitlyn", "Jhin", "Miss Fortune", "Varus", "Vayne", "Sivir", "Lucian",
+              "Annie", "Morgana", "Syndra", "Vel'Koz", "Karthus", "Swain", "Zyra", "Lulu",
+              "Janna", "Soraka", "Yuumi", "Leona", "Braum", "Sion", "Nautilus", "Cho'Gath",
+              "Dr. Mundo", "Sett", "Yasuo", "Yone", "Katarina", "Fizz", "Master Yi", "Lee Sin"]
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "5m": 5_000_000}
+CHUNK_ROWS = 500_000
+TEAM_SIZE = 5
+
+def parse_size(text: str) -> int:
+    """"1m" 같은 크기 이름 또는 행 수"""
+    return SIZES.get(text.lower()) or int(text.replace("_", ""))
+
+def champion_traits(seed: int) -> dict:
+    """챔피언별 고정 특성 (픽 가중치, 승률 보정, DPM 규모, 선호 아이템) - 청크가 달라도 같음"""
+    rng = np.random.default_rng([seed, 0])
+    n = len(CHAMP_POOL)
+    full_items = ITEM_POOL[8:-10]  # 신발 / 소모품 / 기본 재료 제외
+    return {
+        "pick_weight": 1 / np.arange(1, n + 1) ** 0.6,  # 앞쪽 챔피언일수록 자주 등장
+        "strength": rng.normal(0, 0.15, n),
+        "dpm_scale": rng.uniform(350, 800, n),
+        "core_items": np.array(full_items, dtype=object)[
+            np.argsort(rng.random((n, len(full_items))), axis=1)[:, :6]],
+        "boots": rng.integers(0, 8, n),
+        "core_min": rng.uniform(10, 15, n),
+    }
+
+def list_literal(codes: np.ndarray) -> np.ndarray:
+    """(행 × 5) 챔피언 코드 → "['Lux', \"Kai'Sa\", ...]" 문자열 (str(list) 와 같은 표기)"""
+    quoted = np.array([repr(name) for name in CHAMP_POOL], dtype=object)
+    text = pd.Series(quoted[codes[:, 0]])
+    for i in range(1, codes.shape[1]):
+        text = text + ", " + quoted[codes[:, i]]
+    return ("[" + text + "]").to_numpy(dtype=object)
+
+def make_synthetic_frame(n_rows: int, seed: int = 42, first_match: int = 0) -> pd.DataFrame:
+    """10명 단위 매치로 구성된 가상 참가자 데이터 (matchId 는 first_match 부터)"""
+    rng = np.random.default_rng([seed, first_match + 1])
+    traits = champion_traits(seed)
+    n_matches = -(-n_rows // (2 * TEAM_SIZE))
+
+    # 매치마다 가중치 비복원 추출 10명 (Gumbel top-k): 앞 5명 블루, 뒤 5명 레드
+    keys = np.log(traits["pick_weight"]) + rng.gumbel(size=(n_matches, len(CHAMP_POOL)))
+    picks = np.argsort(-keys, axis=1)[:, :2 * TEAM_SIZE]
+    blue, red = picks[:, :TEAM_SIZE], picks[:, TEAM_SIZE:]
+    edge = traits["strength"][blue].sum(axis=1) - traits["strength"][red].sum(axis=1)
+    blue_win = rng.random(n_matches) < 1 / (1 + np.exp(-edge))
+    game_min = np.clip(rng.normal(18, 4, n_matches), 8, 35).round(1)
+
+    champ = picks.ravel()[:n_rows]
+    on_blue = np.tile(np.arange(2 * TEAM_SIZE) < TEAM_SIZE, n_matches)[:n_rows]
+    match = np.repeat(np.arange(n_matches), 2 * TEAM_SIZE)[:n_rows]
+    win = np.where(on_blue, blue_win[match], ~blue_win[match])
+    minutes = game_min[match]
+    team = np.where(on_blue[:, None], blue[match], red[match])
+    enemy = np.where(on_blue[:, None], red[match], blue[match])
+
+    spell1 = rng.choice(len(SPELL_POOL), n_rows, p=SPELL_WEIGHTS)
+    spell2 = (spell1 + rng.integers(1, len(SPELL_POOL), n_rows)) % len(SPELL_POOL)
+    pace = minutes / 18
+    kills = rng.poisson(np.where(win, 9, 6) * pace)
+    dpm = rng.gamma(6, traits["dpm_scale"][champ] / 6) * np.where(win, 1.1, 0.95)
+
+    df = pd.DataFrame({
+        "matchId": first_match + match,
+        "champion": np.array(CHAMP_POOL, dtype=object)[champ],
+        "win": win.astype(int),
+        "spell1": np.array(SPELL_POOL, dtype=object)[spell1],
+        "spell2": np.array(SPELL_POOL, dtype=object)[spell2],
+        "kills": kills,
+        "deaths": rng.poisson(np.where(win, 6, 9) * pace),
+        "assists": rng.poisson(np.where(win, 22, 16) * pace),
+        "damage_total": (dpm * minutes).round().astype(np.int64),
+        "game_end_min": minutes,
+    })
+
+    # 아이템: 슬롯0 신발, 1~5 는 대부분 챔피언 선호 코어, 게임이 짧을수록 빈 슬롯 증가, 6 은 소모품
+    items = np.array(ITEM_POOL, dtype=object)
+    df["item0"] = np.where(rng.random(n_rows) < 0.2, items[rng.integers(0, 8, n_rows)],
+                           items[traits["boots"][champ]])
+    core_order = np.argsort(rng.random((n_rows, 6)), axis=1)  # 행 안에서 코어 아이템 중복 없음
+    for i in range(1, 6):
+        core = traits["core_items"][champ, core_order[:, i - 1]]
+        picked = np.where(rng.random(n_rows) < 0.7, core, items[rng.integers(8, len(ITEM_POOL) - 10, n_rows)])
+        picked[rng.random(n_rows) < 0.03 + 0.1 * i / pace] = ""
+        df[f"item{i}"] = picked
+    df["item6"] = rng.choice(np.array(["", "Control Ward", "Health Potion"], dtype=object), n_rows,
+                             p=[0.6, 0.25, 0.15])
+
+    # 1코어 완성 시간 (분): 챔피언 기본값 + 잡음, 코어 슬롯이 비었거나 일부 행은 결측
+    first_core = np.clip(traits["core_min"][champ] + rng.normal(0, 2.5, n_rows) - (kills - 7) * 0.15, 5, 30)
+    missing = (df["item1"] == "").to_numpy() | (rng.random(n_rows) < 0.03) | (first_core >= minutes)
+    df["first_core_item_min"] = np.where(missing, np.nan, first_core.round(1))
+
+    # 팀/상대 챔피언 리스트 (파이썬 리스트 표기, 팀 리스트에는 자기 자신 포함)
+    df["team_champs"] = list_literal(team)
+    df["enemy_champs"] = list_literal(enemy)
+    return df
+
+def make_synthetic_csv(path: str, n_rows: int, seed: int = 42, chunk_rows: int = CHUNK_ROWS):
+    """n_rows 행 CSV 를 chunk_rows 행씩 (매치 단위로 잘라) 이어 씀"""
+    chunk_rows = max(2 * TEAM_SIZE, chunk_rows - chunk_rows % (2 * TEAM_SIZE))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for start in range(0, max(n_rows, 1), chunk_rows):
+            rows = min(chunk_rows, n_rows - start)
+            frame = make_synthetic_frame(rows, seed, first_match=start // (2 * TEAM_SIZE))
+            frame.to_csv(f, index=False, header=start == 0)
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 ARAM participants CSV 생성")
+    parser.add_argument("size", help="10k / 100k / 1m / 5m 또는 행 수")
+    parser.add_argument("out", nargs="?", help="출력 경로 (기본: synthetic_<크기>.csv)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    n_rows = parse_size(args.size)
+    out = args.out or f"synthetic_{args.size.lower()}.csv"
+    make_synthetic_csv(out, n_rows, args.seed)
+    print(f"{n_rows:,} rows -> {out} ({os.path.getsize(out) / 1e6:,.1f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# builds.py
+# 아이템 빌드 인덱스 - 행마다 아이템 집합을 정렬된 코드 튜플로 만들어 해시 집계
+from itertools import combinations
+from typing import Dict, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+CORE_SIZE = 3
+EMPTY_CODE = -1
+
+def sorted_item_codes(codes: np.ndarray) -> np.ndarray:
+    """(행 × 슬롯) 아이템 코드를 행마다 오름차순 정렬, 중복·빈칸(-1)은 뒤로 밀어 -1 로"""
+    codes = codes.astype(np.int64)
+    big = np.iinfo(np.int64).max
+    ordered = np.sort(np.where(codes < 0, big, codes), axis=1)
+    if ordered.shape[1] > 1:
+        repeated = np.zeros_like(ordered, dtype=bool)
+        repeated[:, 1:] = ordered[:, 1:] == ordered[:, :-1]
+        ordered = np.sort(np.where(repeated, big, ordered), axis=1)
+    return np.where(ordered == big, EMPTY_CODE, ordered)
+
+class BuildIndex:
+    """챔피언별 완성 빌드(아이템 집합)와 3코어 조합의 games / wins 색인
+
+    champions, wins 는 행 단위 배열, item_codes 는 (행 × 슬롯) 코드 배열이다.
+    완성 빌드는 (챔피언, 정렬된 코드 튜플) 해시 맵, 3코어는
+    (챔피언, 아이템 2개) 정렬 키 + searchsorted 로 "세 번째 아이템" 질의를 처리한다.
+    """
+
+    def __init__(self, champions: np.ndarray, item_codes: np.ndarray, wins: np.ndarray,
+                 champion_names: Sequence[str], item_ids: Sequence[str]):
+        self.champion_names = pd.Index(champion_names)
+        self.item_ids = np.asarray(item_ids, dtype=object)
+        self.item_codes = {item_id: code for code, item_id in enumerate(self.item_ids)}
+        self.n_items = max(len(self.item_ids), 1)
+
+        champions = np.asarray(champions, dtype=np.int64)
+        wins = (np.asarray(wins) > 0).astype(np.int64)
+        codes = sorted_item_codes(item_codes)
+        keep = champions >= 0
+        champions, codes, wins = champions[keep], codes[keep], wins[keep]
+
+        self.builds = self._count_builds(champions, codes, wins)
+        self._index_cores(champions, codes, wins)
+
+    # --------------------------------------------------------------
+    # 색인 생성
+    # --------------------------------------------------------------
+    def _count_builds(self, champions, codes, wins) -> pd.DataFrame:
+        """(챔피언, 정렬된 아이템 코드...)별 games / wins, 챔피언 → 게임 수 내림차순"""
+        frame = pd.DataFrame(codes, columns=[f"slot{i}" for i in range(codes.shape[1])])
+        frame.insert(0, "champion", champions)
+        frame["win"] = wins
+        grouped = frame.groupby(list(frame.columns[:-1]), sort=False)["win"].agg(["size", "sum"])
+        grouped.columns = ["games", "wins"]
+        table = grouped.reset_index().sort_values(["champion", "games"], ascending=[True, False])
+
+        slot_codes = table.filter(like="slot").to_numpy()
+        table = table[["champion", "games", "wins"]].reset_index(drop=True)
+        # 코드 튜플은 -1 로 채운 고정 길이 (해시 키로 그대로 사용)
+        table["codes"] = list(map(tuple, slot_codes.tolist()))
+        table["size"] = (slot_codes >= 0).sum(axis=1)
+        self.slots = slot_codes.shape[1]
+        self.build_lookup: Dict[Tuple[int, Tuple[int, ...]], int] = dict(
+            zip(zip(table["champion"].tolist(), table["codes"]), range(len(table)))
+        )
+        self.build_offsets = np.searchsorted(table["champion"].to_numpy(), np.arange(len(self.champion_names) + 1))
+        return table
+
+    def _index_cores(self, champions, codes, wins):
+        """행마다 아이템 3개 조합을 int64 키로 집계하고 (챔피언, 아이템 2개) → 세 번째 색인 생성"""
+        v = self.n_items
+        parts = []
+        # 슬롯 위치 조합마다 고유 키로 줄인 뒤 한 번 더 합침 (메모리는 고유 조합 수에 비례)
+        for positions in combinations(range(codes.shape[1]), CORE_SIZE):
+            picked = codes[:, positions]
+            valid = (picked >= 0).all(axis=1)
+            keys = ((champions[valid] * v + picked[valid, 0]) * v + picked[valid, 1]) * v + picked[valid, 2]
+            unique, inverse = np.unique(keys, return_inverse=True)
+            parts.append((unique, np.bincount(inverse), np.bincount(inverse, weights=wins[valid])))
+
+        if parts:
+            keys, inverse = np.unique(np.concatenate([p[0] for p in parts]), return_inverse=True)
+            games = np.bincount(inverse, weights=np.concatenate([p[1] for p in parts])).astype(np.int64)
+            core_wins = np.bincount(inverse, weights=np.concatenate([p[2] for p in parts])).astype(np.int64)
+        else:
+            keys = games = core_wins = np.zeros(0, dtype=np.int64)
+        c = keys % v
+        b = keys // v % v
+        a = keys // (v * v) % v
+        champ = keys // (v * v * v)
+
+        # 조합 하나를 (두 아이템, 세 번째) 세 가지로 펼쳐 쌍 키 순으로 정렬
+        pair_keys = np.concatenate([(champ * v + a) * v + b, (champ * v + a) * v + c, (champ * v + b) * v + c])
+        order = np.argsort(pair_keys, kind="stable")
+        self.pair_keys = pair_keys[order]
+        self.pair_third = np.concatenate([c, b, a])[order]
+        self.pair_games = np.tile(games, 3)[order]
+        self.pair_wins = np.tile(core_wins, 3)[order]
+        self.cores = (pd.DataFrame({"champion": champ, "a": a, "b": b, "c": c, "games": games, "wins": core_wins})
+                      .sort_values(["champion", "games"], ascending=[True, False], kind="stable")
+                      .reset_index(drop=True))
+        self.core_offsets = np.searchsorted(self.cores["champion"].to_numpy(),
+                                            np.arange(len(self.champion_names) + 1))
+
+    # --------------------------------------------------------------
+    # 질의
+    # --------------------------------------------------------------
+    def _champion_code(self, champion: str) -> int:
+        return self.champion_names.get_loc(champion) if champion in self.champion_names else -1
+
+    def _ids(self, codes) -> Tuple[str, ...]:
+        return tuple(self.item_ids[[c for c in codes if c >= 0]])
+
+    @staticmethod
+    def _with_win_rate(frame: pd.DataFrame) -> pd.DataFrame:
+        frame["win_rate"] = (frame["wins"] / frame["games"] * 100).round(2)
+        return frame
+
+    def build_stats(self, champion: str, items: Sequence[str]) -> Dict:
+        """정확히 이 아이템 집합으로 끝난 게임의 games / wins (해시 조회)"""
+        code = self._champion_code(champion)
+        build = sorted(self.item_codes[i] for i in set(items) if i in self.item_codes)
+        key = (code, tuple(build + [EMPTY_CODE] * (self.slots - len(build))))
+        pos = self.build_lookup.get(key)
+        if pos is None:
+            return {"games": 0, "wins": 0}
+        row = self.builds.iloc[pos]
+        return {"games": int(row["games"]), "wins": int(row["wins"])}
+
+    def top_builds(self, champion: str, n: int = 10, size: int = None, min_games: int = 1) -> pd.DataFrame:
+        """챔피언의 완성 빌드 상위 n 개 (size 를 주면 아이템 개수가 같은 빌드만)"""
+        code = self._champion_code(champion)
+        if code < 0:
+            return pd.DataFrame(columns=["items", "games", "wins", "win_rate"])
+        builds = self.builds.iloc[self.build_offsets[code]:self.build_offsets[code + 1]]
+        builds = builds[builds["games"] >= min_games]
+        if size is not None:
+            builds = builds[builds["size"] == size]
+        top = builds.head(n)
+        return self._with_win_rate(pd.DataFrame({
+            "items": [self._ids(codes) for codes in top["codes"]],
+            "games": top["games"].to_numpy(),
+            "wins": top["wins"].to_numpy(),
+        }))
+
+    def top_cores(self, champion: str, n: int = 10, min_games: int = 1) -> pd.DataFrame:
+        """챔피언의 3코어(순서 무관 아이템 3개 조합) 상위 n 개"""
+        code = self._champion_code(champion)
+        if code < 0:
+            return pd.DataFrame(columns=["items", "games", "wins", "win_rate"])
+        cores = self.cores.iloc[self.core_offsets[code]:self.core_offsets[code + 1]]
+        top = cores[cores["games"] >= min_games].head(n)
+        return self._with_win_rate(pd.DataFrame({
+            "items": [self._ids(row) for row in top[["a", "b", "c"]].to_numpy()],
+            "games": top["games"].to_numpy(),
+            "wins": top["wins"].to_numpy(),
+        }))
+
+    def best_third_items(self, champion: str, first: str, second: str, n: int = 10,
+                         min_games: int = 1) -> pd.DataFrame:
+        """두 아이템을 함께 산 게임에서 세 번째 아이템별 games / wins / win_rate (승률 내림차순)"""
+        code = self._champion_code(champion)
+        pair = sorted(self.item_codes.get(i, -1) for i in (first, second))
+        if code < 0 or pair[0] < 0 or pair[0] == pair[1]:
+            return pd.DataFrame(columns=["item", "games", "wins", "win_rate"])
+
+        v = self.n_items
+        key = (code * v + pair[0]) * v + pair[1]
+        lo, hi = np.searchsorted(self.pair_keys, [key, key + 1])
+        result = self._with_win_rate(pd.DataFrame({
+            "item": self.item_ids[self.pair_third[lo:hi]],
+            "games": self.pair_games[lo:hi],
+            "wins": self.pair_wins[lo:hi],
+        }))
+        result = result[result["games"] >= min_games]
+        return result.sort_values(["win_rate", "games"], ascending=[False, False]).head(n).reset_index(drop=True)
@@ -0,0 +1,435 @@
+# ddragon.py
+# Data Dragon 스냅샷 저장소 - 로컬 디스크 우선, 네트워크는 허용된 경우에만
+#
+# 스냅샷 구조:
+#   ddragon_snapshot/
+#     versions.json
+#     15.1.1/champion.json
+#     15.1.1/item.json
+#     15.1.1/summoner.json
+#     15.1.1/img/item/3031.png            # 아이콘 저장소 (python ddragon.py icons)
+#     15.1.1/img/spell/SummonerFlash.png
+#     15.1.1/img/champion/Ahri.png
+#     _headers.json          # 조건부 요청용 ETag / Last-Modified
+#
+# 사용법:
+#   python ddragon.py prefetch            # 최신 버전 저장
+#   python ddragon.py prefetch 15.1.1     # 특정 버전 저장
+#   python ddragon.py icons               # 최신 스냅샷 버전의 아이콘 저장
+#   python ddragon.py icons --from DIR    # 픽스처(DIR/item/3031.png ...)에서 복사
+#   python ddragon.py list                # 저장된 버전 목록
+import os, re, json, time, shutil, argparse, threading, unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+DDRAGON_BASE_URL = os.environ.get("DDRAGON_BASE_URL", "https://ddragon.leagueoflegends.com")
+SNAPSHOT_DIR = os.environ.get("DDRAGON_SNAPSHOT_DIR", "ddragon_snapshot")
+DEFAULT_VERSION = "15.1.1"
+LOCALE = "en_US"
+DATA_FILES = ["champion", "item", "summoner"]
+
+def network_allowed() -> bool:
+    """DDRAGON_OFFLINE=1 이면 네트워크 요청 금지 (에어갭 환경)"""
+    return os.environ.get("DDRAGON_OFFLINE", "").strip().lower() not in ("1", "true", "yes")
+
+def normalize_text(text: str) -> str:
+    if not isinstance(text, str):
+        text = str(text)
+    text = unicodedata.normalize('NFKD', text)
+    text = re.sub(r"[^\w\s]", "", text).replace(" ", "").lower()
+    return text
+
+# ------------------------------------------------------------------
+# 네트워크
+# ------------------------------------------------------------------
+def versions_url(base_url: str = DDRAGON_BASE_URL) -> str:
+    return f"{base_url}/api/versions.json"
+
+def data_url(ver: str, name: str, base_url: str = DDRAGON_BASE_URL) -> str:
+    return f"{base_url}/cdn/{ver}/data/{LOCALE}/{name}.json"
+
+_session_lock = threading.Lock()
+_session = None  # requests.Session (requests 는 첫 네트워크 요청 때 import)
+
+# 마지막 네트워크 갱신 결과 (파일별 상태/지연시간)
+last_fetch_report: List[Dict] = []
+
+def http_session():
+    """커넥션 풀을 공유하는 프로세스 전역 세션"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=len(DATA_FILES) + 1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+    return _session
+
+def fetch_json(url: str, timeout: float = 15):
+    response = http_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+def fetch_bytes(url: str, timeout: float = 15) -> bytes:
+    response = http_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+def fetch_conditional(url: str, validators: Optional[Dict] = None, timeout: float = 15) -> Dict:
+    """ETag / Last-Modified 조건부 GET (304 이면 payload 는 None)"""
+    validators = validators or {}
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    start = time.perf_counter()
+    response = http_session().get(url, headers=headers, timeout=timeout)
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    if response.status_code == 304:
+        payload = None
+    else:
+        response.raise_for_status()
+        payload = response.json()
+
+    return {
+        "url": url,
+        "status": response.status_code,
+        "latency_ms": round(latency_ms, 1),
+        "bytes": len(response.content),
+        "payload": payload,
+        "etag": response.headers.get("ETag", validators.get("etag")),
+        "last_modified": response.headers.get("Last-Modified", validators.get("last_modified")),
+    }
+
+def fetch_many(urls: Dict[str, str], validators: Optional[Dict] = None, timeout: float = 15) -> Dict[str, Dict]:
+    """여러 URL 을 하나의 세션으로 동시에 조건부 요청"""
+    validators = validators or {}
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        futures = {
+            key: pool.submit(fetch_conditional, url, validators.get(key), timeout)
+            for key, url in urls.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+# ------------------------------------------------------------------
+# 로컬 스냅샷
+# ------------------------------------------------------------------
+def _write_json(path: str, payload):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def _read_json(path: str):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def snapshot_versions(snapshot_dir: str = SNAPSHOT_DIR) -> List[str]:
+    """스냅샷에 데이터 파일이 모두 저장된 버전 목록 (최신순)"""
+    if not os.path.isdir(snapshot_dir):
+        return []
+
+    complete = {
+        ver for ver in os.listdir(snapshot_dir)
+        if all(os.path.exists(os.path.join(snapshot_dir, ver, f"{name}.json")) for name in DATA_FILES)
+    }
+
+    # versions.json 순서(최신순) 우선, 없으면 버전 번호로 정렬
+    try:
+        ordered = [v for v in _read_json(os.path.join(snapshot_dir, "versions.json")) if v in complete]
+    except (OSError, ValueError):
+        ordered = []
+    rest = sorted(complete - set(ordered), key=lambda v: [int(p) if p.isdigit() else 0 for p in v.split(".")], reverse=True)
+    return ordered + rest
+
+def read_snapshot(ver: str, snapshot_dir: str = SNAPSHOT_DIR) -> Optional[Dict]:
+    """{'champion': ..., 'item': ..., 'summoner': ...} 원본 JSON (없으면 None)"""
+    try:
+        return {name: _read_json(os.path.join(snapshot_dir, ver, f"{name}.json")) for name in DATA_FILES}
+    except (OSError, ValueError):
+        return None
+
+def read_validators(snapshot_dir: str = SNAPSHOT_DIR) -> Dict:
+    """스냅샷에 실제 파일이 있는 항목의 ETag / Last-Modified"""
+    try:
+        validators = _read_json(os.path.join(snapshot_dir, "_headers.json"))
+    except (OSError, ValueError):
+        return {}
+    return {key: value for key, value in validators.items()
+            if os.path.exists(os.path.join(snapshot_dir, key))}
+
+def prefetch(ver: Optional[str] = None, snapshot_dir: str = SNAPSHOT_DIR,
+             base_url: str = DDRAGON_BASE_URL) -> Dict:
+    """Data Dragon 버전 목록과 데이터 파일을 스냅샷으로 저장
+
+    바뀌지 않은 파일은 304 응답(헤더만)으로 끝난다.
+    반환값: {"version": 저장한 버전, "files": 파일별 상태/지연시간 목록}
+    """
+    global last_fetch_report
+    validators = read_validators(snapshot_dir)
+
+    def _data_urls(v):
+        return {f"{v}/{name}.json": data_url(v, name, base_url) for name in DATA_FILES}
+
+    # 버전이 정해져 있으면 versions.json 도 함께 동시 요청
+    urls = {"versions.json": versions_url(base_url)}
+    if ver:
+        urls.update(_data_urls(ver))
+    results = fetch_many(urls, validators)
+
+    versions = results["versions.json"]["payload"]
+    if versions is None:
+        versions = _read_json(os.path.join(snapshot_dir, "versions.json"))
+
+    if not ver:
+        ver = versions[0]
+        results.update(fetch_many(_data_urls(ver), validators))
+
+    for key, result in results.items():
+        if result["payload"] is not None:
+            _write_json(os.path.join(snapshot_dir, key), result["payload"])
+        validators[key] = {"etag": result["etag"], "last_modified": result["last_modified"]}
+    _write_json(os.path.join(snapshot_dir, "_headers.json"), validators)
+
+    last_fetch_report = [
+        {"file": key, "status": r["status"], "latency_ms": r["latency_ms"], "bytes": r["bytes"]}
+        for key, r in results.items()
+    ]
+    return {"version": ver, "files": last_fetch_report}
+
+_refresh_lock = threading.Lock()
+_refresh_thread: Optional[threading.Thread] = None
+
+def refresh_in_background(snapshot_dir: str = SNAPSHOT_DIR) -> Optional[threading.Thread]:
+    """허용된 경우 프로세스당 한 번 백그라운드에서 최신 스냅샷 갱신"""
+    global _refresh_thread
+    if not network_allowed():
+        return None
+
+    def _run():
+        try:
+            prefetch(snapshot_dir=snapshot_dir)
+        except Exception:
+            pass
+
+    with _refresh_lock:
+        if _refresh_thread is None:
+            _refresh_thread = threading.Thread(target=_run, name="ddragon-refresh", daemon=True)
+            _refresh_thread.start()
+    return _refresh_thread
+
+# ------------------------------------------------------------------
+# 버전 / 매핑 로드
+# ------------------------------------------------------------------
+def resolve_version(snapshot_dir: str = SNAPSHOT_DIR) -> str:
+    """로컬 스냅샷 최신 버전 → 네트워크 최신 버전 순으로 확인
+
+    스냅샷이 있으면 즉시 반환하고 갱신은 백그라운드로 넘긴다.
+    둘 다 불가능하면 예외를 올린다.
+    """
+    local = snapshot_versions(snapshot_dir)
+    if local:
+        refresh_in_background(snapshot_dir)
+        return local[0]
+
+    if not network_allowed():
+        raise RuntimeError("로컬 스냅샷이 없고 네트워크 사용이 금지되어 있습니다")
+    return fetch_json(versions_url(), timeout=10)[0]
+
+def load_raw(ver: str, snapshot_dir: str = SNAPSHOT_DIR) -> Dict:
+    """스냅샷에서 원본 JSON 로드, 없으면 (허용 시) 받아서 스냅샷에 저장"""
+    raw = read_snapshot(ver, snapshot_dir)
+    if raw is not None:
+        return raw
+
+    if not network_allowed():
+        raise RuntimeError(f"{ver} 스냅샷이 없고 네트워크 사용이 금지되어 있습니다")
+
+    try:
+        prefetch(ver, snapshot_dir)
+        raw = read_snapshot(ver, snapshot_dir)
+        if raw is not None:
+            return raw
+    except OSError:
+        pass
+
+    # 스냅샷을 쓸 수 없는 환경이면 메모리로만 로드
+    results = fetch_many({name: data_url(ver, name) for name in DATA_FILES})
+    return {name: result["payload"] for name, result in results.items()}
+
+def build_dd_maps(ver: str, raw: Dict) -> Dict:
+    """원본 JSON으로 챔피언/아이템/스펠 정확·정규화 매핑 생성"""
+    champs = raw["champion"]["data"]
+    items = raw["item"]["data"]
+    spells = raw["summoner"]["data"]
+
+    # 챔피언 매핑
+    champ_exact = {}
+    champ_normalized = {}
+
+    for champ_key, champ_data in champs.items():
+        name = champ_data["name"]
+        filename = f"{champ_data['id']}.png"
+
+        champ_exact[name] = filename
+        champ_normalized[normalize_text(name)] = filename
+        champ_normalized[champ_key.lower()] = filename
+
+    # 아이템 매핑
+    item_exact = {}
+    item_normalized = {}
+
+    for item_id, item_data in items.items():
+        if "name" in item_data:
+            name = item_data["name"]
+            item_exact[name] = item_id
+            item_normalized[normalize_text(name)] = item_id
+
+    # 스펠 매핑
+    spell_exact = {}
+    spell_normalized = {}
+
+    for spell_data in spells.values():
+        name = spell_data["name"]
+        spell_id = spell_data["id"]
+
+        spell_exact[name] = spell_id
+        spell_normalized[normalize_text(name)] = spell_id
+
+    return {
+        "version": ver,
+        "champ_exact": champ_exact,
+        "champ_normalized": champ_normalized,
+        "item_exact": item_exact,
+        "item_normalized": item_normalized,
+        "spell_exact": spell_exact,
+        "spell_normalized": spell_normalized,
+        "items_count": len(items),
+        "spells_count": len(spells),
+        "champs_count": len(champs)
+    }
+
+def empty_dd_maps(ver: str) -> Dict:
+    return {
+        "version": ver,
+        "champ_exact": {}, "champ_normalized": {},
+        "item_exact": {}, "item_normalized": {},
+        "spell_exact": {}, "spell_normalized": {},
+        "items_count": 0, "spells_count": 0, "champs_count": 0
+    }
+
+# ------------------------------------------------------------------
+# 아이콘 저장소 (버전/종류/파일명별 로컬 PNG)
+# ------------------------------------------------------------------
+ICON_KINDS = ["champion", "item", "spell"]
+
+def image_url(ver: str, kind: str, filename: str, base_url: str = DDRAGON_BASE_URL) -> str:
+    return f"{base_url}/cdn/{ver}/img/{kind}/{filename}"
+
+def icon_path(ver: str, kind: str, filename: str, snapshot_dir: str = SNAPSHOT_DIR) -> str:
+    return os.path.join(snapshot_dir, ver, "img", kind, filename)
+
+def icon_filenames(raw: Dict) -> Dict[str, List[str]]:
+    """스냅샷 JSON 에 나오는 모든 아이콘 파일명 (종류별)"""
+    return {
+        "champion": [f"{c['id']}.png" for c in raw["champion"]["data"].values()],
+        "item": [f"{item_id}.png" for item_id in raw["item"]["data"]],
+        "spell": [f"{s['id']}.png" for s in raw["summoner"]["data"].values()],
+    }
+
+def _write_bytes(path: str, payload: bytes):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+def fetch_icons(ver: str, kind: str, filenames: List[str], snapshot_dir: str = SNAPSHOT_DIR,
+                base_url: str = DDRAGON_BASE_URL, source_dir: Optional[str] = None) -> Dict[str, int]:
+    """저장소에 없는 아이콘만 픽스처(source_dir/<kind>/<파일>)에서 복사하거나 (허용 시) 동시에 받음
+
+    반환값: {"cached", "copied", "downloaded", "missing"} 개수
+    """
+    missing = [f for f in dict.fromkeys(filenames) if not os.path.exists(icon_path(ver, kind, f, snapshot_dir))]
+    report = {"cached": len(set(filenames)) - len(missing), "copied": 0, "downloaded": 0, "missing": 0}
+
+    if source_dir:
+        remaining = []
+        for filename in missing:
+            source = os.path.join(source_dir, kind, filename)
+            if os.path.exists(source):
+                target = icon_path(ver, kind, filename, snapshot_dir)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(source, target)
+                report["copied"] += 1
+            else:
+                remaining.append(filename)
+        missing = remaining
+
+    if missing and network_allowed():
+        def _download(filename):
+            try:
+                _write_bytes(icon_path(ver, kind, filename, snapshot_dir),
+                             fetch_bytes(image_url(ver, kind, filename, base_url), timeout=10))
+                return True
+            except Exception:
+                return False
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            fetched = list(pool.map(_download, missing))
+        report["downloaded"] = sum(fetched)
+        missing = [f for f, ok in zip(missing, fetched) if not ok]
+
+    report["missing"] = len(missing)
+    return report
+
+def prefetch_icons(ver: str, snapshot_dir: str = SNAPSHOT_DIR, base_url: str = DDRAGON_BASE_URL,
+                   source_dir: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """버전의 챔피언/아이템/스펠 아이콘을 모두 저장소에 채움 (이미 있는 파일은 건너뜀)"""
+    files = icon_filenames(load_raw(ver, snapshot_dir))
+    return {kind: fetch_icons(ver, kind, files[kind], snapshot_dir, base_url, source_dir) for kind in ICON_KINDS}
+
+# ------------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------------
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Data Dragon 로컬 스냅샷 관리")
+    parser.add_argument("--dir", default=SNAPSHOT_DIR, help="스냅샷 디렉터리")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    prefetch_cmd = sub.add_parser("prefetch", help="버전 데이터를 받아 스냅샷에 저장")
+    prefetch_cmd.add_argument("version", nargs="?", help="저장할 버전 (기본: 최신)")
+    prefetch_cmd.add_argument("--base-url", default=DDRAGON_BASE_URL)
+
+    icons_cmd = sub.add_parser("icons", help="아이콘을 받아 (또는 픽스처에서 복사해) 스냅샷에 저장")
+    icons_cmd.add_argument("version", nargs="?", help="버전 (기본: 스냅샷 최신)")
+    icons_cmd.add_argument("--from", dest="source_dir", help="픽스처 디렉터리 (<kind>/<파일명>.png)")
+    icons_cmd.add_argument("--base-url", default=DDRAGON_BASE_URL)
+
+    sub.add_parser("list", help="저장된 버전 목록")
+
+    args = parser.parse_args(argv)
+    if args.command == "prefetch":
+        result = prefetch(args.version, snapshot_dir=args.dir, base_url=args.base_url)
+        for entry in result["files"]:
+            print(f"{entry['file']:28s} {entry['status']}  {entry['latency_ms']:8.1f} ms  {entry['bytes']:>9,} B")
+        print(f"saved {result['version']} -> {os.path.join(args.dir, result['version'])}")
+    elif args.command == "icons":
+        ver = args.version or resolve_version(args.dir)
+        report = prefetch_icons(ver, args.dir, args.base_url, args.source_dir)
+        for kind, counts in report.items():
+            print(f"{kind:9s} " + "  ".join(f"{k} {v:>4}" for k, v in counts.items()))
+        print(f"icons -> {os.path.join(args.dir, ver, 'img')}")
+    else:
+        for ver in snapshot_versions(args.dir):
+            print(ver)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# fuzzy.py
+# n-gram 역색인 기반 이름 매칭 - 후보는 질의와 n-gram 을 공유하는 이름만 검사
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from ddragon import normalize_text
+
+def ngrams(text: str, n: int = 3) -> List[str]:
+    """양 끝을 패딩한 문자 n-gram (짧은 이름도 최소 1개)"""
+    padded = f"${text}$"
+    if len(padded) <= n:
+        return [padded]
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+class NgramIndex:
+    """정규화된 이름의 n-gram 역색인
+
+    entries 는 (표시 이름, 값) 목록이며 앞쪽 항목이 우선한다.
+    같은 정규화 키를 가진 뒤쪽 항목은 무시된다.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str]], n: int = 3):
+        self.n = n
+        self.names: List[str] = []
+        self.values: List[str] = []
+        self.keys: Dict[str, int] = {}
+        postings: Dict[str, List[int]] = {}
+
+        for name, value in entries:
+            key = normalize_text(name)
+            if not key or key in self.keys:
+                continue
+            idx = len(self.names)
+            self.keys[key] = idx
+            self.names.append(name)
+            self.values.append(value)
+            for gram in set(ngrams(key, n)):
+                postings.setdefault(gram, []).append(idx)
+
+        self.postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self.gram_counts = np.zeros(len(self.names), dtype=np.int32)
+        for ids in self.postings.values():
+            self.gram_counts[ids] += 1
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int = 5, cutoff: float = 0.0) -> List[Tuple[str, str, float]]:
+        """Dice 유사도 상위 후보 [(이름, 값, 점수)]"""
+        key = normalize_text(query)
+        if not key:
+            return []
+        if key in self.keys:
+            idx = self.keys[key]
+            return [(self.names[idx], self.values[idx], 1.0)]
+
+        query_grams = set(ngrams(key, self.n))
+        hits = [self.postings[g] for g in query_grams if g in self.postings]
+        if not hits:
+            return []
+
+        candidates, shared = np.unique(np.concatenate(hits), return_counts=True)
+        scores = 2 * shared / (len(query_grams) + self.gram_counts[candidates])
+        keep = scores >= cutoff
+        top = heapq.nlargest(limit, zip(scores[keep], candidates[keep]))
+        return [(self.names[idx], self.values[idx], round(float(score), 4)) for score, idx in top]
+
+    def best(self, query: str, cutoff: float = 0.6) -> Optional[Tuple[str, str, float]]:
+        matches = self.search(query, limit=1, cutoff=cutoff)
+        return matches[0] if matches else None
+
+    def canonicalize(self, values: pd.Series, cutoff: float = 0.6) -> pd.DataFrame:
+        """Series 전체를 고유값 단위로 매칭해 (canonical_name, value, score) 프레임 반환"""
+        uniques = pd.unique(values.dropna().astype(str).to_numpy())
+        matched = {v: self.best(v, cutoff) for v in uniques}
+        lookup = pd.DataFrame(
+            [(v, *m) for v, m in matched.items() if m is not None],
+            columns=["raw", "canonical_name", "value", "score"],
+        ).set_index("raw")
+        return lookup.reindex(values.astype(str).where(values.notna())).set_axis(values.index)
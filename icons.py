@@ -0,0 +1,226 @@
+# icons.py
+# 아이콘 URL 해석기 - Data Dragon 버전별로 한 번 만들어 재사용
+import io, os, re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+from ddragon import DDRAGON_BASE_URL, SNAPSHOT_DIR, icon_path, normalize_text
+from fuzzy import NgramIndex
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+EMPTY_ITEM_VALUES = {"", "0", "nan", "None"}
+DEFAULT_CHAMPION = "Aatrox.png"
+DEFAULT_ITEM_ID = "1001"
+DEFAULT_SPELL_ID = "SummonerFlash"
+FUZZY_CUTOFF = 0.6
+
+class IconResolver:
+    """하드코딩 매핑과 Data Dragon 매핑을 합친 챔피언/아이템/스펠 아이콘 해석기
+
+    조회 우선순위는 기존 함수와 같다:
+    정확한 이름 → 정규화된 이름 → n-gram fuzzy 매칭(LRU 메모이즈) → 기본 아이콘
+
+    localized_maps 로 다른 로케일의 DD 매핑을 넘기면 현지화 이름도 fuzzy 색인에 포함된다.
+    """
+
+    def __init__(self, dd_maps: Dict, item_mapping: Dict[str, str], spell_mapping: Dict[str, str],
+                 base_url: str = DDRAGON_BASE_URL, cache_size: int = 4096,
+                 localized_maps: Sequence[Dict] = ()):
+        self.version = dd_maps.get("version", "")
+        self.img_base = f"{base_url}/cdn/{self.version}/img"
+        self.item_mapping = item_mapping
+        self.spell_mapping = spell_mapping
+
+        # 챔피언: 파일명 조회 테이블
+        self.champ_exact = dict(dd_maps.get("champ_exact", {}))
+        self.champ_normalized = dict(dd_maps.get("champ_normalized", {}))
+
+        # 아이템/스펠: 하드코딩이 정확한 매칭에서 우선, 정규화 매칭에서는 DD 우선
+        self.item_exact = {**dd_maps.get("item_exact", {}), **item_mapping}
+        self.item_normalized = {
+            **{normalize_text(name): item_id for name, item_id in item_mapping.items()},
+            **dd_maps.get("item_normalized", {}),
+        }
+        self.spell_exact = {**dd_maps.get("spell_exact", {}), **spell_mapping}
+        self.spell_normalized = {
+            **{normalize_text(name): spell_id for name, spell_id in spell_mapping.items()},
+            **dd_maps.get("spell_normalized", {}),
+        }
+
+        # ID → 대표 이름 (DD 이름 우선, 없으면 첫 번째 하드코딩 이름)
+        self.item_names = {}
+        for name, item_id in item_mapping.items():
+            self.item_names.setdefault(item_id, name)
+        self.item_names.update({item_id: name for name, item_id in dd_maps.get("item_exact", {}).items()})
+        self.spell_names = {}
+        for name, spell_id in spell_mapping.items():
+            self.spell_names.setdefault(spell_id, name)
+        self.spell_names.update({spell_id: name for name, spell_id in dd_maps.get("spell_exact", {}).items()})
+
+        # fuzzy 색인: 하드코딩 → DD → 현지화 순으로 우선
+        all_maps = [dd_maps, *localized_maps]
+        self.item_index = NgramIndex(
+            [*item_mapping.items()] + [pair for m in all_maps for pair in m.get("item_exact", {}).items()]
+        )
+        self.spell_index = NgramIndex(
+            [*spell_mapping.items()] + [pair for m in all_maps for pair in m.get("spell_exact", {}).items()]
+        )
+        self.champ_index = NgramIndex(pair for m in all_maps for pair in m.get("champ_exact", {}).items())
+
+        self.canonical_item_id = lru_cache(maxsize=cache_size)(self._match_item_id)
+        self.canonical_spell_id = lru_cache(maxsize=cache_size)(self._match_spell_id)
+        self.champion_file = lru_cache(maxsize=cache_size)(self._champion_file)
+        self.item_id = lru_cache(maxsize=cache_size)(self._item_id)
+        self.spell_id = lru_cache(maxsize=cache_size)(self._spell_id)
+
+    # --------------------------------------------------------------
+    # 단일 이름 해석 (결과는 LRU 에 메모이즈)
+    # --------------------------------------------------------------
+    def _champion_file(self, name_str: str) -> str:
+        if name_str in self.champ_exact:
+            return self.champ_exact[name_str]
+
+        normalized = normalize_text(name_str)
+        if normalized in self.champ_normalized:
+            return self.champ_normalized[normalized]
+
+        fallback_name = re.sub(r"[^\w]", "", name_str)
+        if not fallback_name:
+            return DEFAULT_CHAMPION
+        return f"{fallback_name[0].upper() + fallback_name[1:]}.png"
+
+    def _match_item_id(self, item_str: str) -> Optional[str]:
+        """아이템 이름(또는 이미 ID인 값) → 아이템 ID, 해석 불가면 None"""
+        if item_str in EMPTY_ITEM_VALUES:
+            return None
+        if item_str in self.item_exact:
+            return self.item_exact[item_str]
+        if item_str.isdigit():
+            return item_str
+
+        normalized = normalize_text(item_str)
+        if normalized in self.item_normalized:
+            return self.item_normalized[normalized]
+
+        match = self.item_index.best(item_str, FUZZY_CUTOFF)
+        return match[1] if match else None
+
+    def _match_spell_id(self, spell_str: str) -> Optional[str]:
+        """스펠 이름(또는 이미 ID인 값) → 스펠 ID, 해석 불가면 None"""
+        if spell_str in self.spell_exact:
+            return self.spell_exact[spell_str]
+        if spell_str in self.spell_names:
+            return spell_str
+
+        normalized = normalize_text(spell_str)
+        if normalized in self.spell_normalized:
+            return self.spell_normalized[normalized]
+
+        match = self.spell_index.best(spell_str, FUZZY_CUTOFF)
+        return match[1] if match else None
+
+    def _item_id(self, item_str: str) -> str:
+        return self.canonical_item_id(item_str) or DEFAULT_ITEM_ID
+
+    def _spell_id(self, spell_str: str) -> str:
+        return self.canonical_spell_id(spell_str) or DEFAULT_SPELL_ID
+
+    @staticmethod
+    def _clean(value) -> Optional[str]:
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            return None
+        value = str(value).strip()
+        return value or None
+
+    # --------------------------------------------------------------
+    # 아이콘 타일 (종류, 파일명) / URL
+    # --------------------------------------------------------------
+    def champion_tile(self, name) -> Tuple[str, str]:
+        name_str = self._clean(name)
+        return "champion", self.champion_file(name_str) if name_str else DEFAULT_CHAMPION
+
+    def item_tile(self, item) -> Tuple[str, str]:
+        item_str = self._clean(item)
+        return "item", f"{self.item_id(item_str) if item_str else DEFAULT_ITEM_ID}.png"
+
+    def spell_tile(self, spell) -> Tuple[str, str]:
+        spell_str = self._clean(spell)
+        return "spell", f"{self.spell_id(spell_str) if spell_str else DEFAULT_SPELL_ID}.png"
+
+    def tile_url(self, tile: Tuple[str, str]) -> str:
+        return f"{self.img_base}/{tile[0]}/{tile[1]}"
+
+    def champion_url(self, name) -> str:
+        return self.tile_url(self.champion_tile(name))
+
+    def item_url(self, item) -> str:
+        return self.tile_url(self.item_tile(item))
+
+    def spell_url(self, spell) -> str:
+        return self.tile_url(self.spell_tile(spell))
+
+    # --------------------------------------------------------------
+    # 일괄 해석: 고유값만 해석한 뒤 전체 Series 에 매핑
+    # --------------------------------------------------------------
+    def _bulk(self, values: Iterable, resolve) -> pd.Series:
+        series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # 코드 -1(결측)은 마지막 기본값으로
+            resolved = np.array([resolve(v) for v in series.cat.categories] + [resolve(None)], dtype=object)
+            return pd.Series(resolved[series.cat.codes.to_numpy()], index=series.index)
+        uniques = pd.unique(series.to_numpy(dtype=object))
+        lookup = {v: resolve(v) for v in uniques if not (not isinstance(v, str) and pd.isna(v))}
+        return series.map(lookup).fillna(resolve(None))
+
+    def champion_urls(self, names: Iterable) -> pd.Series:
+        return self._bulk(names, self.champion_url)
+
+    def item_urls(self, items: Iterable) -> pd.Series:
+        return self._bulk(items, self.item_url)
+
+    def spell_urls(self, spells: Iterable) -> pd.Series:
+        return self._bulk(spells, self.spell_url)
+
+# ------------------------------------------------------------------
+# 로컬 아이콘 스프라이트
+# ------------------------------------------------------------------
+PLACEHOLDER_RGBA = (68, 68, 68, 255)
+
+def missing_tiles(ver: str, tiles: Sequence[Tuple[str, str]], snapshot_dir: str = SNAPSHOT_DIR) -> List[Tuple[str, str]]:
+    """아이콘 저장소에 아직 없는 타일"""
+    return [tile for tile in dict.fromkeys(tiles) if not os.path.exists(icon_path(ver, *tile, snapshot_dir))]
+
+@lru_cache(maxsize=256)
+def _sprite_png(ver: str, tiles: Tuple[Tuple[str, str], ...], size: int, snapshot_dir: str,
+                present: Tuple[bool, ...]) -> bytes:
+    sheet = Image.new("RGBA", (size * len(tiles), size), (0, 0, 0, 0))
+    for i, (tile, exists) in enumerate(zip(tiles, present)):
+        icon = None
+        if exists:
+            try:
+                with Image.open(icon_path(ver, *tile, snapshot_dir)) as source:
+                    icon = source.convert("RGBA").resize((size, size), Image.LANCZOS)
+            except OSError:
+                icon = None
+        sheet.paste(icon or Image.new("RGBA", (size, size), PLACEHOLDER_RGBA), (i * size, 0))
+    buffer = io.BytesIO()
+    sheet.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+def sprite_sheet(ver: str, tiles: Sequence[Tuple[str, str]], size: int,
+                 snapshot_dir: str = SNAPSHOT_DIR) -> Optional[bytes]:
+    """타일을 가로로 이어 붙인 PNG 한 장 (저장소에 없는 아이콘은 회색 칸, Pillow 가 없으면 None)
+
+    i 번째 타일은 x = i * size 위치에 있다. 저장소가 채워지면 캐시 키가 바뀌어 다시 만든다.
+    """
+    if Image is None or not tiles:
+        return None
+    tiles = tuple(tiles)
+    present = tuple(os.path.exists(icon_path(ver, *tile, snapshot_dir)) for tile in tiles)
+    return _sprite_png(ver, tiles, size, snapshot_dir, present)
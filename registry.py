@@ -0,0 +1,204 @@
+# registry.py
+# 내용 주소 데이터셋 레지스트리 - 같은 파일(내용 해시)은 전처리본 한 벌을 모든 세션이 공유
+#
+# 저장 구조:
+#   aram_registry/
+#     <sha256>-<옵션>.feather   # 비압축 Arrow (메모리 맵으로 읽음)
+import os, hashlib, threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+REGISTRY_DIR = os.environ.get("ARAM_REGISTRY_DIR", "aram_registry")
+REGISTRY_BUDGET_MB = float(os.environ.get("ARAM_REGISTRY_BUDGET_MB", "2048"))
+REGISTRY_DISK_BUDGET_MB = float(os.environ.get("ARAM_REGISTRY_DISK_BUDGET_MB", "8192"))
+REGISTRY_FORMAT_VERSION = 1
+
+_hash_lock = threading.Lock()
+_hash_memo: Dict[tuple, str] = {}
+
+def content_hash(file_input, chunk_size: int = 1 << 20) -> str:
+    """경로 또는 업로드 파일 객체 내용의 sha256 (같은 파일은 다시 읽지 않음)"""
+    if isinstance(file_input, str):
+        stat = os.stat(file_input)
+        memo_key = ("path", os.path.abspath(file_input), stat.st_size, stat.st_mtime_ns)
+    else:
+        file_id = getattr(file_input, "file_id", None)
+        memo_key = ("upload", file_id, getattr(file_input, "size", None)) if file_id else None
+
+    with _hash_lock:
+        if memo_key in _hash_memo:
+            return _hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    if isinstance(file_input, str):
+        with open(file_input, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    else:
+        digest.update(file_input.getvalue())
+
+    if memo_key is not None:
+        with _hash_lock:
+            _hash_memo[memo_key] = digest.hexdigest()
+    return digest.hexdigest()
+
+def dataset_key(digest: str, **options) -> str:
+    """내용 해시 + 전처리 옵션(compact, Data Dragon 버전 등)으로 만든 레지스트리 키"""
+    parts = [f"v{REGISTRY_FORMAT_VERSION}"] + [f"{k}={options[k]}" for k in sorted(options)]
+    suffix = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:12]
+    return f"{digest}-{suffix}"
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+class DatasetRegistry:
+    """내용 키 → 전처리된 DataFrame, 프로세스 안의 모든 세션이 공유
+
+    get() 은 공유 프레임의 얕은 복사(뷰)를 돌려준다. pandas 3.0 부터 항상 켜진 Copy-on-Write 로
+    세션이 컬럼을 바꾸면 그 세션 쪽만 복사되고 공유본(메모리 맵 읽기 전용 버퍼 포함)은 그대로 남는다.
+    그래서 requirements.txt 에서 pandas>=3.0 을 요구한다 (2.x 기본값에서는 세션끼리 값이 새어 나감).
+    디스크에는 키마다 비압축 Arrow 파일 한 벌을 두고 메모리 맵으로 읽으며,
+    메모리에 올린 프레임 합계가 budget_bytes 를 넘으면 가장 오래 안 쓴 것부터 내린다.
+    디스크 사본 합계가 disk_budget_bytes 를 넘으면 mtime(마지막 사용)이 오래된 파일부터 지운다.
+    """
+
+    def __init__(self, root: str = REGISTRY_DIR, budget_bytes: float = REGISTRY_BUDGET_MB * 1e6,
+                 disk_budget_bytes: float = REGISTRY_DISK_BUDGET_MB * 1e6):
+        self.root = root
+        self.budget_bytes = budget_bytes
+        self.disk_budget_bytes = disk_budget_bytes
+        self._frames: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0}
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.feather")
+
+    def get(self, key: str, loader: Callable[[], pd.DataFrame], persist: bool = True) -> pd.DataFrame:
+        """메모리 → 디스크(메모리 맵) → loader() 순으로 찾아 공유 프레임의 뷰를 반환
+
+        같은 키를 여러 세션이 동시에 요청해도 loader 는 한 번만 실행된다.
+        persist=False 이면 디스크 사본을 만들지 않는다 (원본 옆에 캐시가 이미 있는 경우).
+        """
+        with self._lock:
+            shared = self._touch(key)
+            if shared is not None:
+                return shared.copy(deep=False)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                shared = self._touch(key)
+            if shared is None:
+                shared = self._read(key)
+                if shared is not None:
+                    self.stats["disk_hits"] += 1
+                else:
+                    shared = loader()
+                    self.stats["misses"] += 1
+                    if persist and not shared.empty:
+                        self._write(key, shared)
+                with self._lock:
+                    self._put(key, shared)
+        return shared.copy(deep=False)
+
+    def _touch(self, key: str) -> Optional[pd.DataFrame]:
+        shared = self._frames.get(key)
+        if shared is not None:
+            self._frames.move_to_end(key)
+            self.stats["hits"] += 1
+        return shared
+
+    def _put(self, key: str, df: pd.DataFrame):
+        self._frames[key] = df
+        self._sizes[key] = frame_bytes(df)
+        # 방금 넣은 프레임은 예산을 넘어도 남김 (요청한 세션이 바로 사용)
+        while self.memory_bytes() > self.budget_bytes and len(self._frames) > 1:
+            evicted, _ = self._frames.popitem(last=False)
+            self._sizes.pop(evicted, None)
+            self._key_locks.pop(evicted, None)
+            self.stats["evictions"] += 1
+
+    def _read(self, key: str) -> Optional[pd.DataFrame]:
+        path = self.path_for(key)
+        if feather is None or not os.path.exists(path):
+            return None
+        try:
+            # split_blocks: 결측 없는 숫자 컬럼은 메모리 맵을 그대로 가리킴 (복사 없음)
+            df = feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+        except Exception:
+            return None
+        try:
+            os.utime(path)  # 디스크 정리는 mtime 을 마지막 사용 시각으로 봄
+        except OSError:
+            pass
+        return df
+
+    def _write(self, key: str, df: pd.DataFrame) -> bool:
+        if feather is None:
+            return False
+        path = self.path_for(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        self._prune_disk(keep=path)
+        return True
+
+    def disk_files(self) -> List[Tuple[float, int, str]]:
+        """디스크 사본 (mtime, 크기, 경로) - 오래된 것부터"""
+        files = []
+        if os.path.isdir(self.root):
+            for entry in os.scandir(self.root):
+                if entry.name.endswith(".feather"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(files)
+
+    def _prune_disk(self, keep: str):
+        """디스크 사본 합계가 예산 이하가 될 때까지 오래된 파일 삭제 (방금 쓴 파일은 남김)"""
+        files = self.disk_files()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.disk_budget_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                # 메모리에 올라간 프레임은 열린 메모리 맵을 계속 쓰므로 지워도 안전 (POSIX)
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.stats["disk_evictions"] += 1
+
+    def memory_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def info(self) -> Dict:
+        """디버그용 상태 (항목 수, 메모리 사용량, 적중 통계)"""
+        with self._lock:
+            return {
+                "entries": len(self._frames),
+                "memory_mb": round(self.memory_bytes() / 1e6, 1),
+                "budget_mb": round(self.budget_bytes / 1e6, 1),
+                "disk_mb": round(sum(size for _, size, _ in self.disk_files()) / 1e6, 1),
+                "disk_budget_mb": round(self.disk_budget_bytes / 1e6, 1),
+                **self.stats,
+            }
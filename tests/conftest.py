@@ -0,0 +1,56 @@
+# tests/conftest.py
+# 공용 픽스처 - 로컬 Data Dragon 픽스처 서버 (http.server)
+import os, sys, json, threading, functools
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURE_VERSION = "15.2.1"
+FIXTURE_DATA = {
+    "champion": {"data": {"Ahri": {"id": "Ahri", "name": "Ahri"},
+                          "KaiSa": {"id": "KaiSa", "name": "Kai'Sa"}}},
+    "item": {"data": {"3031": {"name": "Infinity Edge"}, "3089": {"name": "Rabadon's Deathcap"}}},
+    "summoner": {"data": {"SummonerFlash": {"id": "SummonerFlash", "name": "Flash"},
+                          "SummonerSnowball": {"id": "SummonerSnowball", "name": "Mark"}}},
+}
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def write_fixture_tree(root):
+    """Data Dragon CDN 과 같은 경로 구조 (api/versions.json, cdn/<버전>/data/en_US/*.json)"""
+    os.makedirs(os.path.join(root, "api"), exist_ok=True)
+    with open(os.path.join(root, "api", "versions.json"), "w", encoding="utf-8") as f:
+        json.dump([FIXTURE_VERSION, "15.1.1"], f)
+    data_dir = os.path.join(root, "cdn", FIXTURE_VERSION, "data", "en_US")
+    os.makedirs(data_dir, exist_ok=True)
+    for name, payload in FIXTURE_DATA.items():
+        with open(os.path.join(data_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+@pytest.fixture
+def dd_server(tmp_path):
+    """픽스처 트리를 서비스하는 로컬 서버의 base URL (Last-Modified / 304 지원)"""
+    root = tmp_path / "fixture"
+    write_fixture_tree(str(root))
+    handler = functools.partial(QuietHandler, directory=str(root))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def no_network(monkeypatch):
+    """DDRAGON_OFFLINE=1 + 세션 생성 자체를 막아 네트워크 요청이 생기면 실패"""
+    import ddragon
+
+    def _blocked():
+        raise AssertionError("network access while offline")
+
+    monkeypatch.setenv("DDRAGON_OFFLINE", "1")
+    monkeypatch.setattr(ddragon, "http_session", _blocked)
@@ -0,0 +1,71 @@
+# tests/test_ddragon.py
+# Data Dragon 스냅샷 저장소 - 픽스처 서버에서 prefetch, 네트워크 없이 로드, 스냅샷 버전 사용
+import os, sys, json, subprocess
+
+import pytest
+
+import ddragon
+from conftest import FIXTURE_DATA, FIXTURE_VERSION
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_prefetch_writes_snapshot(dd_server, tmp_path):
+    snapshot = str(tmp_path / "snapshot")
+    result = ddragon.prefetch(snapshot_dir=snapshot, base_url=dd_server)
+
+    assert result["version"] == FIXTURE_VERSION
+    assert {entry["file"] for entry in result["files"]} == {
+        "versions.json", *(f"{FIXTURE_VERSION}/{name}.json" for name in ddragon.DATA_FILES)}
+    assert all(entry["status"] == 200 for entry in result["files"])
+    assert ddragon.snapshot_versions(snapshot) == [FIXTURE_VERSION]
+    assert ddragon.read_snapshot(FIXTURE_VERSION, snapshot) == FIXTURE_DATA
+    assert set(ddragon.read_validators(snapshot)) == {entry["file"] for entry in result["files"]}
+
+def test_offline_load_uses_snapshot(dd_server, tmp_path, request):
+    snapshot = str(tmp_path / "snapshot")
+    ddragon.prefetch(snapshot_dir=snapshot, base_url=dd_server)
+
+    request.getfixturevalue("no_network")
+    assert ddragon.resolve_version(snapshot) == FIXTURE_VERSION
+    maps = ddragon.build_dd_maps(FIXTURE_VERSION, ddragon.load_raw(FIXTURE_VERSION, snapshot))
+    assert maps["champ_exact"]["Kai'Sa"] == "KaiSa.png"
+    assert maps["item_exact"]["Infinity Edge"] == "3031"
+    assert maps["spell_exact"]["Mark"] == "SummonerSnowball"
+
+def test_offline_without_snapshot_raises(tmp_path, no_network):
+    with pytest.raises(RuntimeError):
+        ddragon.resolve_version(str(tmp_path / "empty"))
+    with pytest.raises(RuntimeError):
+        ddragon.load_raw(FIXTURE_VERSION, str(tmp_path / "empty"))
+
+def test_default_resolver_picks_snapshot_version(dd_server, tmp_path):
+    snapshot = str(tmp_path / "snapshot")
+    ddragon.prefetch(snapshot_dir=snapshot, base_url=dd_server)
+
+    # 모듈 상수가 환경 변수로 정해지므로 새 프로세스에서 확인
+    probe = "import json, aram_stats; r = aram_stats.default_resolver(); print(json.dumps([r.version, r.item_url('Infinity Edge')]))"
+    env = {**os.environ, "DDRAGON_OFFLINE": "1", "DDRAGON_SNAPSHOT_DIR": snapshot,
+           "DDRAGON_BASE_URL": "http://127.0.0.1:9"}
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=env, capture_output=True, text=True,
+                         check=True).stdout
+    version, url = json.loads(out.strip().splitlines()[-1])
+    assert version == FIXTURE_VERSION
+    assert url.endswith(f"/{FIXTURE_VERSION}/img/item/3031.png")
+
+def test_repeat_prefetch_is_conditional(dd_server, tmp_path):
+    snapshot = str(tmp_path / "snapshot")
+    ddragon.prefetch(snapshot_dir=snapshot, base_url=dd_server)
+    paths = [os.path.join(snapshot, "versions.json")] + [
+        os.path.join(snapshot, FIXTURE_VERSION, f"{name}.json") for name in ddragon.DATA_FILES]
+    before = {path: (open(path, "rb").read(), os.stat(path).st_mtime_ns) for path in paths}
+
+    result = ddragon.prefetch(snapshot_dir=snapshot, base_url=dd_server)
+
+    assert result["version"] == FIXTURE_VERSION
+    assert len(result["files"]) == len(paths)
+    for entry in result["files"]:
+        assert entry["status"] == 304, entry
+        assert entry["bytes"] == 0
+        assert isinstance(entry["latency_ms"], float) and entry["latency_ms"] >= 0
+    assert ddragon.last_fetch_report == result["files"]
+    assert {path: (open(path, "rb").read(), os.stat(path).st_mtime_ns) for path in paths} == before
@@ -0,0 +1,52 @@
+# tests/test_registry.py
+# 데이터셋 레지스트리 - 세션 격리 (Copy-on-Write), 디스크 예산 정리, 키 잠금 정리
+import os
+
+import numpy as np
+import pandas as pd
+
+from registry import DatasetRegistry
+
+def frame(n: int, value: int = 0) -> pd.DataFrame:
+    return pd.DataFrame({"a": np.full(n, value, dtype=np.int64), "b": ["x"] * n})
+
+def test_session_writes_do_not_leak(tmp_path):
+    DatasetRegistry(str(tmp_path)).get("k", lambda: frame(3))
+    registry = DatasetRegistry(str(tmp_path))  # 디스크(메모리 맵)에서 읽음
+
+    view = registry.get("k", None)
+    view.loc[0, "a"] = 99
+    view["a"] += 1
+
+    assert registry.get("k", None)["a"].tolist() == [0, 0, 0]
+    assert registry.stats["disk_hits"] == 1
+
+def test_disk_budget_prunes_oldest(tmp_path):
+    registry = DatasetRegistry(str(tmp_path), budget_bytes=1e9, disk_budget_bytes=1e9)
+    registry.get("k0", lambda: frame(10_000))
+    one_file = os.path.getsize(registry.path_for("k0"))
+
+    registry.disk_budget_bytes = 2.5 * one_file
+    for i in range(1, 4):
+        os.utime(registry.path_for(f"k{i - 1}"), (i, i))  # 앞의 키일수록 오래전에 사용
+        registry.get(f"k{i}", lambda: frame(10_000, i))
+
+    assert [os.path.exists(registry.path_for(f"k{i}")) for i in range(4)] == [False, False, True, True]
+    assert registry.stats["disk_evictions"] == 2
+    assert registry.info()["disk_mb"] <= registry.disk_budget_bytes / 1e6
+
+def test_disk_read_refreshes_mtime(tmp_path):
+    registry = DatasetRegistry(str(tmp_path))
+    registry.get("k", lambda: frame(3))
+    os.utime(registry.path_for("k"), (1, 1))
+
+    DatasetRegistry(str(tmp_path)).get("k", None)
+    assert os.path.getmtime(registry.path_for("k")) > 1
+
+def test_evicted_keys_drop_their_lock(tmp_path):
+    registry = DatasetRegistry(str(tmp_path), budget_bytes=1)
+    for i in range(5):
+        registry.get(f"k{i}", lambda: frame(100, i), persist=False)
+
+    assert list(registry._frames) == ["k4"]
+    assert set(registry._key_locks) == {"k4"}